@@ -1,4 +1,48 @@
+import random
+import re
+import shutil
+import sys
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+import board_snapshot
 from a1_support import *
+from board_engine import *
+
+# Events of take_action and run_game
+FLAGGED, REVEALED, IGNORED, LOST, WON, INVALID_ACTION = 'flag', 'reveal', 'ignore', 'lose', 'win', 'invalid'
+HELPED, RESTARTED, QUIT, CONTINUED = 'help', 'restart', 'quit', 'continue'
+UNDONE, REDONE = 'undo', 'redo'
+
+# Place the pokemons of main's games on the first reveal, away from the revealed cell
+SAFE_FIRST_CLICK = False
+# Draw the pokemons of main's games the way the original game did, see generate_pokemons
+LEGACY_POKEMONS = False
+# Least seconds between the frames displayed while a large reveal is still going
+REVEAL_FRAME_SECONDS = 0.1
+# Commands scrolling the viewport of boards with more rows than ALPHA, e.g. 'down' or 'down 5'
+SCROLL_DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Kinds of Command
+REVEAL, FLAG_ACTION, HELP, RESTART, QUIT_ACTION, SCROLL = 'reveal', 'flag', 'help', 'restart', 'quit', 'scroll'
+UNDO, REDO, CHORD = 'undo', 'redo', 'chord'
+# A parsed action: position is the (row, column) of a reveal or flag, scroll the
+# (rows, columns) of a scroll
+Command = namedtuple('Command', ('kind', 'position', 'scroll'), defaults=(None, None))
+# Actions which are a single word
+WORD_COMMANDS = {'h': Command(HELP), ':)': Command(RESTART), 'q': Command(QUIT_ACTION),
+                 'u': Command(UNDO), 'r': Command(REDO)}
+# A cell, optionally flagged or chorded, like 'B3', 'f AA12', 'c B3', or a scroll like 'down 5'
+ACTION_PATTERN = re.compile(r'([fc] )?([A-Z]+)([0-9]+)|(' + '|'.join(SCROLL_DIRECTIONS) + r')(?: ([0-9]+))?')
+# Row of each letter, for the letters of row labels
+LETTER_ROWS = {letter: row for row, letter in enumerate(ALPHA)}
+# bytes.translate tables from cell codes to snapshot states and back, numbers are
+# exposed and come back as 0 to be filled from the counts, which EXPOSED_MASK selects
+CODE_STATES = bytes([board_snapshot.STATE_EXPOSED] * 9 + [board_snapshot.STATE_UNEXPOSED,
+                    board_snapshot.STATE_FLAG, board_snapshot.STATE_POKEMON] + [0] * 244)
+STATE_CODES = bytes([UNEXPOSED_CODE, 0, FLAG_CODE, POKEMON_CODE] + [0] * 252)
+EXPOSED_MASK = bytes([0, 0xFF, 0, 0] + [0] * 252)
 
 
 def main():
@@ -9,20 +53,26 @@ def main():
     """
     grid_size = input("Please input the size of the grid: ")
     number_of_pokemons = input("Please input the number of pokemons: ")
-    pokemons = generate_pokemons(int(grid_size), int(number_of_pokemons))
-    game = UNEXPOSED * int(grid_size) ** 2
+    pokemons = None if SAFE_FIRST_CLICK else generate_pokemons(int(grid_size), int(number_of_pokemons),
+                                                               legacy=LEGACY_POKEMONS)
     grid_size = int(grid_size)
     number_of_pokemons = int(number_of_pokemons)
+    game = new_board(grid_size, pokemons or ())
+    viewport = Viewport(grid_size, *viewport_size(grid_size)) if grid_size > len(ALPHA) else None
+    renderer = viewport or GameRenderer(grid_size)
     while True:
-        display_game(game, grid_size)
+        renderer.display(game, game.pop_dirty_rows())
         action = input("\nPlease input action: ")
-        if action == 'h':
+        command = parse_command(action, grid_size)
+        kind = command.kind if command is not None else None
+        if kind == HELP:
             print(HELP_TEXT)
-        elif action == ':)':
+        elif kind == RESTART:
             print('It\'s rewind time.')
-            pokemons = generate_pokemons(grid_size, number_of_pokemons)
-            game = UNEXPOSED * int(grid_size) ** 2
-        elif action == 'q':
+            pokemons = None if SAFE_FIRST_CLICK else generate_pokemons(grid_size, number_of_pokemons,
+                                                                       legacy=LEGACY_POKEMONS)
+            game = new_board(grid_size, pokemons or ())
+        elif kind == QUIT_ACTION:
             choice_out = input('You sure about that buddy? (y/n): ')
             if choice_out == 'y':
                 print('Catch you on the flip side.')
@@ -31,334 +81,560 @@ def main():
                 print('Let\'s keep going.')
             else:
                 print('That ain\'t a valid action buddy.')
+        elif kind == SCROLL and viewport is not None:
+            viewport.scroll(*command.scroll)
+        elif kind == UNDO:
+            if not isinstance(game, Board) or not game.undo():
+                print('That ain\'t a valid action buddy.')
+        elif kind == REDO:
+            if not isinstance(game, Board) or not game.redo():
+                print('That ain\'t a valid action buddy.')
+            elif check_win(game, pokemons):
+                renderer.display(game, game.pop_dirty_rows())
+                print("You win.")
+                break
         else:
-            if parse_position(action, grid_size) is None:
+            if pokemons is None and kind == REVEAL:
+                pokemons = place_first_reveal(game, grid_size, number_of_pokemons,
+                                              position_to_index(command.position, grid_size))
+            progress = RevealFrames(renderer) if viewport is not None else None
+            event = play_command(game, grid_size, pokemons, command, progress)
+            if viewport is not None and event != INVALID_ACTION:
+                viewport.show(position_to_index(command.position, grid_size))
+            if event == INVALID_ACTION:
                 print('That ain\'t a valid action buddy.')
-            else:
-                position = parse_position(action, grid_size)
-                if position != None:
-                    if action[0] == 'f':
-                        if game[position_to_index(position, grid_size)] == FLAG:
-                            game = replace_character_at_index(game, position_to_index(position, grid_size), UNEXPOSED)
-                        else:
-                            game = replace_character_at_index(game, position_to_index(position, grid_size), FLAG)
-                    else:
-                        if game[position_to_index(position, grid_size)] != FLAG:
-                            if position_to_index(position, grid_size) in pokemons:
-                                for pokemon in pokemons:
-                                    game = replace_character_at_index(game, pokemon, POKEMON)
-                                display_game(game, grid_size)
-                                print('You have scared away all the pokemons.')
-                                break
-                            else:
-                                # Following codes have the same function with big_fun_search()
-                                # For these cells which located in neighbour directions of selected cell.
-                                # If this cell's number_at_cell is zero, update this character as '0', then keep exploring.
-                                # If this cell's number_at_cell is non-zero, update the character as 'num'.
-                                neighbour = [position_to_index(position, grid_size)]
-                                while neighbour:
-                                    index = neighbour.pop()
-                                    character = number_at_cell(game, pokemons, grid_size, index)
-                                    if character != 0:
-                                        if game[index] != FLAG:
-                                            game = replace_character_at_index(game, index, '{0}'.format(character))
-                                    else:
-                                        if game[index] == UNEXPOSED:
-                                            game = replace_character_at_index(game, index, '{0}'.format(character))
-                                        visible_list = big_fun_search(game, grid_size, pokemons, index)
-                                        for visible in visible_list:
-                                            if visible not in neighbour and game[visible] == UNEXPOSED:
-                                                character = number_at_cell(game, pokemons, grid_size, visible)
-                                                game = replace_character_at_index(game, visible, '{0}'.format(character))
+            elif event == LOST:
+                renderer.display(game, game.pop_dirty_rows())
+                print('You have scared away all the pokemons.')
+                break
 
             if check_win(game, pokemons):
-                display_game(game, grid_size)
+                renderer.display(game, game.pop_dirty_rows())
                 print("You win.")
                 break
 
 
-def display_game(game, grid_size):
+def new_board(grid_size, pokemon_locations):
     """
-    Construct the map by inputting the size of a grid-shaped display.
+    Construct the board of a new game, a ChunkedBoard for grids too large to store every cell.
+    A Board keeps an undo history.
+    Return:
+        (Board|ChunkedBoard): The board holding the pokemon locations.
+    """
+    if grid_size >= CHUNKED_BOARD_MIN_SIZE:
+        return ChunkedBoard(grid_size, pokemon_locations=pokemon_locations)
+    board = Board(grid_size, pokemon_locations=pokemon_locations)
+    board.enable_history()
+    return board
+
+
+def place_first_reveal(game, grid_size, number_of_pokemons, index, rng=random):
+    """
+    Place the pokemons of a game which waited for its first reveal, away from the
+    revealed cell, see generate_safe_pokemons. The board keeps its flags.
+    Parameters:
+        game (Board|ChunkedBoard): The board, made without pokemons
+        grid_size (int): Size of game
+        number_of_pokemons (int): The number of pokemons to place
+        index (int): Index of the first revealed cell
+        rng (random.Random): The random number generator to draw from
+    Return:
+        (tuple<int>): The pokemon locations, which the board now holds.
+    """
+    pokemon_locations = generate_safe_pokemons(grid_size, number_of_pokemons, index, rng)
+    game.set_pokemon_locations(pokemon_locations)
+    return pokemon_locations
+
+
+def take_action(game, grid_size, pokemon_locations, action):
+    """
+    Flag or reveal the cell selected by an action, or chord it to reveal its neighbours,
+    showing every pokemon when one is revealed.
     Parameters:
-        game (str): Game string
+        game (Board): The board, which is changed in place
         grid_size (int): Size of game
+        pokemon_locations (tuple<int>): The pokemon locations
+        action (str): A cell, optionally prefixed by 'f ' to flag it or 'c ' to chord it
+    Return:
+        (str): FLAGGED, REVEALED, LOST, IGNORED for revealing a flagged cell or chording
+        a number which is not satisfied, or INVALID_ACTION.
+    """
+    return play_command(game, grid_size, pokemon_locations, parse_command(action, grid_size))
+
+
+def play_command(game, grid_size, pokemon_locations, command, progress=None):
+    """
+    Play a parsed reveal, flag or chord command, see take_action.
+    Parameters:
+        command (Command): The command, any other kind or None is invalid
+        progress (callable): Called with the board after each batch of a reveal, see play_cell
+    Return:
+        (str): FLAGGED, REVEALED, LOST, IGNORED, or INVALID_ACTION.
+    """
+    if command is None or command.kind not in (REVEAL, FLAG_ACTION, CHORD):
+        return INVALID_ACTION
+    if isinstance(game, Board):
+        game.start_action()
+        try:
+            return play_cell(game, grid_size, pokemon_locations, command, progress)
+        finally:
+            game.finish_action()
+    return play_cell(game, grid_size, pokemon_locations, command, progress)
+
+
+def play_cell(game, grid_size, pokemon_locations, command, progress=None):
     """
-    game_map = ""
-    title = '  ' + WALL_VERTICAL
-    line = WALL_HORIZONTAL * 4
-    for i in range(grid_size):
-        if i < 9:
-            title += ' {0} {1}'.format(i + 1, WALL_VERTICAL)
+    Play a reveal, flag or chord command, which play_command has checked, without recording it.
+    A chord reveals the neighbours of a satisfied number (see chord_neighbours) as one batch.
+    When progress is given, a board is revealed by iter_reveal_many_cells, calling progress
+    with the board after each batch of cells.
+    Return:
+        (str): FLAGGED, REVEALED, LOST or IGNORED.
+    """
+    index = position_to_index(command.position, grid_size)
+    if command.kind == FLAG_ACTION:
+        flag_cell(game, index)
+        return FLAGGED
+    if command.kind == CHORD:
+        indexes = chord_neighbours(game, grid_size, index)
+        if not indexes:
+            return IGNORED
+    elif game[index] == FLAG:
+        return IGNORED
+    else:
+        indexes = [index]
+    if any(cell in pokemon_locations for cell in indexes):
+        for pokemon in pokemon_locations:
+            replace_character_at_index(game, pokemon, POKEMON)
+        return LOST
+    if progress is None or isinstance(game, str):
+        reveal_many_cells(game, grid_size, pokemon_locations, indexes)
+    else:
+        for _ in iter_reveal_many_cells(game, grid_size, pokemon_locations, indexes):
+            progress(game)
+    return REVEALED
+
+
+def run_game(grid_size, actions, pokemon_locations=None, number_of_pokemons=0, seed=None,
+             safe_first_click=False, legacy_pokemons=False):
+    """
+    Play a game without prompts or printing, the way main would play the same input lines.
+    Parameters:
+        grid_size (int): Size of game
+        actions (iterable<str>|str): The input lines, or newline separated actions, where
+            a 'q' is followed by its y/n answer
+        pokemon_locations (tuple<int>): The pokemon locations, generated from the seed when None
+        number_of_pokemons (int): The number of pokemons to generate
+        seed (int): Seed of the pokemon locations of this game and of every restart
+        safe_first_click (bool): Generate the pokemons on the first reveal of each game,
+            away from the revealed cell, see place_first_reveal
+        legacy_pokemons (bool): Generate the pokemons the way the original game did, see generate_pokemons
+    Return:
+        (tuple<Board, list<tuple<str, str>>>): The final board and the (action, event)
+        log, which ends in WON, LOST or QUIT unless the actions ran out.
+    """
+    rng = random.Random(seed)
+    if pokemon_locations is not None:
+        number_of_pokemons = len(pokemon_locations)
+        safe_first_click = False
+    elif not safe_first_click:
+        pokemon_locations = generate_pokemons(grid_size, number_of_pokemons, rng, legacy_pokemons)
+    game = new_board(grid_size, pokemon_locations or ())
+    if isinstance(actions, str):
+        actions = actions.splitlines()
+    events = []
+    actions = iter(actions)
+    for action in actions:
+        command = parse_command(action, grid_size)
+        kind = command.kind if command is not None else None
+        if kind == HELP:
+            events.append((action, HELPED))
+        elif kind == RESTART:
+            pokemon_locations = None
+            if not safe_first_click:
+                pokemon_locations = generate_pokemons(grid_size, number_of_pokemons, rng, legacy_pokemons)
+            game = new_board(grid_size, pokemon_locations or ())
+            events.append((action, RESTARTED))
+        elif kind == QUIT_ACTION:
+            choice_out = next(actions, None)
+            if choice_out == 'y':
+                events.append((action, QUIT))
+                break
+            events.append((action, CONTINUED if choice_out == 'n' else INVALID_ACTION))
+        elif kind in (UNDO, REDO):
+            done = isinstance(game, Board) and (game.undo() if kind == UNDO else game.redo())
+            events.append((action, (UNDONE if kind == UNDO else REDONE) if done else INVALID_ACTION))
+            if done and check_win(game, pokemon_locations):
+                events.append((action, WON))
+                break
         else:
-            title += ' {0}{1}'.format(i + 1, WALL_VERTICAL)
-        line += WALL_HORIZONTAL * 4
+            if pokemon_locations is None and kind == REVEAL:
+                pokemon_locations = place_first_reveal(game, grid_size, number_of_pokemons,
+                                                       position_to_index(command.position, grid_size), rng)
+            event = play_command(game, grid_size, pokemon_locations, command)
+            events.append((action, event))
+            if event == LOST:
+                break
+            if check_win(game, pokemon_locations):
+                events.append((action, WON))
+                break
+    return game, events
 
-    game_map += title + "\n" + line + '\n'
 
-    for y in range(grid_size):
-        game_map += ALPHA[y] + " " + WALL_VERTICAL
-        for x in range(grid_size):
-            index = x + y * grid_size
-            game_map += ' ' + game[index] + ' ' + WALL_VERTICAL
-        game_map += '\n' + line + '\n'
-    game_map = game_map.rstrip('\n')
-    print(game_map)
+class GameRenderer:
+    """
+    Renders the map of a game frame after frame. Rows are built with str.join, the
+    title and separator rows come from display_frame, and rows which have not changed
+    since the last frame are reused, so only the dirty rows of a Board are rebuilt.
+    """
 
+    def __init__(self, grid_size):
+        """
+        Construct a renderer with no previous frame.
+        Parameters:
+            grid_size (int): Size of game
+        """
+        self._grid_size = grid_size
+        self._rows = None
+
+    def render(self, game, dirty_rows=None):
+        """
+        Construct the map of the game.
+        Parameters:
+            game (str|Board): Game string or board
+            dirty_rows (set<int>): Rows changed since the last frame, None to rebuild every row.
+        Return:
+            (str): The map, without a trailing new line.
+        """
+        if self._rows is None or dirty_rows is None:
+            self._rows = [display_row(game, self._grid_size, row) for row in range(self._grid_size)]
+        else:
+            for row in dirty_rows:
+                self._rows[row] = display_row(game, self._grid_size, row)
+        title, line = display_frame(self._grid_size)
+        return f'{title}\n{line}\n' + ''.join(f'{row}\n{line}\n' for row in self._rows)[:-1]
+
+    def display(self, game, dirty_rows=None):
+        """
+        Print the map of the game with a single write.
+        Parameters:
+            game (str|Board): Game string or board
+            dirty_rows (set<int>): Rows changed since the last frame, None to rebuild every row.
+        """
+        sys.stdout.write(self.render(game, dirty_rows) + '\n')
+
+
+class RevealFrames:
+    """
+    The progress of a reveal, see play_cell, which displays the board while the reveal
+    is still going, at most once every interval seconds.
+    """
 
-def parse_position(action, grid_size):
+    def __init__(self, renderer, interval=REVEAL_FRAME_SECONDS):
+        """
+        Construct the progress of a reveal starting now.
+        Parameters:
+            renderer (GameRenderer|Viewport): Displays the frames
+            interval (float): Least seconds between frames
+        """
+        self._renderer = renderer
+        self._interval = interval
+        self._last = time.perf_counter()
+        self._frames = 0
+
+    def __call__(self, game):
+        """Display the board if interval seconds have passed since the last frame."""
+        now = time.perf_counter()
+        if now - self._last >= self._interval:
+            self._renderer.display(game, game.pop_dirty_rows())
+            self._last = now
+            self._frames += 1
+
+    def get_frames(self):
+        """(int) Return the number of frames displayed."""
+        return self._frames
+
+
+class Viewport:
     """
-    This function checks the effectiveness of input action, and return None if the action is
-    invalid input.
+    A window of rows and columns of the map, so the cost of displaying a board is
+    bounded by the window rather than the board. The window follows the cells
+    played, and can be scrolled.
+    """
+
+    def __init__(self, grid_size, height, width):
+        """
+        Construct a viewport at the top left of the map.
+        Parameters:
+            grid_size (int): Size of game
+            height (int): Rows shown, at most grid_size
+            width (int): Columns shown, at most grid_size
+        """
+        self._grid_size = grid_size
+        self._height = max(1, min(height, grid_size))
+        self._width = max(1, min(width, grid_size))
+        self._top = 0
+        self._left = 0
+
+    def get_window(self):
+        """(tuple<int, int, int, int>) Return the top row, left column, height and width shown."""
+        return self._top, self._left, self._height, self._width
+
+    def scroll(self, rows, columns):
+        """Move the window by a number of rows and columns, stopping at the edges of the map."""
+        self._top = max(0, min(self._grid_size - self._height, self._top + rows))
+        self._left = max(0, min(self._grid_size - self._width, self._left + columns))
+
+    def show(self, index):
+        """Centre the window on the cell at index, unless the cell is already shown."""
+        row, column = divmod(index, self._grid_size)
+        if not self._top <= row < self._top + self._height:
+            self.scroll(row - self._height // 2 - self._top, 0)
+        if not self._left <= column < self._left + self._width:
+            self.scroll(0, column - self._width // 2 - self._left)
+
+    def render(self, game):
+        """(str) Construct the map of the window, without a trailing new line."""
+        return display_window(game, self._grid_size, self._top, self._left, self._height, self._width)
+
+    def display(self, game, dirty_rows=None):
+        """
+        Print the map of the window with a single write. The whole window is rebuilt,
+        so dirty_rows is only accepted to match GameRenderer.display.
+        """
+        sys.stdout.write(self.render(game) + '\n')
+
+
+def viewport_size(grid_size):
+    """
+    Work out the rows and columns of the map which fit the terminal.
     Return:
-        position (tuple<int>): Convert input action<str> to position<tuple>
+        (tuple<int, int>): The height and width of a viewport.
     """
-    while True:
-        command_lst = action.split(' ')
-        if len(command_lst) == 1:
-            if command_lst[0] == '':
-                return None
-            command = command_lst[0][0]
-            x = ALPHA.find(command[0])
-            if x == -1:
-                return None
-            y_str = command_lst[0][1:]
-            if not y_str.isdigit():
-                return None
-            y = int(y_str)
-            if y > grid_size:
-                return None
-            position = (x, y - 1)
-            return position
-        elif len(command_lst) == 2:
-            if command_lst[0] != 'f':
-                return None
-            else:
-                command = command_lst[1]
-                if command == '':
-                    return None
-                x = ALPHA.find(command[0])
-                if x == -1:
-                    return None
-                y_str = command[1:]
-                if not y_str.isdigit():
-                    return None
-                y = int(y_str)
-                if y > grid_size:
-                    return None
-                position = (x, y - 1)
-                return position
-
-
-def position_to_index(position, grid_size) -> int:
-    """
-    This function should convert the row, column coordinate in the grid to the game strings index.
-    The function returns an integer representing the index of the cell in the game string.
+    terminal = shutil.get_terminal_size()
+    cell_width = max(2, len(str(grid_size))) + 2
+    label_width = len(row_label(grid_size - 1)) + 2
+    return max(1, (terminal.lines - 4) // 2), max(1, (terminal.columns - label_width) // cell_width)
+
+
+def row_label(row):
+    """
+    Return the label of a row: A to Z, then AA, AB and so on.
     Parameters:
-        grid_size (int): Size of game.
-        pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
-    return:
-        index (int): Convert position<tuple> to index<int>
+        row (int): Row of the map
+    Return:
+        (str): The row label.
     """
-    index = position[0] * grid_size + position[1]
-    return index
+    label = ''
+    row += 1
+    while row:
+        row, letter = divmod(row - 1, len(ALPHA))
+        label = ALPHA[letter] + label
+    return label
 
 
-def replace_character_at_index(game, index, character) -> str:
+def display_window(game, grid_size, top, left, height, width):
     """
-    The function modifies the specified characters in the game according to the index of cell.
+    Construct the map of a window of the game. The cells are widened when the column
+    numbers need more than two digits, and the row labels when they need more than a letter.
     Parameters:
-        game (str): Game string.
-        index (int): Index of the currently selected cell
-        character (str): A flag or other characters could be placed on each call
+        game (str|Board|ChunkedBoard): Game string or board
+        grid_size (int): Size of game
+        top (int): First row shown
+        left (int): First column shown
+        height (int): Rows shown
+        width (int): Columns shown
     Return:
-        game (str): Updated game string.
+        (str): The map, without a trailing new line.
     """
-    game = game[:index] + character + game[index + 1:]
-    return game
+    rows = range(top, min(grid_size, top + height))
+    columns = range(left, min(grid_size, left + width))
+    cell_width = max(2, len(str(columns[-1] + 1)))
+    label_width = len(row_label(rows[-1]))
+    title, line = display_title(columns, label_width)
+    lines = [title, line]
+    for row in rows:
+        start = row * grid_size + left
+        lines += [display_cells(game, start, start + len(columns), row_label(row), label_width, cell_width),
+                  line]
+    return '\n'.join(lines)
 
 
-def flag_cell(game, index) -> str:
+def display_game(game, grid_size):
     """
-    The function judges whether the cell is a flag, then converts to '~' if it's a flag,
-    converts to flag if it's '~'.
+    Construct the map by inputting the size of a grid-shaped display.
+    Parameters:
+        game (str|Board): Game string or board
+        grid_size (int): Size of game
     """
-    if game[index] == FLAG:
-        return replace_character_at_index(game, index, UNEXPOSED)
-    else:
-        return replace_character_at_index(game, index, FLAG)
+    GameRenderer(grid_size).display(game)
+
+
+@lru_cache(maxsize=NEIGHBOUR_TABLE_CACHE_SIZE)
+def display_frame(grid_size):
+    """
+    Build the column title row and the separator row of a grid size, which are the
+    same for every frame and so are cached.
+    Return:
+        (tuple<str, str>): The title row and the separator row.
+    """
+    return display_title(range(grid_size), len(row_label(grid_size - 1)))
 
 
-def index_in_direction(index, grid_size, direction):
+def display_title(columns, label_width):
     """
-    The function return the index of the direction position.
+    Build the column title row and the separator row of some columns. Cells are two
+    characters wide, or wider when the column numbers need more digits.
     Parameters:
-        direction: Neighbouring directions, provided by support.py, namely up, down, left, right，etc.
+        columns (range): The columns shown
+        label_width (int): Width of the row labels
     Return:
-        new_index (int): Index of effective directions of neighbouring pokemon.
-    """
-    up = DIRECTIONS[0]
-    down = DIRECTIONS[1]
-    left = DIRECTIONS[2]
-    right = DIRECTIONS[3]
-    up_left = DIRECTIONS[4]
-    up_right = DIRECTIONS[5]
-    down_left = DIRECTIONS[6]
-    down_right = DIRECTIONS[7]
-
-    if direction == up:
-        if index < grid_size:
-            return None
-        else:
-            new_index = index - grid_size
-            return new_index
-    elif direction == down:
-        if index >= grid_size * grid_size - grid_size:
-            return None
-        else:
-            new_index = index + grid_size
-            return new_index
+        (tuple<str, str>): The title row and the separator row.
+    """
+    cell_width = max(2, len(str(columns[-1] + 1)))
+    title = ' ' * (label_width + 1) + WALL_VERTICAL + ''.join(
+        f' {column + 1:<{cell_width}}{WALL_VERTICAL}' for column in columns)
+    line = WALL_HORIZONTAL * ((cell_width + 2) * len(columns) + max(cell_width + 2, label_width + 3))
+    return title, line
 
-    elif direction == left:
-        if index < (index // grid_size) * grid_size + 1:
-            return None
-        else:
-            new_index = index - 1
-            return new_index
 
-    elif direction == right:
-        if index >= (index // grid_size + 1) * grid_size - 1:
-            return None
-        else:
-            new_index = index + 1
-            return new_index
+def display_cells(game, start, stop, label, label_width, cell_width):
+    """
+    Construct the display of a run of cells of one row.
+    Parameters:
+        game (str|Board|ChunkedBoard): Game string or board
+        start (int): Index of the first cell
+        stop (int): Index after the last cell
+        label (str): The row label
+        label_width (int): Width of the row labels
+        cell_width (int): Width of the cells
+    Return:
+        (str): The row label followed by the cells.
+    """
+    if cell_width == 2:
+        cells = f' {WALL_VERTICAL} '.join(game[start:stop])
+        return f'{label:<{label_width}} {WALL_VERTICAL} {cells} {WALL_VERTICAL}'
+    cells = ''.join(f' {cell:<{cell_width}}{WALL_VERTICAL}' for cell in game[start:stop])
+    return f'{label:<{label_width}} {WALL_VERTICAL}{cells}'
 
-    elif direction == up_left:
-        if index - grid_size - 1 >= (index // grid_size - 1) * grid_size and index - grid_size - 1 >= 0:
-            new_index = index - grid_size - 1
-            return new_index
-        else:
-            return None
 
-    elif direction == up_right:
-        if index // grid_size * grid_size > index - grid_size + 1 >= 0:
-            new_index = index - grid_size + 1
-            return new_index
-        else:
-            return None
+def display_row(game, grid_size, row):
+    """
+    Construct the display of one row of the map.
+    Parameters:
+        game (str|Board): Game string or board
+        grid_size (int): Size of game
+        row (int): Row of the map
+    Return:
+        (str): The row label followed by the row's cells.
+    """
+    start = row * grid_size
+    return display_cells(game, start, start + grid_size, row_label(row),
+                         len(row_label(grid_size - 1)), max(2, len(str(grid_size))))
 
-    elif direction == down_left:
-        if (index // grid_size + 1) * grid_size <= index + grid_size - 1 < (
-                index // grid_size + 2) * grid_size and index + grid_size - 1 < grid_size * grid_size:
-            new_index = index + grid_size - 1
-            return new_index
-        else:
-            return None
 
-    elif direction == down_right:
-        if (index // grid_size + 1) * grid_size <= index + grid_size + 1 < (
-                index // grid_size + 2) * grid_size and index + grid_size + 1 < grid_size * grid_size:
-            new_index = index + grid_size + 1
-            return new_index
-        else:
-            return None
+def parse_position(action, grid_size):
+    """
+    This function checks the effectiveness of input action, and return None if the action is
+    invalid input.
+    Return:
+        position (tuple<int>): Convert input action<str> to position<tuple>
+    """
+    command = parse_command(action, grid_size)
+    if command is None or command.kind not in (REVEAL, FLAG_ACTION):
+        return None
+    return command.position
 
 
-def neighbour_directions(index, grid_size):
+def parse_command(action, grid_size):
+    """
+    Parse an action in a single match of ACTION_PATTERN. Row labels may have several
+    letters (see row_label), and the row and column must be on the grid.
+    Parameters:
+        action (str): The input action
+        grid_size (int): Size of game
+    Return:
+        (Command): The command, or None if the action is invalid.
+    """
+    command = WORD_COMMANDS.get(action)
+    if command is not None:
+        return command
+    match = ACTION_PATTERN.fullmatch(action)
+    if match is None:
+        return None
+    prefix, label, column, direction, steps = match.groups()
+    if direction is not None:
+        row_delta, column_delta = DIRECTION_DELTAS[direction]
+        steps = int(steps or 1)
+        return Command(SCROLL, scroll=(row_delta * steps, column_delta * steps))
+    if len(label) == 1:
+        row = LETTER_ROWS[label]
+    else:
+        row = 0
+        for letter in label:
+            row = row * len(ALPHA) + LETTER_ROWS[letter] + 1
+        row -= 1
+    column = int(column)
+    if row >= grid_size or not 1 <= column <= grid_size:
+        return None
+    kind = {None: REVEAL, 'f ': FLAG_ACTION, 'c ': CHORD}[prefix]
+    return Command(kind, (row, column - 1))
+
+
+def parse_actions(actions, grid_size):
     """
-    Creat a list to store index of neighbouring directions.
+    Parse newline separated actions, such as piped input.
     Return:
-        (list<int>): Index of neighbouring direction.
+        (list<Command>): The command of each line, None for an invalid one.
     """
-    neighbours = []
-    for i in DIRECTIONS:
-        if index_in_direction(index, grid_size, i) is not None:
-            neighbours.append(index_in_direction(index, grid_size, i))
-    return neighbours
+    return [parse_command(action, grid_size) for action in actions.splitlines()]
 
 
-def number_at_cell(game, pokemon_locations, grid_size, index) -> int:
+def save_game(game, grid_size, pokemon_locations, seed=None):
     """
-    Count the number of pokemon(s) in neighbouring directions.
+    Build the board_snapshot of a game. A ChunkedBoard cannot be saved, since a
+    snapshot holds the state of every cell.
+    Parameters:
+        game (str|Board): Game string or board
+        grid_size (int): Size of game
+        pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations
+        seed (int): The seed the pokemons were generated from, if known
     Return:
-        count (int): The number of pokemon in neighbouring direction
+        (bytes): The snapshot.
+    Raise:
+        board_snapshot.SnapshotError: If the game is a ChunkedBoard.
     """
-    count = 0
-    if index not in pokemon_locations:
-        for n in neighbour_directions(index, grid_size):
-            if n in pokemon_locations:
-                count += 1
-    return count
+    if isinstance(game, ChunkedBoard):
+        raise board_snapshot.SnapshotError(f"A {grid_size}x{grid_size} chunked board cannot be saved")
+    if isinstance(game, Board):
+        states = game.get_cells().translate(CODE_STATES)
+    else:
+        states = board_snapshot.game_states(game, UNEXPOSED, FLAG, POKEMON)
+    return board_snapshot.pack_snapshot(grid_size, states, pokemon_locations, seed)
 
 
-def check_win(game, pokemon_locations) -> bool:
+def restore_game(snapshot):
     """
-    Check win or not by methods of judging whether these flags are in the positions
-    of all pokemon，and other judgment methods.
+    Restore the board of a snapshot made by save_game. The numbers of the exposed cells
+    are taken from the board's counts, combined with the other cells as integers.
+    Like the board of new_board, it keeps an undo history.
+    Parameters:
+        snapshot (bytes): The snapshot
     Return:
-        (bool): Boolean output related to current game.
-    """
-    count_flag = 0
-    count_exopsed = 0
-    for i in game:
-        if i == FLAG:
-            count_flag += 1
-        if i == UNEXPOSED:
-            count_exopsed += 1
-    if count_exopsed != 0 or count_flag != len(pokemon_locations):
-        return False
-    for k in pokemon_locations:
-        if game[k] != FLAG:
-            return False
-    return True
-
-
-# #########################UNCOMMENT THIS FUNCTION WHEN READY#######################
-def big_fun_search(game, grid_size, pokemon_locations, index):
-    """Searching adjacent cells to see if there are any Pokemon"s present.
-	Using some sick algorithms.
-	Find all cells which should be revealed when a cell is selected.
-	For cells which have a zero value (i.e. no neighbouring pokemons) all the cell"s
-	neighbours are revealed. If one of the neighbouring cells is also zero then
-	all of that cell"s neighbours are also revealed. This repeats until no
-	zero value neighbours exist.
-	For cells which have a non-zero value (i.e. cells with neighbour pokemons), only
-	the cell itself is revealed.
-	Parameters:
-		game (str): Game string.
-		grid_size (int): Size of game.
-		pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
-		index (int): Index of the currently selected cell
-	Returns:
-		(list<int>): List of cells to turn visible.
-	"""
-    queue = [index]
-    discovered = [index]
-    visible = []
-
-    if game[index] == FLAG:
-        return queue
-
-    number = number_at_cell(game, pokemon_locations, grid_size, index)
-    if number != 0:
-        return queue
-
-    while queue:
-        node = queue.pop()
-        for neighbour in neighbour_directions(node, grid_size):
-            if neighbour in discovered or neighbour is None:
-                continue
-
-            discovered.append(neighbour)
-            if game[neighbour] != FLAG:
-                number = number_at_cell(game, pokemon_locations, grid_size, neighbour)
-                if number == 0:
-                    queue.append(neighbour)
-            visible.append(neighbour)
-    return visible
-
-
-# #########################UNCOMMENT THIS FUNCTION WHEN READY#######################
+        (tuple<Board, int>): The board holding the pokemon locations, and the seed (None if unknown).
+    Raise:
+        board_snapshot.SnapshotError: If the data is not a snapshot.
+    """
+    grid_size, states, pokemon_locations, seed = board_snapshot.unpack_snapshot(snapshot)
+    board = Board(grid_size, pokemon_locations=pokemon_locations)
+    cell_count = len(states)
+    cells = (int.from_bytes(states.translate(STATE_CODES), 'little')
+             | int.from_bytes(states.translate(EXPOSED_MASK), 'little')
+             & int.from_bytes(board.get_counts(), 'little'))
+    board.set_cells(cells.to_bytes(cell_count, 'little'))
+    board.enable_history()
+    return board, seed
+
 
 if __name__ == "__main__":
     main()
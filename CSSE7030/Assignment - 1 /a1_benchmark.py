@@ -0,0 +1,223 @@
+"""
+Benchmarks of the Assignment 1 game functions across grid sizes and pokemon densities.
+
+Results are stored as JSON, and compared against a saved baseline to flag regressions, e.g.
+    python a1_benchmark.py --output bench.json --baseline baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from a1 import *
+
+BENCHMARK_SIZES = (5, 10, 26, 100, 500, 2000)
+BENCHMARK_DENSITIES = (0.05, 0.15, 0.3)
+# Number of cells, actions or indexes each benchmark call goes through
+SAMPLE_SIZE = 1000
+# A result this much slower than its baseline is a regression
+REGRESSION_THRESHOLD = 0.25
+
+
+class Fixture:
+    """
+    The board of one grid size and density, shared by every benchmark of it.
+    """
+
+    def __init__(self, grid_size, density, seed=0):
+        """
+        Construct the seeded board and sample indexes of a grid size and density.
+        Parameters:
+            grid_size (int): Size of game
+            density (float): The fraction of cells which are pokemons
+            seed (int): Seed of the pokemon locations and samples
+        """
+        rng = random.Random(seed)
+        self.grid_size = grid_size
+        locations, self.pokemons = place_pokemons(grid_size, round(density * grid_size ** 2), rng)
+        self.pokemon_locations = tuple(locations)
+        self.board = Board(grid_size, pokemon_locations=self.pokemon_locations)
+        self.indexes = [rng.randrange(grid_size ** 2) for _ in range(SAMPLE_SIZE)]
+        # A cell with no neighbouring pokemons, so big_fun_search floods from it
+        self.empty = next((index for index in self.indexes
+                           if index not in self.pokemons and self.board.number_at(index) == 0),
+                          self.indexes[0])
+
+
+def bench_display_game(fixture):
+    """(callable) Display the whole board, into a buffer."""
+    output = io.StringIO()
+
+    def run():
+        output.seek(0)
+        with contextlib.redirect_stdout(output):
+            display_game(fixture.board, fixture.grid_size)
+    return run
+
+
+def bench_parse_position(fixture):
+    """(callable) Parse a sample of reveal and flag actions."""
+    grid_size = fixture.grid_size
+    actions = []
+    for index in fixture.indexes:
+        row, column = divmod(index, grid_size)
+        actions.append(f"{'f ' * (index % 2)}{row_label(row)}{column + 1}")
+    return lambda: [parse_position(action, grid_size) for action in actions]
+
+
+def bench_index_in_direction(fixture):
+    """(callable) Step from a sample of cells in every direction."""
+    grid_size = fixture.grid_size
+    steps = [(index, direction) for index in fixture.indexes[:SAMPLE_SIZE // len(DIRECTIONS)]
+             for direction in DIRECTIONS]
+    return lambda: [index_in_direction(index, grid_size, direction) for index, direction in steps]
+
+
+def bench_neighbour_directions(fixture):
+    """(callable) Find the neighbours of a sample of cells."""
+    grid_size = fixture.grid_size
+    return lambda: [neighbour_directions(index, grid_size) for index in fixture.indexes]
+
+
+def bench_number_at_cell(fixture):
+    """(callable) Count the neighbouring pokemons of a sample of cells."""
+    board, grid_size = fixture.board, fixture.grid_size
+    return lambda: [number_at_cell(board, fixture.pokemon_locations, grid_size, index)
+                    for index in fixture.indexes]
+
+
+def bench_big_fun_search(fixture):
+    """(callable) Search the cells revealed from a cell with no neighbouring pokemons."""
+    return lambda: big_fun_search(fixture.board, fixture.grid_size, fixture.pokemon_locations,
+                                  fixture.empty)
+
+
+def bench_check_win(fixture):
+    """(callable) Check a board which is won but for its last flag."""
+    board = Board(fixture.grid_size, pokemon_locations=fixture.pokemon_locations)
+    board.reveal_range(0, len(board))
+    for pokemon in fixture.pokemon_locations[1:]:
+        board[pokemon] = FLAG
+    return lambda: check_win(board, fixture.pokemon_locations)
+
+
+BENCHMARKS = {
+    'display_game': bench_display_game,
+    'parse_position': bench_parse_position,
+    'index_in_direction': bench_index_in_direction,
+    'neighbour_directions': bench_neighbour_directions,
+    'number_at_cell': bench_number_at_cell,
+    'big_fun_search': bench_big_fun_search,
+    'check_win': bench_check_win,
+}
+
+
+def time_call(run, min_time=0.2, repeat=3):
+    """
+    Time a call, repeating it until it takes min_time, and keep the best of repeat runs.
+    Return:
+        (float): The seconds taken by one call.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat or number >= 2 ** 20:
+            break
+        number *= 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def result_key(name, grid_size, density):
+    """(str) Return the key of a benchmark result."""
+    return f'{name}/{grid_size}/{density}'
+
+
+def run_benchmarks(sizes=BENCHMARK_SIZES, densities=BENCHMARK_DENSITIES, names=None,
+                   min_time=0.2, seed=0):
+    """
+    Time the benchmarks of every grid size and density.
+    Parameters:
+        sizes (list<int>): The grid sizes
+        densities (list<float>): The pokemon densities
+        names (list<str>): The benchmarks to run, all of BENCHMARKS when None
+        min_time (float): The least seconds spent timing each result
+        seed (int): Seed of every fixture
+    Return:
+        (dict): The environment and the seconds per call of each result key.
+    """
+    results = {}
+    for grid_size in sizes:
+        for density in densities:
+            fixture = Fixture(grid_size, density, seed)
+            for name in names or BENCHMARKS:
+                run = BENCHMARKS[name](fixture)
+                results[result_key(name, grid_size, density)] = time_call(run, min_time)
+    return {
+        'python': platform.python_version(),
+        'numpy': numpy is not None,
+        'results': results,
+    }
+
+
+def find_regressions(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare a report against a baseline report.
+    Return:
+        (list<tuple<str, float, float>>): The key, baseline seconds and current seconds of
+        every result more than threshold slower than its baseline, slowest first.
+    """
+    regressions = []
+    for key, seconds in report['results'].items():
+        before = baseline['results'].get(key)
+        if before is not None and seconds > before * (1 + threshold):
+            regressions.append((key, before, seconds))
+    return sorted(regressions, key=lambda regression: regression[1] / regression[2])
+
+
+def main():
+    """Run the benchmarks from the command line, exiting with 1 on a regression."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=BENCHMARK_SIZES)
+    parser.add_argument('--densities', type=float, nargs='+', default=BENCHMARK_DENSITIES)
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=None)
+    parser.add_argument('--min-time', type=float, default=0.2)
+    parser.add_argument('--output', help='file to store the results in')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.densities, args.benchmarks, args.min_time)
+    for key, seconds in report['results'].items():
+        print(f'{key:<40} {seconds * 1e6:>14.2f} us')
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = find_regressions(report, json.load(file), args.threshold)
+        for key, before, seconds in regressions:
+            print(f'REGRESSION {key}: {before * 1e6:.2f} us -> {seconds * 1e6:.2f} us')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
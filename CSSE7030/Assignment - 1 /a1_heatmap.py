@@ -0,0 +1,393 @@
+"""
+A heatmap of the chance that each unexposed cell of an Assignment 1 game hides a
+pokemon, worked out from the exposed numbers only, for hints and analytics.
+
+The frontier, the unexposed cells next to an exposed number, is split into groups
+which share no number, so each group is counted on its own. A group is counted by
+backtracking over its cells, memoised on the cell and the pokemons its numbers
+still need, which gives the number of ways it can hold each number of pokemons.
+The groups and the cells away from the frontier are then combined by the number
+of pokemons left, e.g.
+    heatmap = Heatmap(grid_size, number_of_pokemons)
+    chances = heatmap.update(game)
+    chances = heatmap.update(game, changed)  # after a reveal of the changed cells
+"""
+import time
+from bisect import bisect_right
+from math import exp, lgamma
+
+from a1 import *
+
+# Seconds an update may spend counting groups, groups left over are estimated
+HEATMAP_TIME_BUDGET = 0.5
+# Number of counting steps between checks of the time budget
+BUDGET_CHECK_STEPS = 1024
+
+
+class OutOfTime(Exception):
+    """Raised when counting a group runs past the time budget."""
+
+
+def add_poly(poly, other, shift=0):
+    """
+    Add other, moved up by shift pokemons, into poly in place.
+    Parameters:
+        poly (list<int>): The number of ways to hold each number of pokemons
+        other (list<int>): The ways to add
+        shift (int): The pokemons added to each way of other
+    """
+    if len(poly) < len(other) + shift:
+        poly.extend([0] * (len(other) + shift - len(poly)))
+    for pokemons, ways in enumerate(other):
+        poly[pokemons + shift] += ways
+
+
+def multiply_poly(poly, other):
+    """(list<int>) Return the ways to hold each number of pokemons over two independent parts."""
+    product = [0] * (len(poly) + len(other) - 1)
+    for pokemons, ways in enumerate(poly):
+        if ways:
+            for other_pokemons, other_ways in enumerate(other):
+                product[pokemons + other_pokemons] += ways * other_ways
+    return product
+
+
+class Group:
+    """
+    Counts the ways the cells of one frontier group can hold pokemons.
+
+    The cells are visited in breadth first order, so a number is only open between
+    its first and last cell. A state is the pokemons still needed by the open numbers,
+    and the ways to reach and to finish each state are kept per cell, so every state
+    is counted once however many assignments lead to it.
+    """
+
+    def __init__(self, cells, constraints):
+        """
+        Prepare the cell order and the open numbers of every step.
+        Parameters:
+            cells (list<int>): The cells of the group, in the order to visit them
+            constraints (list<tuple<frozenset<int>, int>>): The cells of each number and
+                the pokemons it still needs
+        """
+        self.cells = cells
+        position = {cell: i for i, cell in enumerate(cells)}
+        positions = [sorted(position[cell] for cell in group_cells) for group_cells, _ in constraints]
+        touching = [[] for _ in cells]
+        opening = [[] for _ in range(len(cells) + 1)]
+        closing_at = [[] for _ in range(len(cells) + 1)]
+        for number, number_positions in enumerate(positions):
+            for i in number_positions:
+                touching[i].append(number)
+            opening[number_positions[0] + 1].append(number)
+            closing_at[number_positions[-1] + 1].append(number)
+
+        # the plan of each step: for every number open after the cell, where its need
+        # comes from, whether the cell counts for it and the most it may still need,
+        # then the numbers which close on the cell
+        self._steps = []
+        open_numbers = {}
+        for i in range(len(cells)):
+            slots = {number: slot for slot, number in enumerate(open_numbers)}
+            for number in closing_at[i + 1]:
+                open_numbers.pop(number, None)
+            for number in opening[i + 1]:
+                if number not in closing_at[i + 1]:
+                    open_numbers[number] = None
+            plan = [(slots.get(number), constraints[number][1], number in touching[i],
+                     len(positions[number]) - bisect_right(positions[number], i))
+                    for number in open_numbers]
+            closing = [(slots.get(number), constraints[number][1]) for number in closing_at[i + 1]]
+            self._steps.append((plan, closing))
+        self._start = ()
+
+    def _step(self, i, state, pokemon):
+        """(tuple<int>) Return the state after cell i holds pokemon (0 or 1), None if it breaks a number."""
+        plan, closing = self._steps[i]
+        for slot, needed in closing:
+            if (needed if slot is None else state[slot]) != pokemon:
+                return None
+        after = []
+        for slot, needed, touched, left in plan:
+            need = (needed if slot is None else state[slot]) - (pokemon if touched else 0)
+            if not 0 <= need <= left:
+                return None
+            after.append(need)
+        return tuple(after)
+
+    def count(self, deadline=None):
+        """
+        Count the ways of the group.
+        Parameters:
+            deadline (float): The time.perf_counter() to stop at, None for no limit
+        Return:
+            (tuple<list<int>, dict<int, list<int>>>): The ways to hold each number of
+            pokemons, and the ways of those in which each cell is a pokemon.
+        Raise:
+            OutOfTime: If the deadline passes.
+        """
+        if deadline is not None and time.perf_counter() >= deadline:
+            raise OutOfTime()
+        steps = 0
+        # forward: the ways to reach each state before every cell
+        reached = [{self._start: [1]}]
+        for i in range(len(self.cells)):
+            after = {}
+            for state, ways in reached[i].items():
+                for pokemon in (0, 1):
+                    next_state = self._step(i, state, pokemon)
+                    if next_state is not None:
+                        add_poly(after.setdefault(next_state, []), ways, pokemon)
+                steps += 1
+                if steps % BUDGET_CHECK_STEPS == 0 and deadline is not None and time.perf_counter() > deadline:
+                    raise OutOfTime()
+            reached.append(after)
+
+        # backward: the ways to finish from each reachable state, and the cell marginals
+        finish = {state: [1] for state in reached[-1]}
+        marginals = {}
+        for i in range(len(self.cells) - 1, -1, -1):
+            before = {}
+            marginal = []
+            for state, ways in reached[i].items():
+                total = []
+                for pokemon in (0, 1):
+                    next_state = self._step(i, state, pokemon)
+                    rest = finish.get(next_state) if next_state is not None else None
+                    if rest is None:
+                        continue
+                    add_poly(total, rest, pokemon)
+                    if pokemon:
+                        add_poly(marginal, multiply_poly(ways, rest), 1)
+                if total:
+                    before[state] = total
+                steps += 1
+                if steps % BUDGET_CHECK_STEPS == 0 and deadline is not None and time.perf_counter() > deadline:
+                    raise OutOfTime()
+            marginals[self.cells[i]] = marginal
+            finish = before
+        return finish.get(self._start, [0]), marginals
+
+
+class Heatmap:
+    """
+    Keeps the pokemon chance of every unexposed cell of a game up to date.
+
+    The numbers on the frontier are kept between updates, and an update given the
+    changed cells only looks at the numbers around them. Groups are counted again
+    only when their numbers changed, the counts of the others are reused. When the
+    time budget runs out, the groups not yet counted are estimated from their
+    numbers alone, and is_exact tells the chances apart.
+    """
+
+    def __init__(self, grid_size, number_of_pokemons, time_budget=HEATMAP_TIME_BUDGET):
+        """
+        Construct the heatmap of one game.
+        Parameters:
+            grid_size (int): Size of game
+            number_of_pokemons (int): The number of pokemons hidden in the game
+            time_budget (float): Seconds an update may spend counting, None for no limit
+        """
+        self._grid_size = grid_size
+        self._number_of_pokemons = number_of_pokemons
+        self._time_budget = time_budget
+        self._constraints = None
+        self._counted = {}
+        self._groups = []
+        self._chances = {}
+        self._exact = True
+
+    def get_chances(self):
+        """(dict<int, float>) Return the pokemon chance of every unexposed cell at the last update."""
+        return self._chances
+
+    def get_groups(self):
+        """(list<list<int>>) Return the frontier groups of the last update, as their cells."""
+        return self._groups
+
+    def is_exact(self):
+        """(bool) Return whether every group was counted at the last update."""
+        return self._exact
+
+    def _constraint(self, game, index):
+        """
+        Find the constraint of a cell.
+        Return:
+            (tuple<frozenset<int>, int>): The unexposed neighbours of a number and the
+            pokemons they need, or None if the cell is not a number next to unexposed cells.
+        """
+        character = game[index]
+        if not character.isdigit():
+            return None
+        unknown = []
+        needed = int(character)
+        for neighbour in neighbour_directions(index, self._grid_size):
+            if game[neighbour] == UNEXPOSED:
+                unknown.append(neighbour)
+            elif game[neighbour] == FLAG:
+                needed -= 1
+        if not unknown:
+            return None
+        return frozenset(unknown), needed
+
+    def _update_constraints(self, game, changed):
+        """Find the numbers of the whole game, or again around the changed cells."""
+        if changed is None or self._constraints is None:
+            self._constraints = {}
+            indexes = range(len(game))
+        else:
+            indexes = set(changed)
+            for index in list(indexes):
+                indexes.update(neighbour_directions(index, self._grid_size))
+        for index in indexes:
+            constraint = self._constraint(game, index)
+            if constraint is None:
+                self._constraints.pop(index, None)
+            else:
+                self._constraints[index] = constraint
+
+    def _split(self):
+        """
+        Split the numbers into groups sharing no cell.
+        Return:
+            (list<tuple<list<int>, list<tuple<frozenset<int>, int>>>>): The cells of each
+            group in breadth first order, and its numbers.
+        """
+        by_cell = {}
+        for index, (cells, _) in self._constraints.items():
+            for cell in cells:
+                by_cell.setdefault(cell, []).append(index)
+        groups = []
+        seen = set()
+        for start in sorted(by_cell):
+            if start in seen:
+                continue
+            seen.add(start)
+            order = [start]
+            numbers = set()
+            for cell in order:
+                for index in by_cell[cell]:
+                    if index in numbers:
+                        continue
+                    numbers.add(index)
+                    for other in sorted(self._constraints[index][0]):
+                        if other not in seen:
+                            seen.add(other)
+                            order.append(other)
+            groups.append((order, [self._constraints[index] for index in sorted(numbers)]))
+        return groups
+
+    def update(self, game, changed=None):
+        """
+        Work out the chances again after the game changed.
+        Parameters:
+            game (str|Board): The game
+            changed (iterable<int>): The cells changed since the last update, None to
+                look at the whole game
+        Return:
+            (dict<int, float>): The pokemon chance of every unexposed cell.
+        """
+        deadline = None if self._time_budget is None else time.perf_counter() + self._time_budget
+        self._update_constraints(game, changed)
+        groups = sorted(self._split(), key=lambda group: len(group[0]))
+        self._groups = [cells for cells, _ in groups]
+
+        counted = {}
+        exact, estimated = [], []
+        for cells, constraints in groups:
+            key = frozenset(constraints)
+            result = self._counted.get(key)
+            if result is None:
+                try:
+                    result = Group(cells, constraints).count(deadline)
+                except OutOfTime:
+                    estimated.append((cells, constraints))
+                    continue
+            counted[key] = result
+            exact.append((cells, result))
+        self._counted = counted
+        self._exact = not estimated
+
+        chances = {}
+        for cells, constraints in estimated:
+            for cell_set, needed in constraints:
+                chance = needed / len(cell_set)
+                for cell in cell_set:
+                    chances[cell] = max(chances.get(cell, 0), chance)
+        frontier = set(chances)
+        for cells, _ in exact:
+            frontier.update(cells)
+        outside = [index for index in range(len(game))
+                   if game[index] == UNEXPOSED and index not in frontier]
+        left = self._number_of_pokemons - game.count(FLAG) - round(sum(chances.values()))
+        chances.update(self._combine(exact, outside, max(left, 0)))
+        self._chances = chances
+        return chances
+
+    def _combine(self, exact, outside, left):
+        """
+        Combine the counted groups with the cells away from the frontier, which share
+        the pokemons the groups leave.
+        Parameters:
+            exact (list<tuple<list<int>, tuple>>): The cells and count of each group
+            outside (list<int>): The unexposed cells away from the frontier
+            left (int): The pokemons left for the groups and the outside cells
+        Return:
+            (dict<int, float>): The chance of every cell of the groups and outside.
+        """
+        free = len(outside)
+        # each group's ways are scaled by its largest, which every chance cancels out,
+        # so the sums below stay in floats
+        scaled = []
+        for cells, (poly, marginals) in exact:
+            largest = max(poly) or 1
+            scaled.append((cells, [ways / largest for ways in poly],
+                           {cell: [ways / largest for ways in marginal]
+                            for cell, marginal in marginals.items()}))
+        # ways of the groups before and after each group
+        before = [[1.0]]
+        for _, poly, _ in scaled:
+            before.append(multiply_poly(before[-1], poly))
+        after = [[1.0]]
+        for _, poly, _ in reversed(scaled):
+            after.append(multiply_poly(after[-1], poly))
+        after.reverse()
+
+        # ways to place the other pokemons outside, for each number of pokemons in the
+        # groups, scaled by the largest through their logarithms
+        total = before[-1]
+        logs = [lgamma(free + 1) - lgamma(left - pokemons + 1) - lgamma(free - left + pokemons + 1)
+                if 0 <= left - pokemons <= free else None for pokemons in range(len(total))]
+        largest = max((log for log in logs if log is not None), default=0)
+        outside_ways = [0.0 if log is None else exp(log - largest) for log in logs]
+
+        ways = sum(count * outside_ways[pokemons] for pokemons, count in enumerate(total))
+        chances = {}
+        if ways == 0:
+            # the flags do not fit the numbers, so nothing can be worked out
+            for cells, _, _ in scaled:
+                chances.update(dict.fromkeys(cells, 0.0))
+            chances.update(dict.fromkeys(outside, left / free if free else 0.0))
+            return chances
+
+        for i, (cells, poly, marginals) in enumerate(scaled):
+            others = multiply_poly(before[i], after[i + 1])
+            weights = [sum(count * outside_ways[pokemons + other] for other, count in enumerate(others))
+                       for pokemons in range(len(poly))]
+            for cell in cells:
+                chances[cell] = sum(count * weights[pokemons]
+                                    for pokemons, count in enumerate(marginals[cell])) / ways
+        if free:
+            pokemons_outside = sum(count * outside_ways[pokemons] * (left - pokemons) / free
+                                   for pokemons, count in enumerate(total))
+            chances.update(dict.fromkeys(outside, pokemons_outside / ways))
+        return chances
+
+
+def heatmap(game, grid_size, number_of_pokemons, time_budget=HEATMAP_TIME_BUDGET):
+    """
+    Work out the pokemon chance of every unexposed cell of a game once, see Heatmap.
+    Return:
+        (dict<int, float>): The chance of each unexposed cell.
+    """
+    return Heatmap(grid_size, number_of_pokemons, time_budget).update(game)
@@ -0,0 +1,268 @@
+"""
+A deterministic solver which plays Assignment 1 games through the a1.py
+functions, and a self-play harness which measures it over many seeded games.
+
+Run as a script to print a report, e.g.
+    python a1_solver.py --sizes 5 10 20 --densities 0.1 0.15 0.2 --games 200
+"""
+import argparse
+import random
+import time
+from collections import deque
+from multiprocessing import Pool
+
+from a1 import *
+
+# Latency percentiles reported by self_play
+PERCENTILES = (50, 90, 99)
+
+
+class Solver:
+    """
+    Chooses the next action of a game from the exposed numbers only.
+
+    Every exposed number is a constraint on its unexposed neighbours. A constraint
+    whose pokemons are all flagged makes its other neighbours safe, and one which
+    needs all of its neighbours makes them pokemons. When neither applies, two
+    constraints where one's cells are a subset of the other's are subtracted. The
+    deductions are queued, and a guess is only made when nothing can be deduced,
+    picking the cell least likely to be a pokemon and then the lowest index, so the
+    same game is always played the same way.
+    """
+
+    def __init__(self, grid_size, number_of_pokemons):
+        """
+        Construct a solver for one game.
+        Parameters:
+            grid_size (int): Size of game
+            number_of_pokemons (int): The number of pokemons hidden in the game
+        """
+        self._grid_size = grid_size
+        self._number_of_pokemons = number_of_pokemons
+        self._pending = deque()
+        self._guesses = 0
+
+    def get_guesses(self):
+        """(int) Return the number of actions which were guesses."""
+        return self._guesses
+
+    def next_action(self, game):
+        """
+        Choose the next action.
+        Parameters:
+            game (str|Board): The game, which should have an unexposed cell left
+        Return:
+            (str): An action in the format of the game input, e.g. 'B3' or 'f B3'.
+        """
+        while self._pending:
+            index, is_pokemon = self._pending.popleft()
+            if game[index] == UNEXPOSED:
+                return self._action(index, is_pokemon)
+        safe, pokemons = self._deduce(game)
+        self._pending.extend((index, False) for index in sorted(safe))
+        self._pending.extend((index, True) for index in sorted(pokemons))
+        if self._pending:
+            return self.next_action(game)
+        self._guesses += 1
+        return self._action(self._guess(game), False)
+
+    def _action(self, index, is_pokemon):
+        """(str) Return the action revealing, or flagging, the cell at index."""
+        row, column = divmod(index, self._grid_size)
+        action = f'{row_label(row)}{column + 1}'
+        return f'f {action}' if is_pokemon else action
+
+    def _constraints(self, game):
+        """
+        Collect the constraints of the exposed numbers next to unexposed cells.
+        Return:
+            (dict<frozenset<int>, int>): The number of pokemons among each set of unexposed cells.
+        """
+        constraints = {}
+        for index, character in enumerate(game):
+            if not character.isdigit() or character == EXPOSED:
+                continue
+            unknown = []
+            needed = int(character)
+            for neighbour in neighbour_directions(index, self._grid_size):
+                if game[neighbour] == UNEXPOSED:
+                    unknown.append(neighbour)
+                elif game[neighbour] == FLAG:
+                    needed -= 1
+            if unknown:
+                constraints[frozenset(unknown)] = needed
+        return constraints
+
+    def _deduce(self, game):
+        """
+        Find the unexposed cells which are certainly safe or certainly pokemons.
+        Return:
+            (tuple<set<int>, set<int>>): The safe cells and the pokemon cells.
+        """
+        unexposed = [index for index, character in enumerate(game) if character == UNEXPOSED]
+        remaining = self._number_of_pokemons - game.count(FLAG)
+        if remaining == 0:
+            return set(unexposed), set()
+        if remaining == len(unexposed):
+            return set(), set(unexposed)
+
+        safe, pokemons = set(), set()
+        constraints = self._constraints(game)
+        for cells, needed in constraints.items():
+            if needed == 0:
+                safe |= cells
+            elif needed == len(cells):
+                pokemons |= cells
+        if safe or pokemons:
+            return safe, pokemons
+
+        by_cell = {}
+        for cells in constraints:
+            for cell in cells:
+                by_cell.setdefault(cell, []).append(cells)
+        for cells, needed in constraints.items():
+            overlapping = {other for cell in cells for other in by_cell[cell]}
+            for other in overlapping:
+                if other is cells or not cells < other:
+                    continue
+                difference = other - cells
+                other_needed = constraints[other] - needed
+                if other_needed == 0:
+                    safe |= difference
+                elif other_needed == len(difference):
+                    pokemons |= difference
+        return safe, pokemons
+
+    def _guess(self, game):
+        """(int) Return the unexposed cell least likely to be a pokemon."""
+        unexposed = [index for index, character in enumerate(game) if character == UNEXPOSED]
+        remaining = self._number_of_pokemons - game.count(FLAG)
+        chances = dict.fromkeys(unexposed, remaining / len(unexposed))
+        constrained = set()
+        for cells, needed in self._constraints(game).items():
+            chance = needed / len(cells)
+            for cell in cells:
+                if cell not in constrained or chance > chances[cell]:
+                    chances[cell] = chance
+                constrained.add(cell)
+        return min(unexposed, key=lambda index: (chances[index], index))
+
+
+def play_game(grid_size, number_of_pokemons, seed, actions=None):
+    """
+    Let the solver play one game.
+    Parameters:
+        grid_size (int): Size of game
+        number_of_pokemons (int): The number of pokemons
+        seed (int): Seed of the pokemon locations
+        actions (list<str>): If given, each action the solver plays is appended to it
+    Return:
+        (tuple<bool, list<float>>): Whether the game was won, and the seconds taken by
+        each move, which includes choosing the action and playing it.
+    """
+    pokemon_locations = generate_pokemons(grid_size, number_of_pokemons, random.Random(seed))
+    game = Board(grid_size, pokemon_locations=pokemon_locations)
+    solver = Solver(grid_size, len(pokemon_locations))
+    latencies = []
+    while True:
+        start = time.perf_counter()
+        action = solver.next_action(game)
+        if actions is not None:
+            actions.append(action)
+        event = take_action(game, grid_size, pokemon_locations, action)
+        won = event != LOST and check_win(game, pokemon_locations)
+        latencies.append(time.perf_counter() - start)
+        if event == LOST or won:
+            return won, latencies
+
+
+def _play_job(job):
+    """(tuple) Play one self_play job in a worker, timing the whole game."""
+    grid_size, density, seed = job
+    start = time.perf_counter()
+    won, latencies = play_game(grid_size, density_pokemons(grid_size, density), seed)
+    return grid_size, density, won, latencies, time.perf_counter() - start
+
+
+def density_pokemons(grid_size, density):
+    """(int) Return the number of pokemons of a grid size at a density, at least one."""
+    return max(1, min(grid_size ** 2 - 1, round(density * grid_size ** 2)))
+
+
+def percentile(values, percent):
+    """(float) Return the nearest-rank percentile of sorted values."""
+    rank = max(0, -(-len(values) * percent // 100) - 1)
+    return values[rank]
+
+
+def self_play(grid_sizes, densities, games, processes=None, seed=0):
+    """
+    Play games with the solver across a multiprocessing pool.
+    Parameters:
+        grid_sizes (list<int>): The grid sizes to play
+        densities (list<float>): The fractions of cells which are pokemons
+        games (int): The number of games of every grid size and density
+        processes (int): The number of worker processes, 1 to play in this process
+        seed (int): Seed of the first game, each game of a grid size and density uses the next one
+    Return:
+        (dict): The overall games per second and a result for every grid size and density.
+    """
+    jobs = [(grid_size, density, seed + game)
+            for grid_size in grid_sizes for density in densities for game in range(games)]
+    start = time.perf_counter()
+    if processes == 1:
+        outcomes = list(map(_play_job, jobs))
+    else:
+        with Pool(processes) as pool:
+            outcomes = pool.map(_play_job, jobs, chunksize=max(1, games // 4))
+    elapsed = time.perf_counter() - start
+
+    groups = {}
+    for grid_size, density, won, latencies, seconds in outcomes:
+        group = groups.setdefault((grid_size, density), {'wins': 0, 'seconds': 0, 'latencies': []})
+        group['wins'] += won
+        group['seconds'] += seconds
+        group['latencies'].extend(latencies)
+
+    results = []
+    for (grid_size, density), group in groups.items():
+        latencies = sorted(group['latencies'])
+        result = {
+            'grid_size': grid_size,
+            'density': density,
+            'pokemons': density_pokemons(grid_size, density),
+            'games': games,
+            'win_rate': group['wins'] / games,
+            'games_per_second': games / group['seconds'],
+            'moves': len(latencies),
+        }
+        for percent in PERCENTILES:
+            result[f'p{percent}_ms'] = percentile(latencies, percent) * 1000
+        results.append(result)
+    return {'games': len(jobs), 'games_per_second': len(jobs) / elapsed, 'results': results}
+
+
+def print_report(report):
+    """Print the self_play report as a table."""
+    columns = ('grid_size', 'density', 'pokemons', 'games', 'win_rate', 'games_per_second',
+               'moves') + tuple(f'p{percent}_ms' for percent in PERCENTILES)
+    print(' '.join(f'{column:>16}' for column in columns))
+    for result in report['results']:
+        print(' '.join(f'{result[column]:>16.4g}' for column in columns))
+    print(f"{report['games']} games, {report['games_per_second']:.1f} games/second overall")
+
+
+def main():
+    """Run self_play from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5, 10, 20])
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.1, 0.15, 0.2])
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print_report(self_play(args.sizes, args.densities, args.games, args.processes, args.seed))
+
+
+if __name__ == "__main__":
+    main()
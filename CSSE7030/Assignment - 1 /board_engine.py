@@ -0,0 +1,1276 @@
+"""
+The game engine of Assignment 1, shared by every version of the game and by Assignment 3.
+
+It holds the boards, the neighbours of a cell, the neighbouring pokemon counts, the
+reveals and the win check, so the game scripts only add their input and display.
+
+Assignment 3 imports this module from Assignment 1's directory.
+"""
+import random
+from collections import deque
+from functools import lru_cache
+
+import board_history
+from a1_support import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Cell codes stored by Board, the code of a number is the number itself.
+CELL_CHARACTERS = tuple(str(number) for number in range(9)) + (UNEXPOSED, FLAG, POKEMON)
+CELL_CODES = {character: code for code, character in enumerate(CELL_CHARACTERS)}
+UNEXPOSED_CODE = CELL_CODES[UNEXPOSED]
+FLAG_CODE = CELL_CODES[FLAG]
+POKEMON_CODE = CELL_CODES[POKEMON]
+
+# (row, column) step of each direction
+DIRECTION_DELTAS = dict(zip(DIRECTIONS, ((-1, 0), (1, 0), (0, -1), (0, 1),
+                                         (-1, -1), (-1, 1), (1, -1), (1, 1))))
+# Edge class bits of neighbour_table, set when a cell has a neighbour on that side
+HAS_UP, HAS_DOWN, HAS_LEFT, HAS_RIGHT = 1, 2, 4, 8
+# Check the Board counters against a full scan on every check_win
+DEBUG_COUNTERS = False
+# Number of grid sizes whose neighbour_table is kept
+NEIGHBOUR_TABLE_CACHE_SIZE = 16
+# Largest grid size given a neighbour_table, larger grids work out edge classes per cell
+NEIGHBOUR_TABLE_MAX_SIZE = 4096
+# Smallest grid size a new game keeps in a ChunkedBoard. A Board stores a code and a
+# count for every cell, 128 MiB at this size, while a ChunkedBoard only stores the
+# chunks that are explored
+CHUNKED_BOARD_MIN_SIZE = 8192
+# Rows and columns of a ChunkedBoard chunk
+CHUNK_SIZE = 64
+# Most cells in one batch yielded by a streaming reveal
+REVEAL_BATCH_SIZE = 256
+# bytes.translate tables: 1 for a cell that stops a scanline_reveal span, and
+# 1 for an unexposed cell
+WALL_TABLE = bytes([0]) + bytes([1]) * 255
+UNEXPOSED_TABLE = bytes(int(code == UNEXPOSED_CODE) for code in range(256))
+
+
+class Board:
+    """
+    A mutable game board which stores one byte code per cell.
+
+    The board behaves like the game string for indexing, len(), `in` and count(),
+    so the game functions below accept either a game string or a Board. Changes to
+    a Board happen in place rather than rebuilding the string, and the string form
+    is only produced by str() when the board is displayed or saved.
+
+    A board can also hold the pokemon locations together with the number of
+    neighbouring pokemons of every cell, which number_at_cell then looks up.
+
+    Every change keeps count of the unexposed cells, the flags and the flags on a
+    pokemon, so check_win does not have to scan the board. When DEBUG_COUNTERS is
+    set, check_win compares these counters with a full scan.
+    """
+
+    def __init__(self, grid_size, game=None, pokemon_locations=None):
+        """
+        Construct a board of unexposed cells, or copy the cells of a game string.
+        Parameters:
+            grid_size (int): Size of game.
+            game (str): Game string to copy, None for a new game.
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations, if known.
+        """
+        self._grid_size = grid_size
+        if game is None:
+            self._cells = bytearray([UNEXPOSED_CODE]) * grid_size ** 2
+        else:
+            self._cells = bytearray(CELL_CODES[character] for character in game)
+        self._unexposed = self._cells.count(UNEXPOSED_CODE)
+        self._flags = self._cells.count(FLAG_CODE)
+        self._flagged_pokemons = 0
+        self._dirty_rows = None
+        self._history = None
+        self._pokemon_locations = None
+        self._pokemons = frozenset()
+        self._counts = None
+        if pokemon_locations is not None:
+            self.set_pokemon_locations(pokemon_locations)
+
+    def get_grid_size(self):
+        """Return the size of game."""
+        return self._grid_size
+
+    def set_pokemon_locations(self, pokemon_locations):
+        """
+        Store the pokemon locations and count the neighbouring pokemons of every cell.
+        Parameters:
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+        """
+        self._pokemon_locations = pokemon_locations
+        self._pokemons = frozenset(pokemon_locations)
+        self._counts = pokemon_counts(pokemon_locations, self._grid_size)
+        self._flagged_pokemons = sum(self._cells[pokemon] == FLAG_CODE for pokemon in self._pokemons)
+
+    def get_pokemon_locations(self):
+        """Return the pokemon locations of the board, None if they are not set."""
+        return self._pokemon_locations
+
+    def get_counts(self):
+        """Return the bytearray of neighbouring pokemon counts, None if pokemons are not set."""
+        return self._counts
+
+    def number_at(self, index):
+        """
+        Return the number of neighbouring pokemons of a cell, 0 for a pokemon's cell.
+        The pokemon locations must have been set.
+        """
+        if index in self._pokemons:
+            return 0
+        return self._counts[index]
+
+    def is_pokemon(self, index):
+        """Return whether the cell at index is a pokemon. The pokemon locations must have been set."""
+        return index in self._pokemons
+
+    def set_cells(self, cells):
+        """
+        Replace every cell code, see CELL_CHARACTERS, and count the counters again.
+        Parameters:
+            cells (bytes): The new cell codes, one per cell.
+        """
+        self._cells = bytearray(cells)
+        self._unexposed = self._cells.count(UNEXPOSED_CODE)
+        self._flags = self._cells.count(FLAG_CODE)
+        self._flagged_pokemons = sum(self._cells[pokemon] == FLAG_CODE for pokemon in self._pokemons)
+        self._dirty_rows = None
+
+    def get_cells(self):
+        """
+        Return the bytearray of cell codes, see CELL_CHARACTERS. Changes made to it
+        directly must go through reveal and reveal_range to keep the counters right.
+        """
+        return self._cells
+
+    def reveal(self, index):
+        """
+        Show the number of an unexposed cell which is not a pokemon.
+        Return:
+            (int): The number shown.
+        """
+        number = self._counts[index]
+        self._cells[index] = number
+        self._unexposed -= 1
+        if self._dirty_rows is not None:
+            self._dirty_rows.add(index // self._grid_size)
+        if self._history is not None:
+            self._history.reveal(index, index + 1)
+        return number
+
+    def reveal_range(self, start, stop):
+        """Show the numbers of a range of unexposed cells which are not pokemons."""
+        self._cells[start:stop] = self._counts[start:stop]
+        self._unexposed -= stop - start
+        self._touch_rows(start, stop)
+        if self._history is not None:
+            self._history.reveal(start, stop)
+
+    def _touch_rows(self, start, stop):
+        """Mark the rows of a range of cells as dirty."""
+        if self._dirty_rows is not None:
+            self._dirty_rows.update(range(start // self._grid_size, (stop - 1) // self._grid_size + 1))
+
+    def enable_history(self, limit=board_history.HISTORY_LIMIT):
+        """
+        Keep an undo history of the actions played between start_action and finish_action.
+        Parameters:
+            limit (int): The most reveal ranges and changed cells kept, see board_history.History.
+        """
+        self._history = board_history.History(limit)
+
+    def get_history(self):
+        """Return the board_history.History of the board, None if it keeps none."""
+        return self._history
+
+    def start_action(self):
+        """Start recording the changes of an action, if the board keeps a history."""
+        if self._history is not None:
+            self._history.start()
+
+    def finish_action(self):
+        """Finish recording an action, so it can be undone."""
+        if self._history is not None:
+            self._history.finish()
+
+    def undo(self):
+        """
+        Revert the last action: its revealed ranges become unexposed and its other cells
+        go back to their previous codes.
+        Return:
+            (bool): Whether there was an action to undo.
+        """
+        delta = self._history.undo() if self._history is not None else None
+        if delta is None:
+            return False
+        for start, stop in delta.reveals:
+            self._cells[start:stop] = bytes([UNEXPOSED_CODE]) * (stop - start)
+            self._unexposed += stop - start
+            self._touch_rows(start, stop)
+        for index, before, _ in reversed(delta.cells):
+            self._set_code(index, before)
+        return True
+
+    def redo(self):
+        """
+        Play the last undone action again.
+        Return:
+            (bool): Whether there was an action to redo.
+        """
+        delta = self._history.redo() if self._history is not None else None
+        if delta is None:
+            return False
+        for start, stop in delta.reveals:
+            self.reveal_range(start, stop)
+        for index, _, after in delta.cells:
+            self._set_code(index, after)
+        return True
+
+    def pop_dirty_rows(self):
+        """
+        Return the rows changed since the last call, and start tracking again.
+        Return:
+            (set<int>): The changed rows, or None for a new board, where every row is new.
+        """
+        dirty_rows = self._dirty_rows
+        self._dirty_rows = set()
+        return dirty_rows
+
+    def is_won(self):
+        """
+        Check win from the counters: every cell is exposed or flagged, and the
+        flags are exactly on the pokemons. The pokemon locations must have been set.
+        """
+        if DEBUG_COUNTERS:
+            self.check_counters()
+        return (self._unexposed == 0 and self._flags == self._flagged_pokemons
+                and self._flagged_pokemons == len(self._pokemons))
+
+    def check_counters(self):
+        """
+        Compare the counters with a full scan of the board.
+        Raise:
+            AssertionError: If a counter does not match the board.
+        """
+        expected = (self._cells.count(UNEXPOSED_CODE), self._cells.count(FLAG_CODE),
+                    sum(self._cells[pokemon] == FLAG_CODE for pokemon in self._pokemons))
+        actual = (self._unexposed, self._flags, self._flagged_pokemons)
+        if actual != expected:
+            raise AssertionError(f"Board counters (unexposed, flags, flagged pokemons) are "
+                                 f"{actual} but the board has {expected}")
+
+    def _count_cell(self, index, code, change):
+        """Add change to the counters the cell code at index is part of."""
+        if code == UNEXPOSED_CODE:
+            self._unexposed += change
+        elif code == FLAG_CODE:
+            self._flags += change
+            if index in self._pokemons:
+                self._flagged_pokemons += change
+
+    def count(self, character):
+        """Return the number of cells showing the given character."""
+        code = CELL_CODES.get(character)
+        if code is None:
+            return 0
+        return self._cells.count(code)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ''.join(map(CELL_CHARACTERS.__getitem__, self._cells[index]))
+        return CELL_CHARACTERS[self._cells[index]]
+
+    def _set_code(self, index, code):
+        """Store the cell code at index, keeping the counters up to date."""
+        self._count_cell(index, self._cells[index], -1)
+        self._count_cell(index, code, 1)
+        self._cells[index] = code
+        if self._dirty_rows is not None:
+            self._dirty_rows.add(index // self._grid_size)
+
+    def __setitem__(self, index, character):
+        code = CELL_CODES[character]
+        if self._history is not None:
+            self._history.change(index, self._cells[index], code)
+        self._set_code(index, code)
+
+    def __iter__(self):
+        return map(CELL_CHARACTERS.__getitem__, self._cells)
+
+    def __contains__(self, character):
+        code = CELL_CODES.get(character)
+        return code is not None and code in self._cells
+
+    def __str__(self):
+        return ''.join(map(CELL_CHARACTERS.__getitem__, self._cells))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._grid_size}, '{self}')"
+
+
+class ChunkedBoard:
+    """
+    A game board split into square chunks which are only stored once they are used,
+    for grids too large to hold one code per cell.
+
+    A chunk's cell codes are allocated the first time one of its cells changes, and
+    its pokemons and neighbouring pokemon counts the first time they are looked up.
+    The pokemons are either given, and grouped by chunk, or drawn per chunk from a
+    seed and a density, so the same chunk always gets the same pokemons without the
+    rest of the grid being drawn. Memory then follows the explored area rather than
+    the grid size.
+
+    Cells are addressed by the same index as a Board, and the board supports the
+    indexing, counting and counters the game functions use on a Board.
+    """
+
+    def __init__(self, grid_size, pokemon_locations=None, density=0, seed=None, chunk_size=CHUNK_SIZE):
+        """
+        Construct a board of unexposed cells.
+        Parameters:
+            grid_size (int): Size of game.
+            pokemon_locations (tuple<int, ...>): The pokemon locations, drawn per chunk when None.
+            density (float): The fraction of each chunk's cells which are pokemons, when drawn.
+            seed (int): Seed the pokemons of every chunk are drawn from.
+            chunk_size (int): Rows and columns of a chunk.
+        """
+        self._grid_size = grid_size
+        self._chunk_size = chunk_size
+        self._chunks_per_row = -(-grid_size // chunk_size)
+        self._density = density
+        self._seed = seed
+        self._cells = {}
+        self._pokemons = {}
+        self._counts = {}
+        self._pokemon_locations = pokemon_locations
+        if pokemon_locations is None:
+            self._number_of_pokemons = sum(self._chunk_pokemon_count(chunk) * number
+                                           for chunk, number in self._chunk_shapes())
+        else:
+            self.set_pokemon_locations(pokemon_locations)
+        self._unexposed = grid_size ** 2
+        self._flags = 0
+        self._flagged_pokemons = 0
+        self._dirty_rows = None
+
+    def get_grid_size(self):
+        """Return the size of game."""
+        return self._grid_size
+
+    def set_pokemon_locations(self, pokemon_locations):
+        """
+        Replace the pokemons with given locations, e.g. once the first revealed cell is known.
+        Parameters:
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+        """
+        self._pokemon_locations = pokemon_locations
+        self._pokemons = {}
+        self._counts = {}
+        for pokemon in pokemon_locations:
+            self._pokemons.setdefault(self.chunk_of(pokemon)[0], set()).add(pokemon)
+        pokemons = set(pokemon_locations)
+        self._number_of_pokemons = len(pokemons)
+        self._flagged_pokemons = sum(self.get_code(pokemon) == FLAG_CODE for pokemon in pokemons)
+
+    def get_pokemon_locations(self):
+        """Return the given pokemon locations, None when they are drawn per chunk."""
+        return self._pokemon_locations
+
+    def get_number_of_pokemons(self):
+        """Return the number of pokemons on the whole board."""
+        return self._number_of_pokemons
+
+    def get_chunk_count(self):
+        """Return the number of chunks whose cells have been allocated."""
+        return len(self._cells)
+
+    def get_chunk_size(self):
+        """Return the rows and columns of a chunk."""
+        return self._chunk_size
+
+    def chunk_of(self, index):
+        """(tuple<int, int>) Return the chunk of a cell and the cell's offset in it."""
+        row, col = divmod(index, self._grid_size)
+        chunk_row, local_row = divmod(row, self._chunk_size)
+        chunk_col, local_col = divmod(col, self._chunk_size)
+        return chunk_row * self._chunks_per_row + chunk_col, local_row * self._chunk_size + local_col
+
+    def _chunk_bounds(self, chunk):
+        """(tuple<int, int, int, int>) Return the first row, first column, rows and columns of a chunk."""
+        chunk_row, chunk_col = divmod(chunk, self._chunks_per_row)
+        row, col = chunk_row * self._chunk_size, chunk_col * self._chunk_size
+        return (row, col, min(self._chunk_size, self._grid_size - row),
+                min(self._chunk_size, self._grid_size - col))
+
+    def _chunk_shapes(self):
+        """
+        Return one chunk of every shape, since chunks only differ in shape on the last
+        row and column of chunks.
+        Return:
+            (list<tuple<int, int>>): A chunk and the number of chunks of its shape.
+        """
+        full, remainder = divmod(self._grid_size, self._chunk_size)
+        last = self._chunks_per_row - 1
+        shapes = [(0, full * full)]
+        if remainder:
+            shapes += [(last, full), (last * self._chunks_per_row, full),
+                       (last * self._chunks_per_row + last, 1)]
+        return shapes
+
+    def _chunk_pokemon_count(self, chunk):
+        """(int) Return the number of pokemons drawn in a chunk."""
+        rows, cols = self._chunk_bounds(chunk)[2:]
+        return min(rows * cols, round(self._density * rows * cols))
+
+    def _chunk_pokemons(self, chunk):
+        """(set<int>) Return the pokemon locations in a chunk, drawing them on first use."""
+        pokemons = self._pokemons.get(chunk)
+        if pokemons is None:
+            if self._pokemon_locations is not None:
+                return frozenset()
+            row, col, rows, cols = self._chunk_bounds(chunk)
+            rng = random.Random(f'{self._seed}/{chunk}')
+            pokemons = set()
+            for cell in rng.sample(range(rows * cols), self._chunk_pokemon_count(chunk)):
+                local_row, local_col = divmod(cell, cols)
+                pokemons.add((row + local_row) * self._grid_size + col + local_col)
+            self._pokemons[chunk] = pokemons
+        return pokemons
+
+    def _chunk_counts(self, chunk):
+        """(bytearray) Return the neighbouring pokemon counts of a chunk, counting them on first use."""
+        counts = self._counts.get(chunk)
+        if counts is None:
+            counts = bytearray(self._chunk_size ** 2)
+            chunk_row, chunk_col = divmod(chunk, self._chunks_per_row)
+            for near_row in range(max(0, chunk_row - 1), min(self._chunks_per_row, chunk_row + 2)):
+                for near_col in range(max(0, chunk_col - 1), min(self._chunks_per_row, chunk_col + 2)):
+                    for pokemon in self._chunk_pokemons(near_row * self._chunks_per_row + near_col):
+                        for neighbour in neighbour_directions(pokemon, self._grid_size):
+                            neighbour_chunk, local = self.chunk_of(neighbour)
+                            if neighbour_chunk == chunk:
+                                counts[local] += 1
+            self._counts[chunk] = counts
+        return counts
+
+    def is_pokemon(self, index):
+        """Return whether the cell at index is a pokemon."""
+        return index in self._chunk_pokemons(self.chunk_of(index)[0])
+
+    def number_at(self, index):
+        """Return the number of neighbouring pokemons of a cell, 0 for a pokemon's cell."""
+        chunk, local = self.chunk_of(index)
+        if index in self._chunk_pokemons(chunk):
+            return 0
+        return self._chunk_counts(chunk)[local]
+
+    def get_code(self, index):
+        """Return the cell code at index, see CELL_CHARACTERS."""
+        chunk, local = self.chunk_of(index)
+        cells = self._cells.get(chunk)
+        return UNEXPOSED_CODE if cells is None else cells[local]
+
+    def _chunk_cells(self, chunk):
+        """(bytearray) Return the cell codes of a chunk, allocating them on first use."""
+        cells = self._cells.get(chunk)
+        if cells is None:
+            cells = self._cells[chunk] = bytearray([UNEXPOSED_CODE]) * self._chunk_size ** 2
+        return cells
+
+    def chunk_walls(self, chunk):
+        """
+        Build the walls which stop a span of empty cells in a chunk, see iter_chunked_reveal.
+        Return:
+            (bytearray): 1 for each cell of the chunk with a number, a flag or outside the grid.
+        """
+        walls = self._chunk_counts(chunk).translate(WALL_TABLE)
+        cells = self._cells.get(chunk)
+        if cells is not None:
+            flag = cells.find(FLAG_CODE)
+            while flag != -1:
+                walls[flag] = 1
+                flag = cells.find(FLAG_CODE, flag + 1)
+        rows, cols = self._chunk_bounds(chunk)[2:]
+        if cols < self._chunk_size:
+            for row in range(rows):
+                walls[row * self._chunk_size + cols:(row + 1) * self._chunk_size] = \
+                    bytes([1]) * (self._chunk_size - cols)
+        walls[rows * self._chunk_size:] = bytes([1]) * ((self._chunk_size - rows) * self._chunk_size)
+        return walls
+
+    def _set_code(self, index, code):
+        """Store the cell code at index, allocating its chunk on first use."""
+        chunk, local = self.chunk_of(index)
+        self._chunk_cells(chunk)[local] = code
+        if self._dirty_rows is not None:
+            self._dirty_rows.add(index // self._grid_size)
+
+    def reveal(self, index):
+        """
+        Show the number of an unexposed cell which is not a pokemon.
+        Return:
+            (int): The number shown.
+        """
+        number = self.number_at(index)
+        self._set_code(index, number)
+        self._unexposed -= 1
+        return number
+
+    def reveal_unexposed(self, start, stop, step=1):
+        """
+        Show the numbers of the unexposed cells of range(start, stop, step), which is
+        within one row of a chunk, or one column when step is the grid size. None of
+        the cells is a pokemon.
+        Return:
+            (list<tuple<int, int>>): The start and stop index of every range of revealed cells.
+        """
+        chunk, local = self.chunk_of(start)
+        length = len(range(start, stop, step))
+        local_step = 1 if step == 1 else self._chunk_size
+        cells = self._cells.get(chunk)
+        if cells is None:
+            unexposed = bytes([1]) * length
+        else:
+            unexposed = cells[local:local + length * local_step:local_step].translate(UNEXPOSED_TABLE)
+        position = unexposed.find(1)
+        if position == -1:
+            return []
+        cells = self._chunk_cells(chunk)
+        counts = self._chunk_counts(chunk)
+        revealed = []
+        while position != -1:
+            end = unexposed.find(0, position)
+            if end == -1:
+                end = length
+            cell_slice = slice(local + position * local_step, local + end * local_step, local_step)
+            cells[cell_slice] = counts[cell_slice]
+            self._unexposed -= end - position
+            if step == 1:
+                revealed.append((start + position, start + end))
+            else:
+                revealed.extend((cell, cell + 1) for cell in range(start + position * step, start + end * step, step))
+            position = unexposed.find(1, end)
+        if self._dirty_rows is not None:
+            self._dirty_rows.update(range(start // self._grid_size, (stop - 1) // self._grid_size + 1))
+        return revealed
+
+    def reveal_chunk(self, chunk):
+        """
+        Show the numbers of every unexposed cell of a chunk, none of which is a pokemon.
+        Return:
+            (list<tuple<int, int>>): The start and stop index of every range of revealed cells.
+        """
+        row, col, rows, cols = self._chunk_bounds(chunk)
+        starts = range(row * self._grid_size + col, (row + rows) * self._grid_size, self._grid_size)
+        if chunk in self._cells or rows != self._chunk_size or cols != self._chunk_size:
+            return [cells for start in starts for cells in self.reveal_unexposed(start, start + cols)]
+        self._cells[chunk] = bytearray(self._chunk_counts(chunk))
+        self._unexposed -= rows * cols
+        if self._dirty_rows is not None:
+            self._dirty_rows.update(range(row, row + rows))
+        return [(start, start + cols) for start in starts]
+
+    def pop_dirty_rows(self):
+        """
+        Return the rows changed since the last call, and start tracking again.
+        Return:
+            (set<int>): The changed rows, or None for a new board, where every row is new.
+        """
+        dirty_rows = self._dirty_rows
+        self._dirty_rows = set()
+        return dirty_rows
+
+    def is_won(self):
+        """Check win from the counters, like Board.is_won."""
+        return (self._unexposed == 0 and self._flags == self._flagged_pokemons
+                and self._flagged_pokemons == self._number_of_pokemons)
+
+    def _count_cell(self, index, code, change):
+        """Add change to the counters the cell code at index is part of."""
+        if code == UNEXPOSED_CODE:
+            self._unexposed += change
+        elif code == FLAG_CODE:
+            self._flags += change
+            if self.is_pokemon(index):
+                self._flagged_pokemons += change
+
+    def count(self, character):
+        """Return the number of cells showing the given character."""
+        code = CELL_CODES.get(character)
+        if code == UNEXPOSED_CODE:
+            return self._unexposed
+        if code == FLAG_CODE:
+            return self._flags
+        if code is None:
+            return 0
+        return sum(cells.count(code) for cells in self._cells.values())
+
+    def __len__(self):
+        return self._grid_size ** 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ''.join(CELL_CHARACTERS[self.get_code(cell)]
+                           for cell in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        return CELL_CHARACTERS[self.get_code(index)]
+
+    def __setitem__(self, index, character):
+        code = CELL_CODES[character]
+        self._count_cell(index, self.get_code(index), -1)
+        self._count_cell(index, code, 1)
+        self._set_code(index, code)
+
+    def __contains__(self, character):
+        return self.count(character) > 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._grid_size}, chunks={len(self._cells)})"
+
+
+def position_to_index(position, grid_size) -> int:
+    """
+    This function should convert the row, column coordinate in the grid to the game strings index.
+    The function returns an integer representing the index of the cell in the game string.
+    Parameters:
+        grid_size (int): Size of game.
+        pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+    return:
+        index (int): Convert position<tuple> to index<int>
+    """
+    index = position[0] * grid_size + position[1]
+    return index
+
+
+def replace_character_at_index(game, index, character) -> str:
+    """
+    The function modifies the specified characters in the game according to the index of cell.
+    A Board is changed in place, a game string is rebuilt.
+    Parameters:
+        game (str|Board): Game string or board.
+        index (int): Index of the currently selected cell
+        character (str): A flag or other characters could be placed on each call
+    Return:
+        game (str|Board): Updated game string, or the same board.
+    """
+    if isinstance(game, (Board, ChunkedBoard)):
+        game[index] = character
+        return game
+    game = game[:index] + character + game[index + 1:]
+    return game
+
+
+def flag_cell(game, index):
+    """
+    The function judges whether the cell is a flag, then converts to '~' if it's a flag,
+    converts to flag if it's '~'. Exposed cells are left unchanged.
+    Return:
+        game (str|Board): Updated game string, or the same board.
+    """
+    if game[index] == FLAG:
+        return replace_character_at_index(game, index, UNEXPOSED)
+    elif game[index] == UNEXPOSED:
+        return replace_character_at_index(game, index, FLAG)
+    return game
+
+
+def index_in_direction(index, grid_size, direction):
+    """
+    The function return the index of the direction position.
+    Parameters:
+        direction: Neighbouring directions, provided by support.py, namely up, down, left, right，etc.
+    Return:
+        new_index (int): Index of effective directions of neighbouring pokemon.
+    """
+    delta = DIRECTION_DELTAS.get(direction)
+    if delta is None:
+        return None
+    row, col = divmod(index, grid_size)
+    row += delta[0]
+    col += delta[1]
+    if 0 <= row < grid_size and 0 <= col < grid_size:
+        return row * grid_size + col
+    return None
+
+
+@lru_cache(maxsize=NEIGHBOUR_TABLE_CACHE_SIZE)
+@lru_cache(maxsize=NEIGHBOUR_TABLE_CACHE_SIZE)
+def neighbour_offsets(grid_size):
+    """
+    Build the neighbour offsets of every edge class of a grid size, see neighbour_table.
+    The offsets are cached, as grids without a neighbour_table look them up for every cell.
+    Return:
+        (tuple<tuple<int, ...>, ...>): The neighbour offsets of every edge class in DIRECTIONS order.
+    """
+    offsets = []
+    for edge_class in range(16):
+        class_offsets = []
+        for row_delta, col_delta in DIRECTION_DELTAS.values():
+            if row_delta == -1 and not edge_class & HAS_UP:
+                continue
+            if row_delta == 1 and not edge_class & HAS_DOWN:
+                continue
+            if col_delta == -1 and not edge_class & HAS_LEFT:
+                continue
+            if col_delta == 1 and not edge_class & HAS_RIGHT:
+                continue
+            class_offsets.append(row_delta * grid_size + col_delta)
+        offsets.append(tuple(class_offsets))
+    return tuple(offsets)
+
+
+@lru_cache(maxsize=NEIGHBOUR_TABLE_CACHE_SIZE)
+def neighbour_table(grid_size):
+    """
+    Build the adjacency table of a grid size. The table is cached, so every game of
+    the same size shares it, and only the most recently used sizes are kept.
+
+    Each cell gets an edge class, made of one bit per side of the grid that the cell
+    has a neighbour towards (up, down, left, right). The neighbours of a cell are its
+    index plus the offsets of its edge class, and their count is the length of those offsets.
+    Parameters:
+        grid_size (int): Size of game.
+    Return:
+        (tuple<bytearray, tuple<tuple<int, ...>, ...>>): The edge class of every cell, and
+        the neighbour offsets of every edge class in DIRECTIONS order.
+    """
+    offsets = neighbour_offsets(grid_size)
+    # one row of column bits, which each kind of row then adds its row bits to
+    columns = bytes((HAS_LEFT if col > 0 else 0) | (HAS_RIGHT if col < grid_size - 1 else 0)
+                    for col in range(grid_size))
+    if grid_size == 1:
+        return bytearray(columns), offsets
+    top = columns.translate(bytes(code | HAS_DOWN for code in range(256)))
+    middle = columns.translate(bytes(code | HAS_UP | HAS_DOWN for code in range(256)))
+    bottom = columns.translate(bytes(code | HAS_UP for code in range(256)))
+    return bytearray(top + middle * (grid_size - 2) + bottom), offsets
+
+
+def edge_class(index, grid_size):
+    """
+    Work out the edge class of one cell, see neighbour_table.
+    Return:
+        (int): The HAS_UP, HAS_DOWN, HAS_LEFT and HAS_RIGHT bits of the cell.
+    """
+    row, col = divmod(index, grid_size)
+    return ((HAS_UP if row > 0 else 0) | (HAS_DOWN if row < grid_size - 1 else 0)
+            | (HAS_LEFT if col > 0 else 0) | (HAS_RIGHT if col < grid_size - 1 else 0))
+
+
+def neighbour_directions(index, grid_size):
+    """
+    Creat a list to store index of neighbouring directions, using the cached neighbour_table.
+    Grids above NEIGHBOUR_TABLE_MAX_SIZE work out the edge class of the cell instead.
+    Return:
+        (list<int>): Index of neighbouring direction.
+    """
+    if grid_size > NEIGHBOUR_TABLE_MAX_SIZE:
+        offsets = neighbour_offsets(grid_size)[edge_class(index, grid_size)]
+    else:
+        edge_classes, offsets = neighbour_table(grid_size)
+        offsets = offsets[edge_classes[index]]
+    return [index + offset for offset in offsets]
+
+
+def number_at_cell(game, pokemon_locations, grid_size, index) -> int:
+    """
+    Count the number of pokemon(s) in neighbouring directions.
+    A Board holding the pokemon locations answers from its precomputed counts.
+    Return:
+        count (int): The number of pokemon in neighbouring direction
+    """
+    if isinstance(game, ChunkedBoard) or isinstance(game, Board) and game.get_counts() is not None:
+        return game.number_at(index)
+    count = 0
+    if index not in pokemon_locations:
+        for n in neighbour_directions(index, grid_size):
+            if n in pokemon_locations:
+                count += 1
+    return count
+
+
+def pokemon_counts(pokemon_locations, grid_size):
+    """
+    Count the neighbouring pokemons of every cell at once, so it is done a single time
+    per board rather than on every number_at_cell call.
+    NumPy sums the eight shifted copies of the pokemon grid when it is installed,
+    otherwise every pokemon adds one to each of its neighbours.
+    Parameters:
+        pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+        grid_size (int): Size of game.
+    Return:
+        (bytearray): The number of neighbouring pokemons of each cell, by index.
+    """
+    if numpy is not None:
+        pokemons = numpy.zeros(grid_size ** 2, dtype=numpy.uint8)
+        pokemons[numpy.fromiter(pokemon_locations, dtype=numpy.int64)] = 1
+        padded = numpy.pad(pokemons.reshape(grid_size, grid_size), 1)
+        counts = numpy.zeros((grid_size, grid_size), dtype=numpy.uint8)
+        for row in range(3):
+            for col in range(3):
+                if row != 1 or col != 1:
+                    counts += padded[row:row + grid_size, col:col + grid_size]
+        return bytearray(counts.tobytes())
+
+    counts = bytearray(grid_size ** 2)
+    edge_classes, offsets = neighbour_table(grid_size)
+    for pokemon in pokemon_locations:
+        for offset in offsets[edge_classes[pokemon]]:
+            counts[pokemon + offset] += 1
+    return counts
+
+
+def check_win(game, pokemon_locations) -> bool:
+    """
+    Check win or not by methods of judging whether these flags are in the positions
+    of all pokemon，and other judgment methods.
+    Return:
+        (bool): Boolean output related to current game.
+    """
+    if isinstance(game, ChunkedBoard) or (isinstance(game, Board)
+                                          and game.get_pokemon_locations() is not None):
+        return game.is_won()
+    if UNEXPOSED in game or game.count(FLAG) != len(pokemon_locations):
+        return False
+    for k in pokemon_locations:
+        if game[k] != FLAG:
+            return False
+    return True
+
+
+def reveal_cells(game, grid_size, pokemon_locations, index):
+    """
+    Reveal the selected cell, then every unexposed cell big_fun_search finds from it.
+    Flagged cells are never revealed.
+    Parameters:
+        game (str|Board): Game string or board.
+        grid_size (int): Size of game.
+        pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+        index (int): Index of the currently selected cell
+    Return:
+        game (str|Board): Updated game string, or the same board.
+    """
+    if isinstance(game, Board) and game.get_counts() is not None:
+        scanline_reveal(game, index)
+        return game
+    if isinstance(game, ChunkedBoard):
+        chunked_reveal(game, index)
+        return game
+    number = number_at_cell(game, pokemon_locations, grid_size, index)
+    game = replace_character_at_index(game, index, str(number))
+    for visible in big_fun_search(game, grid_size, pokemon_locations, index):
+        if game[visible] == UNEXPOSED:
+            number = number_at_cell(game, pokemon_locations, grid_size, visible)
+            game = replace_character_at_index(game, visible, str(number))
+    return game
+
+
+def chord_neighbours(game, grid_size, index):
+    """
+    Find the cells a chord on a cell reveals: every unexposed neighbour of an exposed
+    number which has as many flagged neighbours as its number.
+    Parameters:
+        game (str|Board|ChunkedBoard): Game string or board.
+        grid_size (int): Size of game.
+        index (int): Index of the chorded cell
+    Return:
+        (list<int>): The unexposed neighbours, empty when the number is not satisfied.
+    """
+    character = game[index]
+    if not character.isdigit():
+        return []
+    neighbours = neighbour_directions(index, grid_size)
+    if sum(game[neighbour] == FLAG for neighbour in neighbours) != int(character):
+        return []
+    return [neighbour for neighbour in neighbours if game[neighbour] == UNEXPOSED]
+
+
+def reveal_many_cells(game, grid_size, pokemon_locations, indexes):
+    """
+    Reveal several cells, none of which is a pokemon, as one batch. A Board reveals
+    them in a single scanline_reveal_many pass.
+    Parameters:
+        game (str|Board|ChunkedBoard): Game string or board.
+        grid_size (int): Size of game.
+        pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+        indexes (list<int>): Indexes of the selected cells
+    Return:
+        game (str|Board|ChunkedBoard): Updated game string, or the same board.
+    """
+    if isinstance(game, (Board, ChunkedBoard)):
+        for _ in iter_reveal_many_cells(game, grid_size, pokemon_locations, indexes):
+            pass
+        return game
+    for index in indexes:
+        if game[index] == UNEXPOSED:
+            game = reveal_cells(game, grid_size, pokemon_locations, index)
+    return game
+
+
+def iter_reveal_many_cells(board, grid_size, pokemon_locations, indexes):
+    """
+    Reveal the same cells as reveal_many_cells, yielding each batch as soon as it is
+    revealed, so a display can draw a large reveal while it is still going.
+    Parameters:
+        board (Board|ChunkedBoard): The board.
+        grid_size (int): Size of game.
+        pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+        indexes (list<int>): Indexes of the selected cells
+    Yield:
+        (list<tuple<int, int>>): The start and stop index of every range of cells in the batch.
+    """
+    if isinstance(board, Board) and board.get_counts() is not None:
+        yield from iter_scanline_reveal(board, indexes)
+        return
+    if isinstance(board, ChunkedBoard):
+        for index in indexes:
+            if board[index] == UNEXPOSED:
+                yield from iter_chunked_reveal(board, index)
+        return
+    for index in indexes:
+        if board[index] != UNEXPOSED:
+            continue
+        number = number_at_cell(board, pokemon_locations, grid_size, index)
+        board[index] = str(number)
+        batch = [(index, index + 1)]
+        if number == 0:
+            for visible in iter_big_fun_search(board, grid_size, pokemon_locations, index):
+                if board[visible] == UNEXPOSED:
+                    board[visible] = str(number_at_cell(board, pokemon_locations, grid_size, visible))
+                    batch.append((visible, visible + 1))
+                    if len(batch) >= REVEAL_BATCH_SIZE:
+                        yield batch
+                        batch = []
+        if batch:
+            yield batch
+
+
+def flood_reveal(board, index):
+    """
+    Reveal the selected cell of a board and, when it has no neighbouring pokemons, every
+    cell big_fun_search would find from it, in a single breadth first pass.
+    Flagged cells are neither revealed nor searched past.
+    Parameters:
+        board (Board): Board holding the pokemon locations.
+        index (int): Index of the currently selected cell, which is not a pokemon.
+    Return:
+        (list<tuple<int, int>>): The index and number of every cell that was revealed.
+    """
+    cells = board.get_cells()
+    counts = board.get_counts()
+    edge_classes, offsets = neighbour_table(board.get_grid_size())
+    visited = bytearray(len(cells))
+    visited[index] = 1
+    queue = deque([index])
+    revealed = []
+    while queue:
+        node = queue.popleft()
+        cell = cells[node]
+        if cell == FLAG_CODE:
+            continue
+        number = counts[node]
+        if cell == UNEXPOSED_CODE:
+            board.reveal(node)
+            revealed.append((node, number))
+        if number == 0:
+            for offset in offsets[edge_classes[node]]:
+                neighbour = node + offset
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    queue.append(neighbour)
+    return revealed
+
+
+def chunked_reveal(board, index):
+    """
+    Reveal the same cells as flood_reveal on a ChunkedBoard, a row span of empty cells
+    at a time as scanline_reveal does. The walls are only built for the chunks the
+    reveal reaches, so the memory used follows the revealed area rather than the grid size.
+    Parameters:
+        board (ChunkedBoard): The board.
+        index (int): Index of the currently selected cell, which is not a pokemon.
+    Return:
+        (list<tuple<int, int>>): The start and stop index of every range of revealed cells.
+    """
+    return [cells for batch in iter_chunked_reveal(board, index) for cells in batch]
+
+
+def iter_chunked_reveal(board, index):
+    """
+    Reveal the same cells as chunked_reveal, yielding the ranges revealed around each
+    span as soon as the span is found. A span stops at the edge of its chunk, and the
+    empty cells it touches in the next chunk seed spans of their own. A chunk without
+    numbers or flags is revealed whole.
+    Yield:
+        (list<tuple<int, int>>): The start and stop index of every range revealed in the batch.
+    """
+    if board.number_at(index) != 0:
+        if board.get_code(index) == UNEXPOSED_CODE:
+            yield board.reveal_unexposed(index, index + 1)
+        return
+
+    grid_size = board.get_grid_size()
+    chunk_size = board.get_chunk_size()
+    walls = {}
+    seeds = [index]
+    while seeds:
+        seed = seeds.pop()
+        chunk, local = board.chunk_of(seed)
+        chunk_walls = _get_walls(board, walls, chunk)
+        if chunk_walls[local]:
+            continue
+        row, col = divmod(seed, grid_size)
+        if chunk_walls.find(1) == -1:
+            # reveal the empty chunk, the numbers around it, and seed the empty cells around it
+            walls[chunk] = bytearray([1]) * len(chunk_walls)
+            revealed = board.reveal_chunk(chunk)
+            first_row, first_col = row - row % chunk_size, col - col % chunk_size
+            left_col = max(first_col - 1, 0)
+            right_col = min(first_col + chunk_size + 1, grid_size)
+            for near_row in (first_row - 1, first_row + chunk_size):
+                if 0 <= near_row < grid_size:
+                    revealed += _reveal_row(board, walls, seeds, near_row, left_col, right_col)
+            for near_col in (first_col - 1, first_col + chunk_size):
+                if 0 <= near_col < grid_size:
+                    revealed += _reveal_line(board, walls, seeds, first_row * grid_size + near_col,
+                                             chunk_size, grid_size)
+            yield revealed
+            continue
+
+        row_start = local - col % chunk_size
+        wall = chunk_walls.rfind(1, row_start, local)
+        left = row_start if wall == -1 else wall + 1
+        right = chunk_walls.find(1, local, row_start + chunk_size)
+        if right == -1:
+            right = row_start + chunk_size
+        chunk_walls[left:right] = bytes([1]) * (right - left)
+
+        # reveal the span with the cells around it, and seed a span from every empty
+        # cell touching it, diagonals included
+        left_col = max(col - (local - left) - 1, 0)
+        right_col = min(col + (right - local) + 1, grid_size)
+        revealed = []
+        for near_row in range(max(row - 1, 0), min(row + 2, grid_size)):
+            revealed += _reveal_row(board, walls, seeds, near_row, left_col, right_col)
+        if revealed:
+            yield revealed
+
+
+def _get_walls(board, walls, chunk):
+    """(bytearray) Return the walls of a chunk kept in walls by iter_chunked_reveal, building them on first use."""
+    chunk_walls = walls.get(chunk)
+    if chunk_walls is None:
+        chunk_walls = walls[chunk] = board.chunk_walls(chunk)
+    return chunk_walls
+
+
+def _reveal_row(board, walls, seeds, row, left_col, right_col):
+    """
+    Reveal the cells of a row of a ChunkedBoard from left_col to right_col, one chunk at
+    a time, see _reveal_line.
+    Return:
+        (list<tuple<int, int>>): The start and stop index of every range of revealed cells.
+    """
+    grid_size = board.get_grid_size()
+    chunk_size = board.get_chunk_size()
+    revealed = []
+    col = left_col
+    while col < right_col:
+        stop_col = min(right_col, col - col % chunk_size + chunk_size)
+        revealed += _reveal_line(board, walls, seeds, row * grid_size + col, stop_col - col)
+        col = stop_col
+    return revealed
+
+
+def _reveal_line(board, walls, seeds, start, length, step=1):
+    """
+    Reveal the unexposed walls of a line of cells within one chunk of a ChunkedBoard,
+    going along a row, or down a column when step is the grid size, and add a seed for
+    every run of empty cells no span has taken yet, which the span then reveals.
+    Return:
+        (list<tuple<int, int>>): The start and stop index of every range of revealed cells.
+    """
+    chunk, local = board.chunk_of(start)
+    local_step = 1 if step == 1 else board.get_chunk_size()
+    line = _get_walls(board, walls, chunk)[local:local + length * local_step:local_step]
+    revealed = []
+    position = 0
+    while position < length:
+        wall = line[position]
+        end = line.find(1 - wall, position)
+        if end == -1:
+            end = length
+        if wall:
+            revealed += board.reveal_unexposed(start + position * step, start + end * step, step)
+        else:
+            seeds.append(start + position * step)
+        position = end
+    return revealed
+
+
+def scanline_reveal(board, index):
+    """
+    Reveal the same cells as flood_reveal, but a whole row span of empty cells at a time.
+    Spans are found and revealed with bytearray find and slicing, so a large empty region
+    costs a few operations per row instead of per cell.
+    Parameters:
+        board (Board): Board holding the pokemon locations.
+        index (int): Index of the currently selected cell, which is not a pokemon.
+    Return:
+        (list<tuple<int, int>>): The start and stop index of every range of revealed cells.
+    """
+    return scanline_reveal_many(board, [index])
+
+
+def scanline_reveal_many(board, indexes):
+    """
+    Reveal several cells at once, as scanline_reveal would one after the other, in a
+    single pass: the walls are built once and every empty cell seeds the same spans.
+    Parameters:
+        board (Board): Board holding the pokemon locations.
+        indexes (list<int>): Indexes of the selected cells, none of which is a pokemon.
+    Return:
+        (list<tuple<int, int>>): The start and stop index of every range of revealed cells.
+    """
+    return [cells for batch in iter_scanline_reveal(board, indexes) for cells in batch]
+
+
+def iter_scanline_reveal(board, indexes):
+    """
+    Reveal the same cells as scanline_reveal_many, yielding the ranges revealed around
+    each span as soon as the span is found. The walls do not depend on which cells are
+    exposed, so revealing a span early leaves the spans found after it unchanged.
+    Parameters:
+        board (Board): Board holding the pokemon locations.
+        indexes (list<int>): Indexes of the selected cells, none of which is a pokemon.
+    Yield:
+        (list<tuple<int, int>>): The start and stop index of every range revealed in the batch.
+    """
+    grid_size = board.get_grid_size()
+    cells = board.get_cells()
+    counts = board.get_counts()
+    revealed = []
+    seeds = []
+    for index in indexes:
+        if counts[index] == 0:
+            seeds.append(index)
+        elif cells[index] == UNEXPOSED_CODE:
+            board.reveal(index)
+            revealed.append((index, index + 1))
+    if revealed:
+        yield revealed
+    if not seeds:
+        return
+
+    # walls stop a span: cells with a number, flagged cells and spans already taken
+    walls = counts.translate(WALL_TABLE)
+    flag = cells.find(FLAG_CODE)
+    while flag != -1:
+        walls[flag] = 1
+        flag = cells.find(FLAG_CODE, flag + 1)
+
+    while seeds:
+        seed = seeds.pop()
+        if walls[seed]:
+            continue
+        row_start = seed - seed % grid_size
+        row_end = row_start + grid_size
+        wall = walls.rfind(1, row_start, seed)
+        left = row_start if wall == -1 else wall + 1
+        right = walls.find(1, seed, row_end)
+        if right == -1:
+            right = row_end
+        walls[left:right] = bytes([1]) * (right - left)
+
+        # any empty cell touching the span, diagonals included, seeds another span
+        for start in (row_start - grid_size, row_start + grid_size):
+            if not 0 <= start < len(cells):
+                continue
+            position = start + max(left - row_start - 1, 0)
+            stop = start + min(right - row_start + 1, grid_size)
+            position = walls.find(0, position, stop)
+            while position != -1:
+                seeds.append(position)
+                end = walls.find(1, position, stop)
+                if end == -1:
+                    break
+                position = walls.find(0, end, stop)
+
+        # reveal the span with the cells around it, skipping cells which are not unexposed
+        revealed = []
+        left_col = max(left - row_start - 1, 0)
+        right_col = min(right - row_start + 1, grid_size)
+        for start in (row_start - grid_size, row_start, row_start + grid_size):
+            if not 0 <= start < len(cells):
+                continue
+            lo = start + left_col
+            hi = start + right_col
+            unexposed = cells[lo:hi].translate(UNEXPOSED_TABLE)
+            position = unexposed.find(1)
+            while position != -1:
+                end = unexposed.find(0, position)
+                if end == -1:
+                    end = hi - lo
+                board.reveal_range(lo + position, lo + end)
+                revealed.append((lo + position, lo + end))
+                position = unexposed.find(1, end)
+        if revealed:
+            yield revealed
+
+
+def big_fun_search(game, grid_size, pokemon_locations, index):
+    """Searching adjacent cells to see if there are any Pokemon"s present.
+	Using some sick algorithms.
+	Find all cells which should be revealed when a cell is selected.
+	For cells which have a zero value (i.e. no neighbouring pokemons) all the cell"s
+	neighbours are revealed. If one of the neighbouring cells is also zero then
+	all of that cell"s neighbours are also revealed. This repeats until no
+	zero value neighbours exist.
+	For cells which have a non-zero value (i.e. cells with neighbour pokemons), only
+	the cell itself is revealed.
+	Parameters:
+		game (str|Board): Game string or board.
+		grid_size (int): Size of game.
+		pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+		index (int): Index of the currently selected cell
+	Returns:
+		(list<int>): List of cells to turn visible.
+	"""
+    if game[index] == FLAG or number_at_cell(game, pokemon_locations, grid_size, index) != 0:
+        return [index]
+    return list(iter_big_fun_search(game, grid_size, pokemon_locations, index))
+
+
+def iter_big_fun_search(game, grid_size, pokemon_locations, index):
+    """
+    Find the same cells as big_fun_search from a cell with no neighbouring pokemons,
+    yielding each cell as soon as it is discovered.
+    Parameters:
+        game (str|Board): Game string or board.
+        grid_size (int): Size of game.
+        pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+        index (int): Index of the currently selected cell
+    Yield:
+        (int): The index of a cell to turn visible.
+    """
+    queue = [index]
+    discovered = {index}
+    while queue:
+        node = queue.pop()
+        for neighbour in neighbour_directions(node, grid_size):
+            if neighbour in discovered or neighbour is None:
+                continue
+
+            discovered.add(neighbour)
+            if game[neighbour] != FLAG:
+                number = number_at_cell(game, pokemon_locations, grid_size, neighbour)
+                if number == 0:
+                    queue.append(neighbour)
+            yield neighbour
@@ -0,0 +1,128 @@
+"""
+An undo/redo history of board changes, shared by Assignment 1 and Assignment 3.
+
+Each action is stored as a Delta rather than a copy of the board. Revealed cells
+are kept as sorted (start, stop) index ranges, since a revealed cell was unexposed
+before and shows its number after, so a flood reveal costs one entry per run of
+cells. Other changes keep the index with the cell before and after.
+
+Assignment 3 imports this module from Assignment 1's directory.
+"""
+from collections import deque, namedtuple
+
+# Largest number of ranges and changed cells kept, the oldest actions are forgotten first
+HISTORY_LIMIT = 100000
+
+Delta = namedtuple('Delta', ('reveals', 'cells'))
+
+
+def merge_ranges(ranges):
+    """
+    Sort index ranges and join the ones which touch or overlap.
+    Parameters:
+        ranges (iterable<tuple<int, int>>): The (start, stop) ranges
+    Return:
+        (tuple<tuple<int, int>, ...>): The merged ranges.
+    """
+    merged = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if stop > merged[-1][1]:
+                merged[-1] = (merged[-1][0], stop)
+        else:
+            merged.append((start, stop))
+    return tuple(merged)
+
+
+class History:
+    """
+    Records the changes of an action between start and finish, and keeps the
+    recorded actions for undo and redo.
+    """
+
+    def __init__(self, limit=HISTORY_LIMIT):
+        """
+        Construct an empty history.
+        Parameters:
+            limit (int): The most ranges and changed cells kept over all actions
+        """
+        self._limit = limit
+        self._undo = deque()
+        self._redo = []
+        self._size = 0
+        self._reveals = None
+        self._cells = None
+
+    def start(self):
+        """Start recording the changes of an action."""
+        self._reveals = []
+        self._cells = []
+
+    def is_recording(self):
+        """(bool) Return whether an action is being recorded."""
+        return self._reveals is not None
+
+    def reveal(self, start, stop):
+        """Record that the cells from start up to stop were revealed, if recording."""
+        if self._reveals is not None:
+            self._reveals.append((start, stop))
+
+    def change(self, index, before, after):
+        """Record that a cell changed from before to after, if recording."""
+        if self._cells is not None:
+            self._cells.append((index, before, after))
+
+    def finish(self):
+        """Stop recording, and keep the action if anything changed, which clears the redo actions."""
+        if self._reveals or self._cells:
+            delta = Delta(merge_ranges(self._reveals), tuple(self._cells))
+            self._undo.append(delta)
+            self._size += self._delta_size(delta)
+            for redone in self._redo:
+                self._size -= self._delta_size(redone)
+            self._redo.clear()
+            while self._size > self._limit and len(self._undo) > 1:
+                self._size -= self._delta_size(self._undo.popleft())
+        self._reveals = None
+        self._cells = None
+
+    @staticmethod
+    def _delta_size(delta):
+        """(int) Return the number of ranges and changed cells of a delta."""
+        return len(delta.reveals) + len(delta.cells)
+
+    def get_size(self):
+        """(int) Return the number of ranges and changed cells kept."""
+        return self._size
+
+    def can_undo(self):
+        """(bool) Return whether there is an action to undo."""
+        return bool(self._undo)
+
+    def can_redo(self):
+        """(bool) Return whether there is an undone action to redo."""
+        return bool(self._redo)
+
+    def undo(self):
+        """
+        Take the last action, which the board then reverts.
+        Return:
+            (Delta): The action, or None if there is nothing to undo.
+        """
+        if not self._undo:
+            return None
+        delta = self._undo.pop()
+        self._redo.append(delta)
+        return delta
+
+    def redo(self):
+        """
+        Take the last undone action, which the board then applies again.
+        Return:
+            (Delta): The action, or None if there is nothing to redo.
+        """
+        if not self._redo:
+            return None
+        delta = self._redo.pop()
+        self._undo.append(delta)
+        return delta
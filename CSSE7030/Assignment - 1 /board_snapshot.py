@@ -0,0 +1,204 @@
+"""
+A compact binary snapshot of a game board, shared by Assignment 1 and Assignment 3.
+
+A snapshot is:
+    MAGIC, VERSION (1 byte)
+    varint grid size
+    varint seed (0 for none, otherwise the zigzag encoded seed plus 1)
+    varint number of pokemons, then the gap before each sorted pokemon index as a varint
+    the 2-bit state of every cell, four cells per byte, first cell in the lowest bits
+
+Numbers are not stored, since they follow from the pokemon locations.
+
+Assignment 3 imports this module from Assignment 1's directory.
+"""
+from collections import namedtuple
+
+MAGIC = b'PKSN'
+VERSION = 1
+# 2-bit cell states
+STATE_UNEXPOSED, STATE_EXPOSED, STATE_FLAG, STATE_POKEMON = range(4)
+# bytes.translate tables moving a state into, and out of, each 2-bit slot of a byte
+SLOT_SHIFTS = tuple(bytes((state << 2 * slot) & 0xFF for state in range(256)) for slot in range(4))
+SLOT_STATES = tuple(bytes((packed >> 2 * slot) & 3 for packed in range(256)) for slot in range(4))
+
+Snapshot = namedtuple('Snapshot', ('grid_size', 'states', 'pokemon_locations', 'seed'))
+
+
+class SnapshotError(ValueError):
+    """Raised when data is not a valid snapshot."""
+
+
+def encode_varint(number, output):
+    """Append an unsigned integer to a bytearray, seven bits per byte, lowest bits first."""
+    while number > 0x7F:
+        output.append(number & 0x7F | 0x80)
+        number >>= 7
+    output.append(number)
+
+
+def decode_varint(data, offset):
+    """
+    Read an unsigned integer written by encode_varint.
+    Return:
+        (tuple<int, int>): The integer and the offset after it.
+    """
+    number = shift = 0
+    while True:
+        if offset >= len(data):
+            raise SnapshotError("Snapshot ends inside a number")
+        byte = data[offset]
+        offset += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, offset
+        shift += 7
+
+
+def pack_states(states):
+    """
+    Pack cell states four to a byte. Each slot is filled by one bytes.translate and
+    the four slots are combined as integers, so no Python code runs per cell.
+    Parameters:
+        states (bytes): The state of each cell, 0 to 3
+    Return:
+        (bytes): The packed states.
+    """
+    states = bytes(states) + bytes(-len(states) % 4)
+    packed = 0
+    for slot in range(4):
+        packed |= int.from_bytes(states[slot::4].translate(SLOT_SHIFTS[slot]), 'little')
+    return packed.to_bytes(len(states) // 4, 'little')
+
+
+def unpack_states(packed, cell_count):
+    """
+    Unpack the states of cell_count cells packed by pack_states.
+    Return:
+        (bytearray): The state of each cell.
+    """
+    states = bytearray(len(packed) * 4)
+    for slot in range(4):
+        states[slot::4] = packed.translate(SLOT_STATES[slot])
+    del states[cell_count:]
+    return states
+
+
+def pack_snapshot(grid_size, states, pokemon_locations, seed=None):
+    """
+    Build the snapshot of a board.
+    Parameters:
+        grid_size (int): Size of game
+        states (bytes): The state of each cell, see STATE_UNEXPOSED
+        pokemon_locations (iterable<int>): The pokemon locations
+        seed (int): The seed of the game, if known
+    Return:
+        (bytes): The snapshot.
+    """
+    output = bytearray(MAGIC)
+    output.append(VERSION)
+    encode_varint(grid_size, output)
+    if seed is None:
+        encode_varint(0, output)
+    else:
+        encode_varint((seed * 2 if seed >= 0 else -seed * 2 - 1) + 1, output)
+    pokemons = sorted(set(pokemon_locations))
+    encode_varint(len(pokemons), output)
+    previous = -1
+    for pokemon in pokemons:
+        encode_varint(pokemon - previous - 1, output)
+        previous = pokemon
+    output += pack_states(states)
+    return bytes(output)
+
+
+def unpack_snapshot(data):
+    """
+    Read a snapshot built by pack_snapshot.
+    Return:
+        (Snapshot): The grid size, cell states, sorted pokemon locations and seed (None if unknown).
+    Raise:
+        SnapshotError: If the data is not a snapshot.
+    """
+    if data[:len(MAGIC)] != MAGIC or len(data) <= len(MAGIC) or data[len(MAGIC)] != VERSION:
+        raise SnapshotError("Not a board snapshot of a known version")
+    grid_size, offset = decode_varint(data, len(MAGIC) + 1)
+    seed, offset = decode_varint(data, offset)
+    if seed == 0:
+        seed = None
+    else:
+        seed -= 1
+        seed = seed // 2 if seed % 2 == 0 else -(seed + 1) // 2
+    number_of_pokemons, offset = decode_varint(data, offset)
+    cell_count = grid_size ** 2
+    pokemon_locations = []
+    previous = -1
+    for _ in range(number_of_pokemons):
+        gap, offset = decode_varint(data, offset)
+        previous += gap + 1
+        if previous >= cell_count:
+            raise SnapshotError("Snapshot pokemon location is outside its grid")
+        pokemon_locations.append(previous)
+    if len(data) - offset != -(-cell_count // 4):
+        raise SnapshotError("Snapshot cells do not match its grid size")
+    states = unpack_states(data[offset:], cell_count)
+    return Snapshot(grid_size, states, tuple(pokemon_locations), seed)
+
+
+def game_states(game, unexposed, flag, pokemon):
+    """
+    Find the cell states of a game string.
+    Parameters:
+        game (str): The game string
+        unexposed (str): Character of an unexposed cell
+        flag (str): Character of a flag
+        pokemon (str): Character of a shown pokemon
+    Return:
+        (bytes): The state of each cell, where digits are exposed.
+    """
+    table = {ord(unexposed): STATE_UNEXPOSED, ord(flag): STATE_FLAG, ord(pokemon): STATE_POKEMON}
+    for digit in '012345678':
+        table[ord(digit)] = STATE_EXPOSED
+    return game.translate(table).encode('latin-1')
+
+
+def states_game(states, grid_size, pokemon_locations, unexposed, flag, pokemon):
+    """
+    Build the game string of cell states, counting the numbers of the exposed cells.
+    Parameters:
+        states (bytes): The state of each cell
+        grid_size (int): Size of game
+        pokemon_locations (iterable<int>): The pokemon locations
+        unexposed (str): Character of an unexposed cell
+        flag (str): Character of a flag
+        pokemon (str): Character of a shown pokemon
+    Return:
+        (str): The game string.
+    """
+    cells = list(bytes(states).decode('latin-1').translate(
+        {STATE_UNEXPOSED: unexposed, STATE_FLAG: flag, STATE_POKEMON: pokemon}))
+    pokemons = set(pokemon_locations)
+    index = states.find(STATE_EXPOSED)
+    while index != -1:
+        row, col = divmod(index, grid_size)
+        cells[index] = str(sum(neighbour_row * grid_size + neighbour_col in pokemons
+                               for neighbour_row in range(max(row - 1, 0), min(row + 2, grid_size))
+                               for neighbour_col in range(max(col - 1, 0), min(col + 2, grid_size))))
+        index = states.find(STATE_EXPOSED, index + 1)
+    return ''.join(cells)
+
+
+def save_snapshot(path, snapshot):
+    """Write snapshot bytes to a file."""
+    with open(path, 'wb') as file:
+        file.write(snapshot)
+
+
+def load_snapshot(path):
+    """
+    Read a snapshot file.
+    Return:
+        (Snapshot): The unpacked snapshot.
+    """
+    with open(path, 'rb') as file:
+        return unpack_snapshot(file.read())
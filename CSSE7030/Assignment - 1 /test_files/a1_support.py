@@ -1,4 +1,5 @@
 import random
+from array import array
 
 ALPHA = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 UP = "up"
@@ -23,28 +24,99 @@ q - Quit.
 """
 
 
-def generate_pokemons(grid_size, number_of_pokemons):
+def generate_pokemons(grid_size, number_of_pokemons, rng=random, legacy=False):
     """Pokemons will be generated and given a random index within the game.
 
+    The indexes are drawn with a single random.sample. The legacy draw picks one
+    index at a time and draws again while it is taken, which slows down on dense
+    grids, and is only kept for the fixtures recorded with its sequence.
+
     Parameters:
         grid_size (int): The grid size of the game.
         number_of_pokemons (int): The number of pokemons that the game will have.
+        rng (random.Random): The random number generator to draw from, the
+            random module by default.
+        legacy (bool): Draw the indexes the way the original game did.
 
     Returns:
         (tuple<int>): A tuple containing  indexes where the pokemons are
         created for the game string.
     """
     cell_count = grid_size ** 2
-    pokemon_locations = ()
+    if not legacy:
+        return tuple(rng.sample(range(cell_count), min(number_of_pokemons, cell_count)))
+    pokemon_locations = []
+    placed = set()
 
     for _ in range(number_of_pokemons):
         if len(pokemon_locations) >= cell_count:
             break
-        index = random.randint(0, cell_count-1)
+        index = rng.randint(0, cell_count-1)
+
+        while index in placed:
+            index = rng.randint(0, cell_count-1)
+
+        placed.add(index)
+        pokemon_locations.append(index)
+
+    return tuple(pokemon_locations)
+
+
+def place_pokemons(grid_size, number_of_pokemons, seed=None):
+    """Pokemons are given distinct random indexes with a single random.sample,
+    which never has to retry an index, so dense and huge grids take time
+    linear in the number of pokemons.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+        number_of_pokemons (int): The number of pokemons that the game will have.
+        seed (int|random.Random): Seed, or random number generator, to draw from.
+            The same seed always places the same pokemons.
+
+    Returns:
+        (tuple<array<int>, set<int>>): The sorted indexes where the pokemons are
+        created, and a set of them for membership tests.
+    """
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+    cell_count = grid_size ** 2
+    indexes = rng.sample(range(cell_count), min(number_of_pokemons, cell_count))
+    typecode = 'I' if cell_count <= 2 ** 32 else 'Q'
+    return array(typecode, sorted(indexes)), set(indexes)
+
 
-        while index in pokemon_locations:
-            index = random.randint(0, cell_count-1)
+def generate_safe_pokemons(grid_size, number_of_pokemons, index, rng=random):
+    """Pokemons are given distinct random indexes away from the first revealed
+    cell, with a single random.sample over the cells which are allowed.
+
+    The cell and its neighbours are kept clear when enough other cells are left
+    for the pokemons, otherwise only the cell itself. Each sample counts allowed
+    cells, and is moved past the excluded cells at or before it.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+        number_of_pokemons (int): The number of pokemons that the game will have.
+        index (int): The index of the first revealed cell.
+        rng (random.Random): The random number generator to draw from, the
+            random module by default.
 
-        pokemon_locations += (index,)
+    Returns:
+        (tuple<int>): A sorted tuple containing indexes where the pokemons are
+        created for the game string.
+    """
+    cell_count = grid_size ** 2
+    row, col = divmod(index, grid_size)
+    excluded = [neighbour_row * grid_size + neighbour_col
+                for neighbour_row in range(max(row - 1, 0), min(row + 2, grid_size))
+                for neighbour_col in range(max(col - 1, 0), min(col + 2, grid_size))]
+    if cell_count - len(excluded) < number_of_pokemons:
+        excluded = [index]
+    allowed = cell_count - len(excluded)
 
-    return pokemon_locations
+    pokemon_locations = []
+    for sample in sorted(rng.sample(range(allowed), min(number_of_pokemons, allowed))):
+        for cell in excluded:
+            if sample < cell:
+                break
+            sample += 1
+        pokemon_locations.append(sample)
+    return tuple(pokemon_locations)
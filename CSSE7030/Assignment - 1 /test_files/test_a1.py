@@ -6,6 +6,7 @@ __author__ = "Steven Summers"
 
 import random
 import inspect
+import sys
 from pathlib import Path
 from typing import Tuple, List
 
@@ -16,6 +17,10 @@ Position = Tuple[int, int]
 Locations = Tuple[int, ...]
 SEED = 1001
 
+# The solver, heatmap, benchmark and engine modules are loaded from the assignment directory
+PARENT = Path(__file__).resolve().parent.parent
+sys.path.insert(1, str(PARENT))
+
 
 class A1:
     """ Just used for type hints """
@@ -66,6 +71,10 @@ class TestA1(OrderedTestCase):
 
     a1: A1
     a1_support: ...
+    a1_solver: ...
+    a1_benchmark: ...
+    a1_heatmap: ...
+    board_engine: ...
 
 
 class TestDesign(TestA1):
@@ -101,9 +110,9 @@ class TestFunctionality(TestA1):
     TEST_DATA = Path(__file__).parent / 'test_data'
 
     def get_pokemon_locations(self, grid_size: int, number_of_pokemon: int):
-        """ helper method for getting seeded pokemon locations """
+        """ helper method for getting seeded pokemon locations, drawn as the fixtures were """
         random.seed(SEED)
-        return self.a1_support.generate_pokemons(grid_size, number_of_pokemon)
+        return self.a1_support.generate_pokemons(grid_size, number_of_pokemon, legacy=True)
 
     def load_test_data(self, filename: str):
         """ load test data from file """
@@ -116,6 +125,62 @@ class TestFunctionality(TestA1):
             file.write(output)
 
 
+class TestPlacePokemons(TestFunctionality):
+    """ Tests a1_support.place_pokemons """
+
+    def test_reproducible(self):
+        """ test the same seed places the same pokemons """
+        first, _ = self.a1_support.place_pokemons(20, 50, seed=SEED)
+        second, _ = self.a1_support.place_pokemons(20, 50, seed=random.Random(SEED))
+        self.assertEqual(list(first), list(second))
+
+    def test_sorted_distinct(self):
+        """ test the pokemons are sorted, distinct and match the set """
+        locations, placed = self.a1_support.place_pokemons(20, 50, seed=SEED)
+        self.assertEqual(list(locations), sorted(placed))
+        self.assertEqual(len(placed), 50)
+
+    def test_too_many(self):
+        """ test no more pokemons than cells are placed """
+        locations, _ = self.a1_support.place_pokemons(3, 20, seed=SEED)
+        self.assertEqual(list(locations), list(range(9)))
+
+    def test_dense(self):
+        """ test a dense large grid """
+        locations, placed = self.a1_support.place_pokemons(500, 225000, seed=SEED)
+        self.assertEqual(len(locations), 225000)
+        self.assertEqual(len(placed), 225000)
+
+    def test_generate_with_rng(self):
+        """ test generate_pokemons from a given random number generator """
+        random.seed(SEED)
+        expected = self.a1_support.generate_pokemons(10, 30)
+        result = self.a1_support.generate_pokemons(10, 30, random.Random(SEED))
+        self.assertEqual(result, expected)
+
+    def test_generate_sampled(self):
+        """ test generate_pokemons draws distinct pokemons, at most one per cell """
+        result = self.a1_support.generate_pokemons(10, 100, random.Random(SEED))
+        self.assertEqual(sorted(result), list(range(100)))
+        result = self.a1_support.generate_pokemons(3, 20, random.Random(SEED))
+        self.assertEqual(sorted(result), list(range(9)))
+        result = self.a1_support.generate_pokemons(10, 30, random.Random(SEED))
+        self.assertEqual(len(set(result)), 30)
+        self.assertEqual(result, tuple(random.Random(SEED).sample(range(100), 30)))
+
+    def test_safe_neighbourhood(self):
+        """ test the first revealed cell and its neighbours are kept clear """
+        result = self.a1_support.generate_safe_pokemons(5, 16, 6, random.Random(SEED))
+        self.assertEqual(len(set(result)), 16)
+        self.assertEqual(list(result), sorted(result))
+        self.assertFalse(set(result) & {0, 1, 2, 5, 6, 7, 10, 11, 12})
+
+    def test_safe_dense(self):
+        """ test only the first revealed cell is kept clear when the pokemons need its neighbours """
+        result = self.a1_support.generate_safe_pokemons(3, 8, 4, random.Random(SEED))
+        self.assertEqual(result, (0, 1, 2, 3, 5, 6, 7, 8))
+
+
 @skipIfFailed(TestDesign, TestDesign.test_functions_defined.__name__, tag=A1.display_game.__name__)
 class TestDisplayGame(TestFunctionality):
     """ Tests display game """
@@ -149,6 +214,58 @@ class TestDisplayGame(TestFunctionality):
         self.assertMultiLineEqual(stdio.stdout, expected)
         self.assertIsNone(result, msg="display_game should not return a non None value")
 
+    def test_board_game(self):
+        """ test display game with a board """
+        board = self.a1.Board(self.grid_size, self.game)
+        with RedirectStdIO(stdout=True) as stdio:
+            self.a1.display_game(board, self.grid_size)
+
+        expected = self.load_test_data("display_game_simple.out")
+        self.assertMultiLineEqual(stdio.stdout, expected)
+
+    def test_renderer_dirty_rows(self):
+        """ test the renderer only rebuilds dirty rows """
+        board = self.a1.Board(12, pokemon_locations=(0, 50, 143))
+        renderer = self.a1.GameRenderer(12)
+        renderer.render(board, board.pop_dirty_rows())
+        self.a1.flag_cell(board, 50)
+        self.a1.scanline_reveal(board, 100)
+        dirty_rows = board.pop_dirty_rows()
+        self.assertIn(4, dirty_rows)
+        self.assertEqual(renderer.render(board, dirty_rows), renderer.render(board))
+        self.assertEqual(board.pop_dirty_rows(), set())
+
+
+class TestViewport(TestFunctionality):
+    """ Tests viewport rendering """
+
+    def test_row_label(self):
+        """ test row labels continue past Z """
+        labels = [self.a1.row_label(row) for row in (0, 25, 26, 51, 701, 702)]
+        self.assertEqual(labels, ['A', 'Z', 'AA', 'AZ', 'ZZ', 'AAA'])
+
+    def test_whole_window(self):
+        """ test a window of the whole map matches display_game """
+        with RedirectStdIO(stdout=True) as stdio:
+            self.a1.display_game(self.game, self.grid_size)
+        window = self.a1.display_window(self.game, self.grid_size, 0, 0, 3, 3)
+        self.assertEqual(window + '\n', stdio.stdout)
+
+    def test_window(self):
+        """ test a window widens cells for three digit columns """
+        window = self.a1.display_window(self.a1.Board(120), 120, 26, 98, 1, 2).split('\n')
+        self.assertEqual(window, ['   | 99 | 100|', '-' * 15, 'AA | ~  | ~  |', '-' * 15])
+
+    def test_scroll(self):
+        """ test scrolling stops at the edges and showing a cell centres it """
+        viewport = self.a1.Viewport(100, 10, 20)
+        viewport.scroll(*self.a1.parse_command('down 95', 100).scroll)
+        viewport.scroll(*self.a1.parse_command('left', 100).scroll)
+        self.assertEqual(viewport.get_window(), (90, 0, 10, 20))
+        viewport.show(5 * 100 + 50)
+        self.assertEqual(viewport.get_window(), (0, 40, 10, 20))
+        self.assertIsNone(self.a1.parse_command('down x', 100))
+
 
 @skipIfFailed(TestDesign, TestDesign.test_functions_defined.__name__, tag=A1.parse_position.__name__)
 class TestParsePosition(TestFunctionality):
@@ -194,6 +311,52 @@ class TestParsePosition(TestFunctionality):
         result = self.a1.parse_position("B", 4)
         self.assertIsNone(result)
 
+    def test_parse_invalid_column_zero(self):
+        """ test parse invalid column zero """
+        result = self.a1.parse_position("A0", 4)
+        self.assertIsNone(result)
+
+    def test_parse_invalid_row_out_of_range(self):
+        """ test parse invalid row out of range """
+        result = self.a1.parse_position("E1", 4)
+        self.assertIsNone(result)
+
+    def test_parse_multi_letter(self):
+        """ test parse rows past Z """
+        self.assertEqual(self.a1.parse_position("AA3", 30), (26, 2))
+        self.assertEqual(self.a1.parse_position("f AD30", 30), (29, 29))
+        self.assertIsNone(self.a1.parse_position("AE1", 30))
+
+    def test_parse_invalid_spaces(self):
+        """ test parse extra spaces """
+        self.assertIsNone(self.a1.parse_position("f  A1", 4))
+        self.assertIsNone(self.a1.parse_position("f A1 ", 4))
+
+    def test_parse_chord(self):
+        """ test a chord is a command and not a position """
+        self.assertIsNone(self.a1.parse_position("c B3", 4))
+        command = self.a1.parse_command("c B3", 4)
+        self.assertEqual((command.kind, command.position), ('chord', (1, 2)))
+
+
+class TestParseCommand(TestFunctionality):
+    """ Tests parse_command and parse_actions """
+
+    def test_commands(self):
+        """ test each kind of command """
+        commands = [self.a1.parse_command(action, 4) for action in ('h', ':)', 'q', 'B2', 'f B2', 'up 3',
+                                                                          'c C1')]
+        self.assertEqual([command.kind for command in commands],
+                         ['help', 'restart', 'quit', 'reveal', 'flag', 'scroll', 'chord'])
+        self.assertEqual(commands[4].position, (1, 1))
+        self.assertEqual(commands[5].scroll, (-3, 0))
+        self.assertEqual(commands[6].position, (2, 0))
+
+    def test_parse_actions(self):
+        """ test parsing a batch of actions """
+        commands = self.a1.parse_actions("A1\nf B2\nbad\nq", 3)
+        self.assertEqual([command and command.kind for command in commands], ['reveal', 'flag', None, 'quit'])
+
 
 @skipIfFailed(TestDesign, TestDesign.test_functions_defined.__name__, tag=A1.position_to_index.__name__)
 class TestPositionToIndex(TestFunctionality):
@@ -393,6 +556,30 @@ class TestNeighbourDirections(TestFunctionality):
         self.assertListSimilar(result, expected)
 
 
+class TestNeighbourTable(TestFunctionality):
+    """ Tests the cached neighbour_table """
+
+    def test_reused(self):
+        """ test the table is built once per grid size """
+        self.assertIs(self.a1.neighbour_table(7), self.a1.neighbour_table(7))
+
+    def test_neighbour_counts(self):
+        """ test number of neighbours for corners, edges and middle """
+        edge_classes, offsets = self.a1.neighbour_table(4)
+        counts = [len(offsets[edge_class]) for edge_class in edge_classes]
+        self.assertEqual(counts, [3, 5, 5, 3, 5, 8, 8, 5, 5, 8, 8, 5, 3, 5, 5, 3])
+
+    def test_single_cell(self):
+        """ test a grid of one cell has no neighbours """
+        self.assertEqual(self.a1.neighbour_directions(0, 1), [])
+
+    def test_cache_bounded(self):
+        """ test only a limited number of grid sizes are kept """
+        for grid_size in range(1, self.a1.NEIGHBOUR_TABLE_CACHE_SIZE + 5):
+            self.a1.neighbour_table(grid_size)
+        self.assertEqual(self.a1.neighbour_table.cache_info().currsize, self.a1.NEIGHBOUR_TABLE_CACHE_SIZE)
+
+
 @skipIfFailed(TestDesign, TestDesign.test_functions_defined.__name__, tag=A1.number_at_cell.__name__)
 class TestNumberAtCell(TestFunctionality):
     """ Tests number_at_cell """
@@ -411,6 +598,22 @@ class TestNumberAtCell(TestFunctionality):
         result = self.a1.number_at_cell(self.game, pokemon_locations, self.grid_size, 8)
         self.assertEqual(result, 0)
 
+    def test_pokemon_counts(self):
+        """ test counts of every cell computed at once """
+        # (0, 3, 1)
+        pokemon_locations = self.get_pokemon_locations(self.grid_size, 3)
+        result = self.a1.pokemon_counts(pokemon_locations, self.grid_size)
+        self.assertEqual(list(result), [2, 2, 1, 2, 3, 1, 1, 1, 0])
+
+    def test_board_counts(self):
+        """ test a board with pokemon locations matches counting neighbours """
+        pokemon_locations = self.get_pokemon_locations(10, 30)
+        board = self.a1.Board(10, pokemon_locations=pokemon_locations)
+        for index in range(100):
+            expected = self.a1.number_at_cell(self.a1.Board(10), pokemon_locations, 10, index)
+            result = self.a1.number_at_cell(board, pokemon_locations, 10, index)
+            self.assertEqual(result, expected)
+
 
 @skipIfFailed(TestDesign, TestDesign.test_functions_defined.__name__, tag=A1.check_win.__name__)
 class TestCheckWin(TestFunctionality):
@@ -447,6 +650,509 @@ class TestCheckWin(TestFunctionality):
         self.assertIs(result, False)
 
 
+class TestBoard(TestFunctionality):
+    """ Tests the mutable Board used in place of the game string """
+
+    def test_new_board(self):
+        """ test new board is unexposed """
+        board = self.a1.Board(self.grid_size)
+        self.assertEqual(str(board), self.game)
+        self.assertEqual(len(board), 9)
+
+    def test_from_game(self):
+        """ test board copied from game string """
+        game = "☺♥1♥31110"
+        board = self.a1.Board(3, game)
+        self.assertEqual(str(board), game)
+        self.assertEqual(board[0], self.a1_support.POKEMON)
+        self.assertEqual(board.count(self.a1_support.FLAG), 2)
+
+    def test_replace_in_place(self):
+        """ test replace_character_at_index updates the board in place """
+        board = self.a1.Board(self.grid_size)
+        result = self.a1.replace_character_at_index(board, 4, '3')
+        self.assertIs(result, board)
+        self.assertEqual(str(board), "~~~~3~~~~")
+
+    def test_flag_in_place(self):
+        """ test flag_cell toggles a flag on the board in place """
+        board = self.a1.Board(self.grid_size)
+        self.a1.flag_cell(board, 4)
+        self.assertEqual(str(board), "~~~~♥~~~~")
+        self.a1.flag_cell(board, 4)
+        self.assertEqual(str(board), self.game)
+
+    def test_flag_exposed(self):
+        """ test flag_cell leaves exposed cells alone """
+        result = self.a1.flag_cell("~~~~3~~~~", 4)
+        self.assertEqual(result, "~~~~3~~~~")
+
+    def test_check_win(self):
+        """ test check_win on a board """
+        pokemon_locations = self.get_pokemon_locations(self.grid_size, 3)
+        board = self.a1.Board(3, "♥♥1♥31110")
+        self.assertIs(self.a1.check_win(board, pokemon_locations), True)
+        self.a1.flag_cell(board, 0)
+        self.assertIs(self.a1.check_win(board, pokemon_locations), False)
+
+    def test_counters(self):
+        """ test win counters follow flags, reveals and a lost game """
+        pokemon_locations = self.get_pokemon_locations(10, 15)
+        board = self.a1.Board(10, pokemon_locations=pokemon_locations)
+        game = '~' * 100
+        for index in random.sample(range(100), 60):
+            if random.random() < 0.3 or index in pokemon_locations:
+                game = self.a1.flag_cell(game, index)
+                self.a1.flag_cell(board, index)
+            elif game[index] != self.a1_support.FLAG:
+                game = self.a1.reveal_cells(game, 10, pokemon_locations, index)
+                self.a1.reveal_cells(board, 10, pokemon_locations, index)
+            board.check_counters()
+            self.assertIs(self.a1.check_win(board, pokemon_locations),
+                          self.a1.check_win(game, pokemon_locations))
+        for pokemon in pokemon_locations:
+            self.a1.replace_character_at_index(board, pokemon, self.a1_support.POKEMON)
+        board.check_counters()
+
+    def test_counters_win(self):
+        """ test counters detect a win """
+        pokemon_locations = self.get_pokemon_locations(self.grid_size, 3)
+        board = self.a1.Board(3, pokemon_locations=pokemon_locations)
+        self.a1.reveal_cells(board, 3, pokemon_locations, 8)
+        for index in (0, 1, 3):
+            self.a1.flag_cell(board, index)
+        self.assertIs(self.a1.check_win(board, pokemon_locations), False)
+        self.a1.reveal_cells(board, 3, pokemon_locations, 2)
+        self.a1.reveal_cells(board, 3, pokemon_locations, 6)
+        self.assertIs(self.a1.check_win(board, pokemon_locations), True)
+
+    def test_check_counters_mismatch(self):
+        """ test check_counters notices a change made behind the counters """
+        board = self.a1.Board(3, pokemon_locations=(0, 3, 1))
+        board.get_cells()[8] = 0
+        with self.assertRaises(AssertionError):
+            board.check_counters()
+
+    def test_reveal_cells(self):
+        """ test reveal_cells on a board matches the game string """
+        pokemon_locations = self.get_pokemon_locations(self.grid_size, 3)
+        board = self.a1.Board(self.grid_size)
+        self.a1.reveal_cells(board, self.grid_size, pokemon_locations, 8)
+        expected = self.a1.reveal_cells(self.game, self.grid_size, pokemon_locations, 8)
+        self.assertEqual(str(board), expected)
+        self.assertEqual(expected, "~~~~31~10")
+
+
+class TestReveal(TestFunctionality):
+    """ Tests flood_reveal and scanline_reveal """
+
+    def setUp(self):
+        self.pokemon_locations = self.get_pokemon_locations(12, 20)
+        self.expected = self.a1.flag_cell('~' * 144, 55)
+        self.expected = self.a1.reveal_cells(self.expected, 12, self.pokemon_locations, 31)
+
+    def new_board(self):
+        """ helper method for a flagged board """
+        board = self.a1.Board(12, pokemon_locations=self.pokemon_locations)
+        self.a1.flag_cell(board, 55)
+        return board
+
+    def test_flood_reveal(self):
+        """ test flood_reveal matches reveal_cells on a game string """
+        board = self.new_board()
+        revealed = self.a1.flood_reveal(board, 31)
+        self.assertEqual(str(board), self.expected)
+        for index, number in revealed:
+            self.assertEqual(self.expected[index], str(number))
+        self.assertEqual(len(revealed), 144 - self.expected.count('~') - 1)
+
+    def test_scanline_reveal(self):
+        """ test scanline_reveal matches reveal_cells on a game string """
+        board = self.new_board()
+        revealed = self.a1.scanline_reveal(board, 31)
+        self.assertEqual(str(board), self.expected)
+        self.assertEqual(sum(stop - start for start, stop in revealed), 144 - self.expected.count('~') - 1)
+
+    def test_reveal_number(self):
+        """ test a cell with a number only reveals itself """
+        board = self.a1.Board(3, pokemon_locations=(0, 3, 1))
+        self.assertEqual(self.a1.scanline_reveal(board, 4), [(4, 5)])
+        self.assertEqual(self.a1.flood_reveal(board, 4), [])
+        self.assertEqual(str(board), "~~~~3~~~~")
+
+    def test_scanline_large_empty(self):
+        """ test revealing a large empty board """
+        board = self.a1.Board(1000, pokemon_locations=())
+        revealed = self.a1.scanline_reveal(board, 500500)
+        self.assertEqual(sum(stop - start for start, stop in revealed), 1000 ** 2)
+        self.assertEqual(board.count('0'), 1000 ** 2)
+
+    def test_streaming_reveal(self):
+        """ test the streaming reveal yields every revealed cell as it goes """
+        chunked = self.a1.ChunkedBoard(12, pokemon_locations=self.pokemon_locations)
+        self.a1.flag_cell(chunked, 55)
+        for board in self.new_board(), chunked:
+            batches = []
+            for batch in self.a1.iter_reveal_many_cells(board, 12, self.pokemon_locations, [31]):
+                batches.append(batch)
+                self.assertTrue(all(board[start:stop].isdigit() for start, stop in batch))
+            self.assertEqual(board[:], self.expected)
+            self.assertEqual(sum(stop - start for batch in batches for start, stop in batch),
+                             144 - self.expected.count('~') - 1)
+
+    def test_iter_big_fun_search(self):
+        """ test iter_big_fun_search finds the cells of big_fun_search in order """
+        game = self.a1.flag_cell('~' * 144, 55)
+        self.assertEqual(list(self.a1.iter_big_fun_search(game, 12, self.pokemon_locations, 31)),
+                         self.a1.big_fun_search(game, 12, self.pokemon_locations, 31))
+
+    def test_progress(self):
+        """ test play_command calls progress after each batch of a large reveal """
+        board = self.a1.Board(100, pokemon_locations=())
+        boards = []
+        command = self.a1.parse_command('A1', 100)
+        event = self.a1.play_command(board, 100, (), command, progress=boards.append)
+        self.assertEqual(event, self.a1.REVEALED)
+        # the first span reveals two rows and each later one the row below it
+        self.assertEqual(len(boards), 99)
+        self.assertTrue(all(game is board for game in boards))
+        self.assertEqual(board.count('0'), 100 ** 2)
+
+
+class TestChunkedBoard(TestFunctionality):
+    """ Tests ChunkedBoard """
+
+    def test_matches_board(self):
+        """ test a chunked board counts and reveals like a board """
+        pokemon_locations = self.get_pokemon_locations(12, 20)
+        board = self.a1.Board(12, pokemon_locations=pokemon_locations)
+        chunked = self.a1.ChunkedBoard(12, pokemon_locations=pokemon_locations, chunk_size=5)
+        for index in range(144):
+            self.assertEqual(chunked.number_at(index), board.number_at(index))
+            self.assertEqual(chunked.is_pokemon(index), board.is_pokemon(index))
+        for game in board, chunked:
+            self.a1.flag_cell(game, 55)
+            self.a1.reveal_cells(game, 12, pokemon_locations, 31)
+        self.assertEqual(chunked[:], str(board))
+        self.assertEqual(chunked.count('~'), board.count('~'))
+        self.assertEqual(chunked.count('0'), board.count('0'))
+
+    def test_drawn_pokemons(self):
+        """ test the pokemons drawn per chunk match their count """
+        chunked = self.a1.ChunkedBoard(7, density=0.2, seed=3, chunk_size=3)
+        pokemons = [index for index in range(49) if chunked.is_pokemon(index)]
+        self.assertEqual(len(pokemons), chunked.get_number_of_pokemons())
+        again = self.a1.ChunkedBoard(7, density=0.2, seed=3, chunk_size=3)
+        self.assertEqual([index for index in range(49) if again.is_pokemon(index)], pokemons)
+
+    def test_large_board(self):
+        """ test a huge board only allocates the chunks it uses """
+        grid_size = 100000
+        chunked = self.a1.ChunkedBoard(grid_size, density=0.15, seed=1)
+        index = grid_size * 50000 + 50004
+        self.assertEqual(chunked.number_at(index), 0)
+        revealed = self.a1.chunked_reveal(chunked, index)
+        self.assertEqual(chunked.count('~'), grid_size ** 2 - sum(stop - start for start, stop in revealed))
+        self.assertEqual(chunked[index - 5:index + 5], "~~~~100000")
+        self.assertEqual(chunked.get_chunk_count(), 1)
+        self.assertFalse(self.a1.check_win(chunked, None))
+
+    def test_chunked_reveal_large_empty(self):
+        """ test revealing a large empty chunked board """
+        chunked = self.a1.ChunkedBoard(1000, pokemon_locations=(), chunk_size=64)
+        revealed = self.a1.chunked_reveal(chunked, 500500)
+        self.assertEqual(sum(stop - start for start, stop in revealed), 1000 ** 2)
+        self.assertEqual(chunked.count('~'), 0)
+        self.assertEqual(chunked.count('0'), 1000 ** 2)
+
+    def test_new_board_chunked(self):
+        """ test only grids of CHUNKED_BOARD_MIN_SIZE or more get a chunked board """
+        self.assertIsInstance(self.a1.new_board(self.a1.CHUNKED_BOARD_MIN_SIZE, (0,)), self.a1.ChunkedBoard)
+        self.assertIsInstance(self.a1.new_board(self.a1.NEIGHBOUR_TABLE_MAX_SIZE + 1, (0,)), self.a1.Board)
+
+    def test_neighbours_without_table(self):
+        """ test neighbours of grids too large for a neighbour table """
+        grid_size = self.a1.NEIGHBOUR_TABLE_MAX_SIZE + 1
+        self.assertEqual(self.a1.neighbour_directions(0, grid_size), [grid_size, 1, grid_size + 1])
+        self.assertEqual(len(self.a1.neighbour_directions(grid_size + 1, grid_size)), 8)
+
+
+class TestSnapshot(TestFunctionality):
+    """ Tests save_game and restore_game """
+
+    def setUp(self):
+        self.pokemon_locations = self.get_pokemon_locations(12, 20)
+        self.board = self.a1.Board(12, pokemon_locations=self.pokemon_locations)
+        self.a1.flag_cell(self.board, 55)
+        self.a1.reveal_cells(self.board, 12, self.pokemon_locations, 31)
+
+    def test_round_trip(self):
+        """ test a restored board matches the saved one """
+        snapshot = self.a1.save_game(self.board, 12, self.pokemon_locations, SEED)
+        board, seed = self.a1.restore_game(snapshot)
+        self.assertEqual(str(board), str(self.board))
+        self.assertEqual(sorted(board.get_pokemon_locations()), sorted(self.pokemon_locations))
+        self.assertEqual(seed, SEED)
+        self.assertEqual(board.count('~'), self.board.count('~'))
+
+    def test_game_string(self):
+        """ test a game string saves like its board """
+        snapshot = self.a1.save_game(str(self.board), 12, self.pokemon_locations)
+        self.assertEqual(snapshot, self.a1.save_game(self.board, 12, self.pokemon_locations))
+        self.assertEqual(len(snapshot), 4 + 1 + 1 + 1 + 1 + 20 + 36)
+
+    def test_invalid(self):
+        """ test data which is not a snapshot is rejected """
+        snapshot = self.a1.save_game(self.board, 12, self.pokemon_locations)
+        with self.assertRaises(ValueError):
+            self.a1.restore_game(b'not a snapshot')
+        with self.assertRaises(ValueError):
+            self.a1.restore_game(snapshot[:-1])
+        with self.assertRaises(ValueError):
+            self.a1.restore_game(self.a1.save_game('~' * 144, 12, (3, 144)))
+
+    def test_chunked_board(self):
+        """ test a chunked board is rejected """
+        chunked = self.a1.ChunkedBoard(12, pokemon_locations=self.pokemon_locations)
+        with self.assertRaises(ValueError):
+            self.a1.save_game(chunked, 12, self.pokemon_locations)
+
+    def test_restored_history(self):
+        """ test a restored board can undo and redo """
+        board, _ = self.a1.restore_game(self.a1.save_game(self.board, 12, self.pokemon_locations))
+        self.assertFalse(board.undo())
+        board.start_action()
+        self.a1.flag_cell(board, 0)
+        board.finish_action()
+        self.assertTrue(board.undo())
+        self.assertEqual(str(board), str(self.board))
+        self.assertTrue(board.redo())
+        self.assertEqual(board[0], self.a1_support.FLAG)
+
+
+class TestHistory(TestFunctionality):
+    """ Tests undo and redo """
+
+    def setUp(self):
+        self.pokemon_locations = self.get_pokemon_locations(12, 20)
+        self.board = self.a1.new_board(12, self.pokemon_locations)
+
+    def test_safe_first_click(self):
+        """ test the first reveal is never a pokemon, and pokemons wait for it """
+        for seed in range(20):
+            game, events = self.a1.run_game(5, ['f E5', 'A1'], number_of_pokemons=20, seed=seed,
+                                            safe_first_click=True)
+            self.assertEqual(events[1], ('A1', 'reveal'))
+            self.assertEqual(len(game.get_pokemon_locations()), 20)
+            self.assertEqual(game[24], self.a1_support.FLAG)
+
+    def test_chord(self):
+        """ test a chord reveals the neighbours of a satisfied number in one action """
+        game, events = self.a1.run_game(3, ['c B2', 'f A1', 'B2', 'c B2'], pokemon_locations=(0,))
+        self.assertEqual(events, [('c B2', 'ignore'), ('f A1', 'flag'), ('B2', 'reveal'),
+                                  ('c B2', 'reveal'), ('c B2', 'win')])
+        game, events = self.a1.run_game(3, ['f A2', 'B2', 'c B2'], pokemon_locations=(0,))
+        self.assertEqual(events[-1], ('c B2', 'lose'))
+
+    def test_undo_redo(self):
+        """ test undoing and redoing a flag and a flood reveal """
+        self.a1.take_action(self.board, 12, self.pokemon_locations, 'f E8')
+        flagged = str(self.board)
+        self.a1.take_action(self.board, 12, self.pokemon_locations, 'C8')
+        revealed = str(self.board)
+        self.assertTrue(self.board.undo())
+        self.assertEqual(str(self.board), flagged)
+        self.assertTrue(self.board.undo())
+        self.assertEqual(str(self.board), '~' * 144)
+        self.assertFalse(self.board.undo())
+        self.assertTrue(self.board.redo())
+        self.assertTrue(self.board.redo())
+        self.assertEqual(str(self.board), revealed)
+        self.assertFalse(self.board.redo())
+        self.assertEqual(self.board.count('~'), revealed.count('~'))
+
+    def test_reveal_ranges(self):
+        """ test a flood reveal is kept as merged ranges """
+        self.a1.take_action(self.board, 12, self.pokemon_locations, 'C8')
+        delta = self.board.get_history().undo()
+        revealed = 144 - self.board.count('~')
+        self.assertEqual(sum(stop - start for start, stop in delta.reveals), revealed)
+        self.assertLess(len(delta.reveals), revealed)
+        self.assertEqual(delta.cells, ())
+
+    def test_limit(self):
+        """ test the oldest actions are forgotten past the limit """
+        self.board.enable_history(limit=3)
+        for action in ('f A1', 'f A2', 'f A3', 'f A4'):
+            self.a1.take_action(self.board, 12, self.pokemon_locations, action)
+        self.assertEqual(self.board.get_history().get_size(), 3)
+        while self.board.undo():
+            pass
+        self.assertEqual(self.board[:4], '♥~~~')
+
+    def test_merge_ranges(self):
+        """ test merging reveal ranges """
+        merged = self.a1.board_history.merge_ranges([(5, 6), (0, 2), (2, 3), (4, 5), (1, 2)])
+        self.assertEqual(merged, ((0, 3), (4, 6)))
+
+
+class TestRunGame(TestFunctionality):
+    """ Tests run_game """
+
+    def replay(self, file_in: str):
+        """ helper method to replay the input of a main test """
+        grid_size, number_of_pokemons, *actions = self.load_test_data(file_in).splitlines()
+        with RedirectStdIO(stdout=True) as stdio:
+            game, events = self.a1.run_game(int(grid_size), actions, number_of_pokemons=int(number_of_pokemons),
+                                            seed=SEED, legacy_pokemons=True)
+        self.assertEqual(stdio.stdout, '', msg="run_game should not print")
+        return game, events
+
+    def test_game_win(self):
+        """ test replaying a win """
+        game, events = self.replay("main_game_win.in")
+        self.assertEqual(events[-2:], [('C1', 'reveal'), ('C1', 'win')])
+        self.assertTrue(self.a1.check_win(game, game.get_pokemon_locations()))
+
+    def test_game_over_after_reset(self):
+        """ test replaying a reset and a loss """
+        game, events = self.replay("main_reset.in")
+        self.assertEqual(events, [('C3', 'reveal'), ('f A1', 'flag'), (':)', 'restart'), ('C3', 'lose')])
+        self.assertEqual(game.count(self.a1_support.POKEMON), 3)
+
+    def test_quit(self):
+        """ test a quit needs its answer """
+        game, events = self.a1.run_game(3, ['q', 'n', 'A1', 'q', 'y', 'A2'], pokemon_locations=(8,))
+        self.assertEqual(events, [('q', 'continue'), ('A1', 'reveal'), ('q', 'quit')])
+        self.assertEqual(str(game), "00001101~")
+
+    def test_undo_redo(self):
+        """ test undo and redo actions """
+        game, events = self.a1.run_game(3, ['u', 'A1', 'u', 'r', 'r', 'f C3'], pokemon_locations=(8,))
+        self.assertEqual([event for _, event in events],
+                         ['invalid', 'reveal', 'undo', 'redo', 'invalid', 'flag', 'win'])
+        grid_size = self.a1.CHUNKED_BOARD_MIN_SIZE
+        game, events = self.a1.run_game(grid_size, ['u', 'r'], pokemon_locations=(0,))
+        self.assertEqual(events, [('u', 'invalid'), ('r', 'invalid')])
+
+
+class TestSolver(TestFunctionality):
+    """ Tests the solver and self play """
+
+    def test_solver_game(self):
+        """ test the solver guesses a corner then deduces the pokemon """
+        game = self.a1.Board(3, pokemon_locations=(8,))
+        solver = self.a1_solver.Solver(3, 1)
+        self.assertEqual(solver.next_action(game), 'A1')
+        self.a1.take_action(game, 3, (8,), 'A1')
+        self.assertEqual(solver.next_action(game), 'f C3')
+        self.a1.take_action(game, 3, (8,), 'f C3')
+        self.assertTrue(self.a1.check_win(game, (8,)))
+        self.assertEqual(solver.get_guesses(), 1)
+
+    def test_play_game_deterministic(self):
+        """ test a seeded game is always played the same way """
+        actions, actions_again = [], []
+        won, latencies = self.a1_solver.play_game(8, 6, 5, actions)
+        won_again, latencies_again = self.a1_solver.play_game(8, 6, 5, actions_again)
+        self.assertEqual(won, won_again)
+        self.assertEqual(actions, actions_again)
+        self.assertEqual(len(latencies), len(actions))
+
+    def test_self_play(self):
+        """ test the self play report """
+        report = self.a1_solver.self_play([5], [0.1, 0.2], 5, processes=1)
+        self.assertEqual(report['games'], 10)
+        self.assertEqual([(result['grid_size'], result['density']) for result in report['results']],
+                         [(5, 0.1), (5, 0.2)])
+        for result in report['results']:
+            self.assertTrue(0 <= result['win_rate'] <= 1)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+
+class TestHeatmap(TestFunctionality):
+    """ Tests the pokemon chance heatmap """
+
+    def test_chances(self):
+        """ test the chances around a number and away from it """
+        chances = self.a1_heatmap.heatmap('1~~~~~~~~', 3, 2, time_budget=None)
+        self.assertEqual(sorted(chances), [1, 2, 3, 4, 5, 6, 7, 8])
+        for cell in (1, 3, 4):
+            self.assertAlmostEqual(chances[cell], 1 / 3)
+        for cell in (2, 5, 6, 7, 8):
+            self.assertAlmostEqual(chances[cell], 1 / 5)
+
+    def test_groups(self):
+        """ test numbers sharing no cell are counted as separate groups """
+        heatmap = self.a1_heatmap.Heatmap(6, 2, time_budget=None)
+        chances = heatmap.update('1' + '~' * 34 + '1')
+        self.assertEqual(heatmap.get_groups(), [[1, 6, 7], [28, 29, 34]])
+        self.assertTrue(heatmap.is_exact())
+        self.assertAlmostEqual(chances[28], 1 / 3)
+        self.assertEqual(chances[14], 0)
+
+    def test_incremental(self):
+        """ test an update of the changed cells matches a full update """
+        pokemon_locations = (0, 7, 13, 22, 30)
+        game = self.a1.Board(6, pokemon_locations=pokemon_locations)
+        self.a1.reveal_cells(game, 6, pokemon_locations, 35)
+        heatmap = self.a1_heatmap.Heatmap(6, 5, time_budget=None)
+        heatmap.update(game)
+        before = str(game)
+        self.a1.reveal_cells(game, 6, pokemon_locations, 2)
+        changed = [index for index, character in enumerate(before) if character != game[index]]
+        chances = heatmap.update(game, changed)
+        expected = self.a1_heatmap.heatmap(game, 6, 5, time_budget=None)
+        self.assertEqual(sorted(chances), sorted(expected))
+        for cell, chance in expected.items():
+            self.assertAlmostEqual(chances[cell], chance)
+
+    def test_time_budget(self):
+        """ test groups past the time budget are estimated """
+        heatmap = self.a1_heatmap.Heatmap(6, 2, time_budget=0)
+        chances = heatmap.update('1' + '~' * 34 + '1')
+        self.assertFalse(heatmap.is_exact())
+        self.assertAlmostEqual(chances[1], 1 / 3)
+
+
+class TestBenchmark(TestFunctionality):
+    """ Tests the benchmark suite """
+
+    def test_run_benchmarks(self):
+        """ test every benchmark runs on a small grid """
+        report = self.a1_benchmark.run_benchmarks([5, 30], [0.1], min_time=0.001)
+        benchmarks = self.a1_benchmark.BENCHMARKS
+        self.assertEqual(len(report['results']), 2 * len(benchmarks))
+        for name in benchmarks:
+            self.assertGreater(report['results'][f'{name}/5/0.1'], 0)
+
+    def test_find_regressions(self):
+        """ test results slower than the baseline are flagged """
+        baseline = {'results': {'a/5/0.1': 1.0, 'b/5/0.1': 1.0, 'c/5/0.1': 1.0}}
+        report = {'results': {'a/5/0.1': 1.2, 'b/5/0.1': 2.0, 'c/5/0.1': 3.0, 'd/5/0.1': 9.0}}
+        self.assertEqual(self.a1_benchmark.find_regressions(report, baseline),
+                         [('c/5/0.1', 1.0, 3.0), ('b/5/0.1', 1.0, 2.0)])
+
+
+class TestEngine(TestFunctionality):
+    """ Tests the shared board engine """
+
+    def test_shared(self):
+        """ test a1 plays through the board engine """
+        for name in ('Board', 'ChunkedBoard', 'neighbour_directions', 'number_at_cell',
+                     'pokemon_counts', 'reveal_cells', 'check_win', 'big_fun_search'):
+            self.assertIs(getattr(self.a1, name), getattr(self.board_engine, name))
+
+    def test_string_game(self):
+        """ test the engine plays a game string like a Board """
+        pokemon_locations = (0, 7)
+        game = self.board_engine.reveal_cells('~' * 9, 3, pokemon_locations, 5)
+        board = self.board_engine.Board(3, pokemon_locations=pokemon_locations)
+        self.board_engine.reveal_cells(board, 3, pokemon_locations, 5)
+        self.assertEqual(game, '~~~~~1~~~')
+        self.assertEqual(str(board), game)
+
+
 @skipIfFailed(TestDesign, TestDesign.test_functions_defined.__name__, tag=A1.main.__name__)
 class TestMain(TestFunctionality):
     """ Tests main """
@@ -484,6 +1190,11 @@ class TestMain(TestFunctionality):
 
     def setUp(self):
         random.seed(SEED)
+        # the games of the recorded fixtures were drawn the way the original game did
+        self.a1.LEGACY_POKEMONS = True
+
+    def tearDown(self):
+        self.a1.LEGACY_POKEMONS = False
 
     def test_help(self):
         """ test show help """
@@ -546,15 +1257,29 @@ def main():
     """ run tests """
     test_cases = [
         TestDesign,
+        TestPlacePokemons,
         TestDisplayGame,
+        TestViewport,
         TestParsePosition,
+        TestParseCommand,
         TestPositionToIndex,
         TestReplaceCharacterAtIndex,
         TestFlagCell,
         TestIndexInDirection,
         TestNeighbourDirections,
+        TestNeighbourTable,
         TestNumberAtCell,
         TestCheckWin,
+        TestBoard,
+        TestReveal,
+        TestChunkedBoard,
+        TestSnapshot,
+        TestHistory,
+        TestRunGame,
+        TestSolver,
+        TestHeatmap,
+        TestBenchmark,
+        TestEngine,
         TestMain
     ]
 
@@ -565,7 +1290,11 @@ def main():
                         include_no_print=True,
                         scripts=[
                             ('a1', 'a1.py'),
-                            ('a1_support', 'a1_support.py')
+                            ('a1_support', 'a1_support.py'),
+                            ('a1_solver', str(PARENT / 'a1_solver.py')),
+                            ('a1_benchmark', str(PARENT / 'a1_benchmark.py')),
+                            ('a1_heatmap', str(PARENT / 'a1_heatmap.py')),
+                            ('board_engine', str(PARENT / 'board_engine.py'))
                         ])
     master.run(test_cases)
 
@@ -1,3 +1,5 @@
+from collections import deque
+
 EMPTY_TILE = "tile"
 START_PIPE = "start"
 END_PIPE = "end"
@@ -18,6 +20,80 @@ PIPES = {
     "OU": "over-under"
 }
 
+SIDES = ("N", "E", "S", "W")
+SIDE_INDEX = {side: index for index, side in enumerate(SIDES)}
+# The side a neighbour is entered from, by the side it is left through
+OPPOSITE_SIDES = (2, 3, 0, 1)
+# The row and column steps to the neighbour on each side
+SIDE_STEPS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+PIPE_STRUCTURE = {
+    # name of pipe: channel of each side (N, E, S, W), sides on the same channel are connected
+    "straight": (1, 0, 1, 0),
+    "corner": (1, 1, 0, 0),
+    "cross": (1, 1, 1, 1),
+    "junction-t": (0, 1, 1, 1),
+    "diagonals": (1, 1, 2, 2),
+    "over-under": (1, 2, 1, 2),
+}
+
+
+def structure_mask(parts):
+    """Builds the connection mask of a pipe in its default orientation.
+
+    Parameters:
+        parts (tuple<int, int, int, int>): The channel of each side (N, E, S, W), 0 for none.
+
+    Return:
+        int: Bit i is set when side i is on the first channel, and bit 4 + i when it is on the second.
+    """
+    mask = 0
+    for index, channel in enumerate(parts):
+        if channel:
+            mask |= 1 << (4 * (channel - 1) + index)
+    return mask
+
+
+def rotate_mask(mask, orientation):
+    """Rotates a connection mask clockwise by a number of quarter turns.
+
+    Return:
+        int: The mask of the rotated pipe.
+    """
+    rotated = 0
+    for channel in (0, 4):
+        sides = mask >> channel & 0xF
+        rotated |= ((sides << orientation | sides >> (4 - orientation)) & 0xF) << channel
+    return rotated
+
+
+def mask_connections(mask):
+    """Lists the sides connected to each side of a connection mask.
+
+    Return:
+        tuple<tuple<str, ...>, ...>: The sides sharing a channel with each of N, E, S and W.
+    """
+    connections = []
+    for index in range(4):
+        for channel in (0, 4):
+            if mask >> (channel + index) & 1:
+                connections.append(tuple(SIDES[other] for other in range(4)
+                                         if other != index and mask >> (channel + other) & 1))
+                break
+        else:
+            connections.append(())
+    return tuple(connections)
+
+
+# The connection mask of each pipe in each orientation
+PIPE_MASKS = {name: tuple(rotate_mask(structure_mask(parts), orientation) for orientation in range(4))
+              for name, parts in PIPE_STRUCTURE.items()}
+# The sides connected to each side, by connection mask then side index
+CONNECTIONS = tuple(mask_connections(mask) for mask in range(256))
+# CONNECTIONS with the connected sides as side indexes
+CONNECTED_SIDES = tuple(tuple(tuple(SIDE_INDEX[side] for side in sides) for sides in connections)
+                        for connections in CONNECTIONS)
+
 
 class Tile(object):
     """Representation of an available space in board game"""
@@ -96,92 +172,27 @@ class Pipe(Tile):
         """
         super().__init__(name, selectable)
         self._orientation = orientation
+        self._masks = PIPE_MASKS.get(name)
+        self._listener = None
 
     def get_id(self):
         """Gets the id of the pipe class"""
         return 'pipe'
 
     def get_connected(self, side: str):
-        """(list<str>) A list of all sides that are connected to the given side."""
-        if self._name == self.ST:
-            return self._get_straight_connection(side)
-        elif self._name == self.CO:
-            return self._get_corner_connection(side)
-        elif self._name == self.CR:
-            return self._get_cross_connection(side)
-        elif self._name == self.JT:
-            return self._get_junction_t_connection(side)
-        elif self._name == self.DI:
-            return self._get_diagonals_connection(side)
-        elif self._name == self.OU:
-            return self._get_over_under_connection(side)
-
-    def _get_straight_connection(self, side: str):
-        """Checks the direction that can be connected in the straight pipe from
-        given side.
+        """(list<str>) A list of all sides that are connected to the given side.
 
-        Parameters:
-            side (str): Four directions, namely east, south, west and north.
+        The sides are looked up in CONNECTIONS by the mask of the pipe's orientation.
+        """
+        return list(CONNECTIONS[self._masks[self._orientation]][SIDE_INDEX[side]])
+
+    def get_mask(self):
+        """Gets the connection mask of the pipe in its orientation, see structure_mask.
 
         Return:
-            list<str>: Returns a list of possible connected sides.
+            int: The connection mask
         """
-        vertical_ori = {self.NORTH: [self.SOUTH], self.SOUTH: [self.NORTH]}
-        horizontal_ori = {self.EAST: [self.WEST], self.WEST: [self.EAST]}
-
-        if self._orientation == 0 or self._orientation == 2:
-            return vertical_ori.get(side, [])
-        return horizontal_ori.get(side, [])
-
-    def _get_corner_connection(self, side: str):
-        """Returns a list of possible connected sides in corner pipe."""
-        corner_ori_ne = {self.NORTH: [self.EAST], self.EAST: [self.NORTH]}
-        corner_ori_se = {self.EAST: [self.SOUTH], self.SOUTH: [self.EAST]}
-        corner_ori_sw = {self.SOUTH: [self.WEST], self.WEST: [self.SOUTH]}
-        corner_ori_nw = {self.WEST: [self.NORTH], self.NORTH: [self.WEST]}
-        if self._orientation == 0:
-            return corner_ori_ne.get(side, [])
-        elif self._orientation == 1:
-            return corner_ori_se.get(side, [])
-        elif self._orientation == 2:
-            return corner_ori_sw.get(side, [])
-        return corner_ori_nw.get(side, [])
-
-    def _get_cross_connection(self, side: str):
-        """Returns a list of possible connected sides in cross pipe."""
-        cross_ori = {self.NORTH: [self.EAST, self.SOUTH, self.WEST],
-                     self.EAST: [self.NORTH, self.SOUTH, self.WEST],
-                     self.SOUTH: [self.NORTH, self.EAST, self.WEST],
-                     self.WEST: [self.NORTH, self.EAST, self.SOUTH]}
-        return cross_ori.get(side)
-
-    def _get_junction_t_connection(self, side: str):
-        """Returns a list of possible connected sides in junction-t pipe."""
-        jt_ori_0 = {self.NORTH: [], self.EAST: [self.SOUTH, self.WEST], self.SOUTH: [self.EAST, self.WEST],
-                    self.WEST: [self.EAST, self.SOUTH]}
-        jt_ori_1 = {self.EAST: [], self.NORTH: [self.SOUTH, self.WEST], self.SOUTH: [self.WEST, self.NORTH],
-                    self.WEST: [self.SOUTH, self.NORTH]}
-        jt_ori_2 = {self.SOUTH: [], self.NORTH: [self.EAST, self.WEST], self.EAST: [self.NORTH, self.WEST],
-                    self.WEST: [self.NORTH, self.EAST]}
-        jt_ori_3 = {self.WEST: [], self.NORTH: [self.EAST, self.SOUTH], self.EAST: [self.NORTH, self.SOUTH],
-                    self.SOUTH: [self.NORTH, self.EAST]}
-        jt = [jt_ori_0, jt_ori_1, jt_ori_2, jt_ori_3]
-        return jt[self._orientation][side]
-
-    def _get_diagonals_connection(self, side: str):
-        """Returns a list of possible connected sides in diagonals pipe."""
-        diag_ori_0 = {self.NORTH: [self.EAST], self.EAST: [self.NORTH], self.SOUTH: [self.WEST],
-                      self.WEST: [self.SOUTH]}
-        diag_ori_1 = {self.NORTH: [self.WEST], self.EAST: [self.SOUTH], self.SOUTH: [self.EAST],
-                      self.WEST: [self.NORTH]}
-        return diag_ori_0.get(side) if self._orientation == 0 or \
-                                       self._orientation == 2 else diag_ori_1.get(side)
-
-    def _get_over_under_connection(self, side: str):
-        """Returns a list of possible connected sides in over-under pipe."""
-        ou_ori = {self.NORTH: [self.SOUTH], self.EAST: [self.WEST],
-                  self.SOUTH: [self.NORTH], self.WEST: [self.EAST]}
-        return ou_ori.get(side)
+        return self._masks[self._orientation]
 
     def rotate(self, direction: int):
         """Rotates the selected pipe。
@@ -192,6 +203,16 @@ class Pipe(Tile):
             direction (int): The plus or minus of an integer determines the direction of rotation.
         """
         self._orientation = (self._orientation + direction) % 4
+        if self._listener is not None:
+            self._listener()
+
+    def set_listener(self, listener):
+        """Sets the callable called, with no arguments, after the pipe is rotated.
+
+        Parameters:
+            listener (callable): The callable, or None to stop calling one.
+        """
+        self._listener = listener
 
     def get_orientation(self):
         """The orientation of the pipe determines what status the pipe is in.
@@ -283,6 +304,15 @@ class PipeGame:
         """
         self._board_layout, self._playable_pipes = self.load_file(game_file)
         self._start, self._end = self.end_pipe_positions()
+        # the flow states reached from the start pipe, see track_reachable
+        self._reached = None
+        self._children = None
+        self._size = None
+        self._tracked = None
+        for row, tiles in enumerate(self._board_layout):
+            for col, tile in enumerate(tiles):
+                if isinstance(tile, Pipe):
+                    self._watch(tile, (row, col))
 
     def load_file(self, game_file):
         """Load the board game elements and pipes information through IO"""
@@ -381,8 +411,13 @@ class PipeGame:
         The quantity of available pipes should also be modified.
         """
         cow, col = position
+        old = self._board_layout[cow][col]
+        if isinstance(old, Pipe):
+            old.set_listener(None)
         self._board_layout[cow][col] = pipe
         self.change_playable_amount(pipe.get_name(), -1)
+        self._watch(pipe, position)
+        self._pipe_changed(position)
 
     def pipe_in_position(self, position):
         """Checks whether the given position is a pipe.
@@ -402,8 +437,11 @@ class PipeGame:
         """Removes the pipe in given position."""
         cow, col = position
         pipe = self._board_layout[cow][col]
+        if isinstance(pipe, Pipe):
+            pipe.set_listener(None)
         self._board_layout[cow][col] = (Tile('tile', True))
         self.change_playable_amount(pipe.get_name(), 1)
+        self._pipe_changed(position)
 
     def position_in_direction(self, direction, position):
         """According to the given direction and position information,
@@ -449,34 +487,209 @@ class PipeGame:
                 if self._board_layout[y][x].get_name() == END_PIPE:
                     return y, x
 
+    def get_end_pipe_positions(self):
+        """Gets the start and end pipe positions saved by the constructor, finding them
+        again only if the board no longer has its pipes there.
+
+        Return:
+            tuple<tuple<int, int>, tuple<int, int>>: The start and end pipe positions
+        """
+        positions = self._start, self._end
+        for position, name in zip(positions, (START_PIPE, END_PIPE)):
+            if position is None or self._board_layout[position[0]][position[1]].get_name() != name:
+                self._start, self._end = self.end_pipe_positions()
+                return self._start, self._end
+        return positions
+
     def check_win(self):
         """
         (bool) Returns True  if the player has won the game False otherwise.
+
+        The states reached from the start pipe are kept up to date by set_pipe, remove_pipe
+        and Pipe.rotate (see track_reachable), so only the cell in front of the end pipe's
+        opening is checked.
         """
-        position = self.get_starting_position()
-        pipe = self.pipe_in_position(position)
-        queue = [(pipe, None, position)]
-        discovered = [(pipe, None)]
-        while queue:
-            pipe, direction, position = queue.pop()
-            for direction in pipe.get_connected(direction):
-
-                if self.position_in_direction(direction, position) is None:
-                    new_direction = None
-                    new_position = None
-                else:
-                    new_direction, new_position = self.position_in_direction(direction, position)
-                if new_position == self.get_ending_position() and direction == self.pipe_in_position(
-                        new_position).get_connected()[0]:
-                    return True
-
-                pipe = self.pipe_in_position(new_position)
-                if pipe is None or (pipe, new_direction) in discovered:
-                    continue
-                discovered.append((pipe, new_direction))
-                queue.append((pipe, new_direction, new_position))
+        if self._tracked != self.get_end_pipe_positions():
+            self.track_reachable()
+        start, end = self._tracked
+        if start is None or end is None:
+            return False
+        cols = len(self._board_layout[0])
+        end_index = end[0] * cols + end[1]
+        end_side = SIDE_INDEX[self._board_layout[end[0]][end[1]].get_connected()[0]]
+        feeder = end_index - (-cols, 1, cols, -1)[end_side]
+        for entry in range(5):
+            if feeder * 5 + entry in self._reached:
+                for side, state in self._exits(feeder * 5 + entry):
+                    if side == end_side and state // 5 == end_index:
+                        return True
+        return False
+
+    def get_reachable(self):
+        """Gets the positions the flow from the start pipe reaches.
+
+        Return:
+            set<tuple<int, int>>: The positions of the pipes the flow enters, the start pipe included.
+        """
+        if self._tracked != self.get_end_pipe_positions():
+            self.track_reachable()
+        cols = len(self._board_layout[0])
+        return {divmod(state // 5, cols) for state in self._reached}
+
+    def track_reachable(self):
+        """Finds every flow state reached from the start pipe, from scratch.
+
+        A state is a pipe's cell index and the side the flow enters it through, stored
+        as index * 5 + side, where side 4 is the start pipe's own flow. Each reached state
+        keeps the state it was first reached from, so the states reached through a changed
+        cell can be dropped and found again without searching from the start.
+        """
+        self._reached = {}
+        self._children = {}
+        self._size = len(self._board_layout), len(self._board_layout[0])
+        self._tracked = start, end = self.get_end_pipe_positions()
+        if start is None:
+            return
+        root = (start[0] * len(self._board_layout[0]) + start[1]) * 5 + 4
+        self._reached[root] = None
+        self._grow(deque([root]))
+
+    def _watch(self, pipe, position):
+        """Calls _pipe_changed for the position after the pipe is rotated."""
+        pipe.set_listener(lambda: self._pipe_changed(position))
+
+    @staticmethod
+    def _opens(pipe, side):
+        """Checks whether the flow can enter a pipe through a side.
+
+        Parameters:
+            pipe (Pipe): The pipe entered
+            side (int): The index of the side entered through
+
+        Return:
+            bool: True for a pipe connecting the side to another, or an end pipe opening
+            on it. The flow never enters a start pipe.
+        """
+        if type(pipe) is Pipe:
+            return bool(CONNECTED_SIDES[pipe.get_mask()][side])
+        if isinstance(pipe, EndPipe):
+            return OPPOSITE_SIDES[SIDE_INDEX[pipe.get_connected()[0]]] == side
         return False
 
+    def _exits(self, state):
+        """Finds the sides the flow leaves a state's pipe through into another pipe
+        which opens on the side it is entered through.
+
+        Return:
+            list<tuple<int, int>>: The side and the state entered in the neighbouring pipe.
+        """
+        layout = self._board_layout
+        rows, cols = self._size
+        index, entry = divmod(state, 5)
+        row, col = divmod(index, cols)
+        pipe = layout[row][col]
+        if type(pipe) is Pipe:
+            sides = CONNECTED_SIDES[pipe.get_mask()][entry]
+        elif entry == 4:
+            sides = [SIDE_INDEX[pipe.get_connected()[0]]]
+        else:
+            # the flow ends in the end pipe
+            sides = ()
+        exits = []
+        for side in sides:
+            row_step, col_step = SIDE_STEPS[side]
+            neighbour_row = row + row_step
+            neighbour_col = col + col_step
+            if 0 <= neighbour_row < rows and 0 <= neighbour_col < cols and \
+                    self._opens(layout[neighbour_row][neighbour_col], OPPOSITE_SIDES[side]):
+                exits.append((side, (neighbour_row * cols + neighbour_col) * 5 + OPPOSITE_SIDES[side]))
+        return exits
+
+    def _grow(self, queue):
+        """Reaches every state the flow gets to from the states in queue, breadth first."""
+        reached = self._reached
+        children = self._children
+        exits = self._exits
+        while queue:
+            state = queue.popleft()
+            for _, neighbour in exits(state):
+                if neighbour not in reached:
+                    reached[neighbour] = state
+                    children[state] = children.get(state, ()) + (neighbour,)
+                    queue.append(neighbour)
+
+    def _drop(self, states):
+        """Forgets the reached states and every state first reached through them.
+
+        Return:
+            list<int>: The states forgotten.
+        """
+        dropped = []
+        stack = list(states)
+        while stack:
+            state = stack.pop()
+            if state not in self._reached:
+                continue
+            parent = self._reached.pop(state)
+            if parent in self._children:
+                self._children[parent] = tuple(child for child in self._children[parent] if child != state)
+            stack.extend(self._children.pop(state, ()))
+            dropped.append(state)
+        return dropped
+
+    def _pipe_changed(self, position):
+        """Updates the reached states after the pipe at position was placed, removed or rotated.
+
+        Only the states first reached through the cell are dropped, and are found again
+        from their reached neighbours, so the work follows the part of the flow that changed.
+        A change to the start or end pipe leaves the states to be found from scratch.
+        """
+        if self._tracked is None:
+            return
+        layout = self._board_layout
+        cols = len(layout[0])
+        row, col = position
+        tile = layout[row][col]
+        if position in self._tracked or isinstance(tile, SpecialPipe):
+            self._tracked = None
+            return
+        index = row * cols + col
+        states = [index * 5 + entry for entry in range(5)]
+        reached = [state for state in states if state in self._reached]
+
+        if isinstance(tile, Pipe):
+            # the states the cell still opens on stay reached, but where the flow leaves
+            # them may have changed
+            opened = [state for state in reached if self._opens(tile, state % 5)]
+            below = [state for state in reached if state not in opened]
+            for state in opened:
+                below.extend(self._children.pop(state, ()))
+            dropped = self._drop(below)
+            reached = opened
+        else:
+            dropped = self._drop(reached)
+            reached = []
+
+        # a forgotten state, or a state of the cell, may be entered from a reached neighbour
+        queue = deque(state for state in reached if state in self._reached)
+        for state in dropped + states[:4]:
+            if state in self._reached:
+                continue
+            cell, entry = divmod(state, 5)
+            neighbour_row, neighbour_col = divmod(cell, cols)
+            neighbour_row += SIDE_STEPS[entry][0]
+            neighbour_col += SIDE_STEPS[entry][1]
+            if not (0 <= neighbour_row < len(layout) and 0 <= neighbour_col < cols):
+                continue
+            neighbour = neighbour_row * cols + neighbour_col
+            for parent in range(neighbour * 5, neighbour * 5 + 5):
+                if parent in self._reached and (OPPOSITE_SIDES[entry], state) in self._exits(parent):
+                    self._reached[state] = parent
+                    self._children[parent] = self._children.get(parent, ()) + (state,)
+                    queue.append(state)
+                    break
+        self._grow(queue)
+
 
 def main():
     print("Please run gui.py instead")
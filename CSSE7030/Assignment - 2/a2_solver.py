@@ -0,0 +1,318 @@
+"""
+A solver which checks whether a Pipe level can be won with its playable pipes.
+
+The solver searches for a flow from the start pipe to the end pipe, placing pipes
+from the inventory on empty tiles and rotating the pipes of the level, e.g.
+    python a2_solver.py game_1.csv --time-budget 5
+"""
+import argparse
+import time
+from collections import deque, namedtuple
+
+from a2 import *
+
+# Statuses of a solve
+SOLVED, UNSOLVABLE, OUT_OF_TIME = "solved", "unsolvable", "out of time"
+# Seconds a solve may take before giving up
+SOLVE_TIME_BUDGET = 10.0
+# Nodes searched between checks of the time budget
+BUDGET_CHECK_NODES = 256
+
+# Kinds of cells
+EMPTY, FIXED, BLOCKED, START, END = range(5)
+
+Result = namedtuple('Result', ('status', 'moves', 'nodes', 'seconds'))
+Result.__doc__ = """The outcome of a solve.
+
+status is SOLVED, UNSOLVABLE when every flow was searched, or OUT_OF_TIME. moves
+are the (position, name, orientation) of every pipe placed or rotated by the solution.
+"""
+
+# The distinct masks of each pipe, with the first orientation giving each
+PIPE_ORIENTATIONS = {name: tuple((mask, masks.index(mask)) for mask in sorted(set(masks), key=masks.index))
+                     for name, masks in PIPE_MASKS.items()}
+
+
+class OutOfTime(Exception):
+    """Raised when a solve runs past its time budget."""
+
+
+class Solver:
+    """
+    Searches the flows of a level depth first, one pipe at a time.
+
+    The head of the flow is a pipe and the side the flow entered it through. Each side
+    it leaves through leads into a neighbour, which is either a pipe already chosen,
+    a pipe of the level to rotate, or an empty tile to place an inventory pipe on; only
+    the choices which connect the side the flow enters through are tried.
+
+    A choice is pruned when the end can no longer be reached: a breadth first search
+    over the open cells finds the fewest empty tiles between the head and the cell in
+    front of the end pipe's opening, which must not be more than the pipes left.
+    Dead ends are remembered by their head and the pipes chosen so far, unless a flow
+    state already on the path cut their search short.
+    """
+
+    def __init__(self, game, time_budget=SOLVE_TIME_BUDGET):
+        """
+        Construct a solver of a game, which is not changed.
+
+        Parameters:
+            game (PipeGame): The level to solve
+            time_budget (float): Seconds the solve may take, None for no limit
+        """
+        layout = game.get_board_layout()
+        self._rows, self._cols = len(layout), len(layout[0])
+        self._time_budget = time_budget
+        self._kinds = []
+        self._pipes = []
+        self._start = self._end = self._feeder = None
+        for row, tiles in enumerate(layout):
+            for col, tile in enumerate(tiles):
+                index = row * self._cols + col
+                if isinstance(tile, StartPipe):
+                    self._start = index, SIDE_INDEX[tile.get_connected()[0]]
+                    kind = START
+                elif isinstance(tile, EndPipe):
+                    self._end = index, SIDE_INDEX[tile.get_connected()[0]]
+                    kind = END
+                elif isinstance(tile, Pipe):
+                    kind = FIXED
+                elif tile.get_name() == EMPTY_TILE and tile.can_select():
+                    kind = EMPTY
+                else:
+                    kind = BLOCKED
+                self._kinds.append(kind)
+                self._pipes.append(tile if kind == FIXED else None)
+        self._inventory = {name: count for name, count in game.get_playable_pipes().items()
+                           if name in PIPE_MASKS and count > 0}
+        self._chosen = {}
+        self._path = set()
+        self._dead_ends = set()
+        self._nodes = 0
+        self._deadline = None
+
+    def get_nodes(self):
+        """(int) Returns the number of nodes searched."""
+        return self._nodes
+
+    def solve(self):
+        """
+        Search for a solution.
+
+        Return:
+            Result: The status, the moves of a solution, the nodes searched and the seconds taken.
+        """
+        started = time.perf_counter()
+        if self._time_budget is not None:
+            self._deadline = started + self._time_budget
+        self._nodes = 0
+        try:
+            solved = self._search_start()
+        except OutOfTime:
+            return Result(OUT_OF_TIME, None, self._nodes, time.perf_counter() - started)
+        seconds = time.perf_counter() - started
+        if not solved:
+            return Result(UNSOLVABLE, None, self._nodes, seconds)
+        moves = []
+        for index, (name, orientation) in sorted(self._chosen.items()):
+            moves.append((divmod(index, self._cols), name, orientation))
+        return Result(SOLVED, moves, self._nodes, seconds)
+
+    def _search_start(self):
+        """(bool) Searches from the start pipe, leaving the solution in self._chosen."""
+        if self._start is None or self._end is None:
+            return False
+        feeder = self._neighbour(self._end[0], OPPOSITE_SIDES[self._end[1]])
+        if feeder is None or self._kinds[feeder] in (BLOCKED, END):
+            return False
+        self._feeder = feeder
+        start, side = self._start
+        return self._leave(start, side)[0]
+
+    def _neighbour(self, index, side):
+        """(int) Returns the index of the cell on a side of the cell at index, None off the board."""
+        row, col = divmod(index, self._cols)
+        row += SIDE_STEPS[side][0]
+        col += SIDE_STEPS[side][1]
+        if 0 <= row < self._rows and 0 <= col < self._cols:
+            return row * self._cols + col
+        return None
+
+    def _mask(self, index):
+        """(int) Returns the connection mask of the chosen pipe at index."""
+        name, orientation = self._chosen[index]
+        return PIPE_MASKS[name][orientation]
+
+    def _choices(self, index, entry):
+        """
+        Lists the pipes the cell at index could hold to connect the side the flow enters through.
+
+        Return:
+            list<tuple<str, int>>: The name and orientation of each pipe, None when the
+            pipe is already chosen and connects the side.
+        """
+        kind = self._kinds[index]
+        if index in self._chosen:
+            return [None] if CONNECTED_SIDES[self._mask(index)][entry] else []
+        if kind == FIXED:
+            names = [self._pipes[index].get_name()]
+        elif kind == EMPTY:
+            # most left first, so the scarce pipes are kept for where nothing else fits
+            names = sorted((name for name, count in self._inventory.items() if count > 0),
+                           key=lambda name: -self._inventory[name])
+        else:
+            return []
+        return [(name, orientation) for name in names for mask, orientation in PIPE_ORIENTATIONS[name]
+                if CONNECTED_SIDES[mask][entry]]
+
+    def _sides_left(self, index, entry):
+        """(list<int>) Returns the sides the flow leaves the cell through, the closest to the end first."""
+        feeder_row, feeder_col = divmod(self._feeder, self._cols)
+        row, col = divmod(index, self._cols)
+
+        def distance(side):
+            """(int) The distance from the neighbour on side to the cell in front of the end."""
+            return abs(row + SIDE_STEPS[side][0] - feeder_row) + abs(col + SIDE_STEPS[side][1] - feeder_col)
+        return sorted(CONNECTED_SIDES[self._mask(index)][entry], key=distance)
+
+    def _enter(self, index, entry):
+        """
+        Searches the flows entering the cell at index through the entry side.
+
+        Return:
+            tuple<bool, bool>: Whether the end was reached, and whether the search was cut
+            short by a flow state already on the path.
+        """
+        self._nodes += 1
+        if self._nodes % BUDGET_CHECK_NODES == 0 and self._deadline is not None and \
+                time.perf_counter() > self._deadline:
+            raise OutOfTime()
+        state = index * 4 + entry
+        if state in self._path:
+            return False, True
+        key = (state, frozenset(self._chosen.items()))
+        if key in self._dead_ends:
+            return False, False
+
+        cut = False
+        self._path.add(state)
+        for choice in self._choices(index, entry):
+            if choice is not None:
+                self._chosen[index] = choice
+                if self._kinds[index] == EMPTY:
+                    self._inventory[choice[0]] -= 1
+            if self._is_reachable(index):
+                for side in self._sides_left(index, entry):
+                    solved, side_cut = self._leave(index, side)
+                    if solved:
+                        return True, False
+                    cut = cut or side_cut
+            if choice is not None:
+                del self._chosen[index]
+                if self._kinds[index] == EMPTY:
+                    self._inventory[choice[0]] += 1
+        self._path.discard(state)
+        if not cut:
+            self._dead_ends.add(key)
+        return False, cut
+
+    def _leave(self, index, side):
+        """
+        Searches the flows leaving the cell at index through a side, see _enter.
+
+        Return:
+            tuple<bool, bool>: Whether the end was reached, and whether the search was cut short.
+        """
+        neighbour = self._neighbour(index, side)
+        if neighbour is None:
+            return False, False
+        if index == self._feeder and neighbour == self._end[0] and side == self._end[1]:
+            return True, False
+        return self._enter(neighbour, OPPOSITE_SIDES[side])
+
+    def _is_reachable(self, index):
+        """
+        Checks the cell in front of the end pipe's opening can still be reached from
+        the cell at index with the pipes left. Chosen pipes and pipes of the level are
+        free to pass, and empty tiles cost a pipe each.
+
+        Return:
+            bool: False when the end can no longer be reached.
+        """
+        pipes_left = sum(self._inventory.values())
+        if index == self._feeder:
+            return True
+        costs = {index: 0}
+        queue = deque([index])
+        while queue:
+            cell = queue.popleft()
+            cost = costs[cell]
+            for side in range(4):
+                neighbour = self._neighbour(cell, side)
+                if neighbour is None or neighbour in costs:
+                    continue
+                kind = self._kinds[neighbour]
+                if kind in (BLOCKED, START, END):
+                    continue
+                step = 1 if kind == EMPTY and neighbour not in self._chosen else 0
+                if cost + step > pipes_left:
+                    continue
+                if neighbour == self._feeder:
+                    return True
+                costs[neighbour] = cost + step
+                # a free cell is searched before the cells a pipe away, so costs stay the least
+                if step:
+                    queue.append(neighbour)
+                else:
+                    queue.appendleft(neighbour)
+        return False
+
+
+def solve(game, time_budget=SOLVE_TIME_BUDGET):
+    """
+    Search for a way to win a game, see Solver.
+
+    Parameters:
+        game (PipeGame): The level to solve, which is not changed
+        time_budget (float): Seconds the solve may take, None for no limit
+
+    Return:
+        Result: The status, moves, nodes searched and seconds taken.
+    """
+    return Solver(game, time_budget).solve()
+
+
+def apply_moves(game, moves):
+    """
+    Plays the moves of a solution on a game.
+
+    Parameters:
+        game (PipeGame): The game the moves were found for
+        moves (list<tuple<tuple<int, int>, str, int>>): The position, name and orientation of each pipe
+    """
+    for position, name, orientation in moves:
+        pipe = game.pipe_in_position(position)
+        if pipe is None:
+            game.set_pipe(Pipe(name, orientation), position)
+        else:
+            pipe.rotate((orientation - pipe.get_orientation()) % 4)
+
+
+def main():
+    """Solve a level from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('level', help='level file, e.g. game_1.csv')
+    parser.add_argument('--time-budget', type=float, default=SOLVE_TIME_BUDGET)
+    args = parser.parse_args()
+
+    result = solve(PipeGame(args.level), args.time_budget)
+    print(f"{args.level}: {result.status}")
+    for position, name, orientation in result.moves or ():
+        print(f"    {name} {orientation} at {position}")
+    rate = result.nodes / result.seconds if result.seconds else 0
+    print(f"{result.nodes} nodes in {result.seconds:.3f}s, {rate:.0f} nodes/second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+A batch validator which loads and solves every Pipe level file in a directory.
+
+The levels are solved across a multiprocessing pool, and a JSON report is printed
+with the status, solution length and solve time of each level, e.g.
+    python a2_validate.py levels --time-budget 5 --output report.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from a2_solver import *
+
+# Status of a level which could not be loaded
+INVALID = "invalid"
+# Level files found in a directory
+LEVEL_PATTERN = '*.csv'
+
+
+def find_levels(directory, pattern=LEVEL_PATTERN):
+    """
+    Find the level files in a directory and its subdirectories.
+
+    Parameters:
+        directory (str): The directory to search
+        pattern (str): The file name pattern of a level
+
+    Return:
+        list<str>: The paths of the level files, sorted.
+    """
+    return sorted(glob.glob(os.path.join(directory, '**', pattern), recursive=True))
+
+
+def check_layout(game):
+    """
+    Check a loaded level has a rectangular board with one start and one end pipe,
+    which the loader does not.
+
+    Parameters:
+        game (PipeGame): The loaded level
+
+    Return:
+        list<str>: The problems found, empty for a valid level.
+    """
+    layout = game.get_board_layout()
+    problems = []
+    if not layout or len({len(row) for row in layout}) != 1:
+        problems.append("the rows of the board are not all the same length")
+    for kind, name in ((StartPipe, "start"), (EndPipe, "end")):
+        count = sum(isinstance(tile, kind) for row in layout for tile in row)
+        if count != 1:
+            problems.append(f"{count} {name} pipes instead of 1")
+    return problems
+
+
+def validate_level(path, time_budget=SOLVE_TIME_BUDGET):
+    """
+    Load and solve a level file.
+
+    Parameters:
+        path (str): The level file
+        time_budget (float): Seconds the solve may take, None for no limit
+
+    Return:
+        dict: The file, status, error, solution length, nodes searched and solve time.
+    """
+    result = {'file': path, 'status': INVALID, 'error': None, 'solution_length': None,
+              'nodes': 0, 'solve_ms': 0.0}
+    try:
+        game = PipeGame(path)
+    except Exception as error:
+        # the loader raises whatever a malformed line happens to cause
+        result['error'] = f"{type(error).__name__}: {error}"
+        return result
+    problems = check_layout(game)
+    if problems:
+        result['error'] = "; ".join(problems)
+        return result
+
+    solved = solve(game, time_budget)
+    result['status'] = solved.status
+    if solved.moves is not None:
+        result['solution_length'] = len(solved.moves)
+    result['nodes'] = solved.nodes
+    result['solve_ms'] = solved.seconds * 1000
+    return result
+
+
+def _validate_job(job):
+    """(dict) Validate one (path, time_budget) job in a worker process, see validate_level."""
+    return validate_level(*job)
+
+
+def _file_size(path):
+    """(int) Returns the size of a file in bytes, 0 when it cannot be read."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def validate(paths, time_budget=SOLVE_TIME_BUDGET, processes=None):
+    """
+    Validate level files across a multiprocessing pool.
+
+    The largest files are handed out first and one at a time, so a worker stuck on a
+    slow level does not hold back a batch of quick ones.
+
+    Parameters:
+        paths (list<str>): The level files
+        time_budget (float): Seconds each solve may take, None for no limit
+        processes (int): The number of worker processes, 1 to validate in this process
+
+    Return:
+        dict: The number of levels of each status, the time taken and a result for every level.
+    """
+    jobs = [(path, time_budget) for path in sorted(paths, key=_file_size, reverse=True)]
+    start = time.perf_counter()
+    if processes == 1:
+        results = list(map(_validate_job, jobs))
+    else:
+        with Pool(processes) as pool:
+            results = list(pool.imap_unordered(_validate_job, jobs))
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda result: result['file'])
+    counts = {status: 0 for status in (SOLVED, UNSOLVABLE, OUT_OF_TIME, INVALID)}
+    for result in results:
+        counts[result['status']] += 1
+    return {'levels': len(results), 'seconds': elapsed, 'counts': counts, 'results': results}
+
+
+def main():
+    """Validate a directory of levels from the command line, failing if any is invalid or unsolvable."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('directory', help='directory of level files')
+    parser.add_argument('--pattern', default=LEVEL_PATTERN)
+    parser.add_argument('--time-budget', type=float, default=SOLVE_TIME_BUDGET)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--output', help='file to write the report to, instead of printing it')
+    args = parser.parse_args()
+
+    report = validate(find_levels(args.directory, args.pattern), args.time_budget, args.processes)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    sys.exit(1 if report['counts'][INVALID] or report['counts'][UNSOLVABLE] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,18 @@ Please make sure to stay up to date for any assignment or test file updates.
 """
 
 import inspect
+import os
+import shutil
+import sys
+import tempfile
 from typing import Dict, List, Optional, Tuple
 
 from testrunner import AttributeGuesser, OrderedTestCase, TestMaster, skipIfFailed
 
+# The solver and validator are loaded from the assignment directory
+PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, PARENT)
+
 Position = Tuple[int, int]
 
 
@@ -82,6 +90,8 @@ class A2:
 
 class TestA2(OrderedTestCase):
     a2: A2
+    a2_solver: ...
+    a2_validate: ...
 
 
 class TestDesign(TestA2):
@@ -259,6 +269,21 @@ class TestPipe(TestA2):
         result = pipe.get_connected('E')
         self.assertListEqual(result, ['W'])
 
+    def test_get_connected_junction_t_rotate_1_S(self):
+        """ test Pipe.get_connected junction-t rotate 1 'S' """
+        pipe = self.a2.Pipe("junction-t", 1)
+        self.assertListEqual(pipe.get_connected('S'), ['N', 'W'])
+        self.assertListEqual(pipe.get_connected('E'), [])
+
+    def test_get_connected_channels(self):
+        """ test Pipe.get_connected keeps the channels of diagonals and over-under apart """
+        diagonals = self.a2.Pipe("diagonals", 3)
+        self.assertListEqual(diagonals.get_connected('W'), ['N'])
+        self.assertListEqual(diagonals.get_connected('S'), ['E'])
+        over_under = self.a2.Pipe("over-under", 1)
+        self.assertListEqual(over_under.get_connected('N'), ['S'])
+        self.assertListEqual(over_under.get_connected('W'), ['E'])
+
 
 @skipIfFailed(TestDesign, TestDesign.test_classes_and_functions_defined.__name__, tag=SpecialPipe.__name__)
 class TestSpecialPipe(TestA2):
@@ -529,6 +554,90 @@ class TestPipeGame(TestA2):
         result = game.get_ending_position()
         self.assertEqual(result, (4, 4))
 
+    def test_check_win(self):
+        """ test PipeGame.check_win follows the pipes from start to end """
+        game = self.a2.PipeGame()
+        self.assertFalse(game.check_win())
+        pipes = {(1, 1): ('straight', 1), (1, 2): ('straight', 1), (1, 3): ('corner', 2),
+                 (2, 2): ('corner', 1), (3, 2): ('straight', 0), (4, 2): ('corner', 0)}
+        for position, (name, orientation) in pipes.items():
+            game.set_pipe(self.a2.Pipe(name, orientation), position)
+        game.pipe_in_position((2, 3)).rotate(2)
+        self.assertFalse(game.check_win())
+        game.set_pipe(self.a2.Pipe('straight', 1), (4, 3))
+        self.assertTrue(game.check_win())
+        game.pipe_in_position((4, 3)).rotate(1)
+        self.assertFalse(game.check_win())
+
+    def test_get_reachable(self):
+        """ test PipeGame.get_reachable follows placed, rotated and removed pipes """
+        game = self.a2.PipeGame()
+        self.assertEqual(game.get_reachable(), {(1, 0)})
+        game.set_pipe(self.a2.Pipe('straight', 1), (1, 1))
+        game.set_pipe(self.a2.Pipe('straight', 1), (1, 2))
+        self.assertEqual(game.get_reachable(), {(1, 0), (1, 1), (1, 2)})
+        game.pipe_in_position((1, 1)).rotate(1)
+        self.assertEqual(game.get_reachable(), {(1, 0)})
+        game.pipe_in_position((1, 1)).rotate(-1)
+        self.assertEqual(game.get_reachable(), {(1, 0), (1, 1), (1, 2)})
+        game.remove_pipe((1, 1))
+        self.assertEqual(game.get_reachable(), {(1, 0)})
+
+    def test_get_reachable_start_replaced(self):
+        """ test PipeGame.get_reachable after a pipe is placed over the start pipe """
+        game = self.a2.PipeGame()
+        game.set_pipe(self.a2.Pipe('straight', 1), (1, 1))
+        self.assertEqual(game.get_reachable(), {(1, 0), (1, 1)})
+        game.set_pipe(self.a2.Pipe('straight', 1), (1, 0))
+        self.assertEqual(game.get_reachable(), set())
+        self.assertFalse(game.check_win())
+
+
+class TestSolver(TestA2):
+    def test_solve(self):
+        """ test the solver finds moves which win the level, without changing the game """
+        game = self.a2.PipeGame()
+        result = self.a2_solver.solve(game)
+        self.assertEqual(result.status, self.a2_solver.SOLVED)
+        self.assertFalse(game.check_win())
+        self.assertGreater(result.nodes, 0)
+        self.a2_solver.apply_moves(game, result.moves)
+        self.assertTrue(game.check_win())
+
+    def test_solve_unsolvable(self):
+        """ test the solver proves a level with no pipes to play cannot be won """
+        game = self.a2.PipeGame()
+        for name, count in list(game.get_playable_pipes().items()):
+            game.change_playable_amount(name, -count)
+        result = self.a2_solver.solve(game)
+        self.assertEqual(result.status, self.a2_solver.UNSOLVABLE)
+        self.assertIsNone(result.moves)
+
+
+class TestValidate(TestA2):
+    def test_validate(self):
+        """ test the report of a directory with a solvable and a malformed level """
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copy('game_1.csv', directory)
+            with open(os.path.join(directory, 'broken.csv'), 'w') as f:
+                f.write('S1,#,E3\nx,y\n')
+            paths = self.a2_validate.find_levels(directory)
+            self.assertEqual([os.path.basename(path) for path in paths], ['broken.csv', 'game_1.csv'])
+            report = self.a2_validate.validate(paths, processes=1)
+        self.assertEqual(report['levels'], 2)
+        self.assertEqual(report['counts'][self.a2_validate.INVALID], 1)
+        self.assertEqual(report['counts'][self.a2_solver.SOLVED], 1)
+        broken, game_1 = report['results']
+        self.assertIn('ValueError', broken['error'])
+        self.assertEqual(game_1['solution_length'], 6)
+
+    def test_check_layout(self):
+        """ test a level without an end pipe is reported """
+        game = self.a2.PipeGame()
+        self.assertEqual(self.a2_validate.check_layout(game), [])
+        game.get_board_layout()[4][4] = self.a2.Tile('tile', True)
+        self.assertEqual(self.a2_validate.check_layout(game), ['0 end pipes instead of 1'])
+
 
 def main():
     test_cases = [
@@ -538,14 +647,18 @@ def main():
         TestSpecialPipe,
         TestStartPipe,
         TestEndPipe,
-        TestPipeGame
+        TestPipeGame,
+        TestSolver,
+        TestValidate
     ]
 
     master = TestMaster(max_diff=None,
                         timeout=1,
                         include_no_print=True,
                         scripts=[
-                            ('a2', 'a2.py')
+                            ('a2', 'a2.py'),
+                            ('a2_solver', os.path.join(PARENT, 'a2_solver.py')),
+                            ('a2_validate', os.path.join(PARENT, 'a2_validate.py'))
                         ])
     master.run(test_cases)
 
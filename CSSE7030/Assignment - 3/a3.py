@@ -1,12 +1,32 @@
+import os
+import sys
 import time
 import tkinter as tk
 import random
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
+
+# The game engine, board history and snapshots are shared with Assignment 1 and kept
+# in its directory, with the a1_support module they are built on in its a1_files.
+# Without them, as when a3.py is on its own, the game keeps a StringBoard and
+# cannot undo, save or load.
+ASSIGNMENT_1_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Assignment - 1 ")
+sys.path[:0] = [ASSIGNMENT_1_DIRECTORY, os.path.join(ASSIGNMENT_1_DIRECTORY, "a1_files")]
+try:
+    try:
+        import board_engine
+    except ImportError:
+        board_engine = None
+
+    try:
+        import board_snapshot
+    except ImportError:
+        board_snapshot = None
+finally:
+    del sys.path[:2]
 
 LENGTH = 60
 TASK_ONE = 1
 TASK_TWO = 2
-POKEMON = "@"
 UP = "up"
 DOWN = "down"
 LEFT = "left"
@@ -14,13 +34,110 @@ RIGHT = "right"
 DIRECTIONS = (UP, DOWN, LEFT, RIGHT,
               f"{UP}-{LEFT}", f"{UP}-{RIGHT}",
               f"{DOWN}-{LEFT}", f"{DOWN}-{RIGHT}")
+POKEMON = "@"
 FLAG = "♥"
 UNEXPOSED = "#"
 EXPOSED = "0"
+# The characters of the pokemon, flagged and unexposed cells kept by the board of a BoardModel
+if board_engine is not None:
+    BOARD_POKEMON, BOARD_FLAG, BOARD_UNEXPOSED = board_engine.POKEMON, board_engine.FLAG, board_engine.UNEXPOSED
+else:
+    BOARD_POKEMON, BOARD_FLAG, BOARD_UNEXPOSED = POKEMON, FLAG, UNEXPOSED
+BOARD_CHARACTERS = {POKEMON: BOARD_POKEMON, FLAG: BOARD_FLAG, UNEXPOSED: BOARD_UNEXPOSED}
+GAME_CHARACTERS = {board: game for game, board in BOARD_CHARACTERS.items()}
+# Check the board counters against a full scan on every check_win
+DEBUG_COUNTERS = False
+# Extension of saved game files, which hold a board_snapshot
+SAVE_EXTENSION = ".pks"
+# Most cells revealed before the board view draws them, see BoardModel.iter_reveal
+REVEAL_BATCH_SIZE = 16
+
+
+class StringBoard:
+    """The cells of a game when board_engine is not available, kept as a game string.
+
+    It has the methods of board_engine.Board which BoardModel uses, but keeps no
+    undo history.
+    """
+
+    def __init__(self, grid_size, game=None, pokemon_locations=()):
+        """
+        Construct a board of unexposed cells, or of the cells of a game string.
+
+        Parameters:
+            grid_size (int): The grid size of the game.
+            game (str): Game string to copy, None for a new game.
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+        """
+        self._grid_size = grid_size
+        self._game = UNEXPOSED * grid_size ** 2 if game is None else game
+        self._pokemon_locations = pokemon_locations
+        self._pokemons = frozenset(pokemon_locations)
+
+    def __getitem__(self, index):
+        return self._game[index]
+
+    def __setitem__(self, index, character):
+        self._game = self._game[:index] + character + self._game[index + 1:]
+
+    def __str__(self):
+        return self._game
+
+    def count(self, character):
+        """Return the number of cells showing character."""
+        return self._game.count(character)
+
+    def get_pokemon_locations(self):
+        """Return the pokemon locations of the board."""
+        return self._pokemon_locations
+
+    def is_pokemon(self, index):
+        """Return whether a pokemon hides in the cell at index."""
+        return index in self._pokemons
+
+    def number_at(self, index):
+        """Return the number of pokemons neighbouring the cell at index."""
+        row, col = divmod(index, self._grid_size)
+        return sum(neighbour_row * self._grid_size + neighbour_col in self._pokemons
+                   for neighbour_row in range(max(row - 1, 0), min(row + 2, self._grid_size))
+                   for neighbour_col in range(max(col - 1, 0), min(col + 2, self._grid_size))
+                   if (neighbour_row, neighbour_col) != (row, col))
+
+    def reveal(self, index):
+        """Show the number of the unexposed cell at index."""
+        self[index] = str(self.number_at(index))
+
+    def is_won(self):
+        """Return whether every cell is exposed and every pokemon, and only a pokemon, is flagged."""
+        return (UNEXPOSED not in self._game and self._game.count(FLAG) == len(self._pokemons)
+                and all(self._game[pokemon] == FLAG for pokemon in self._pokemons))
+
+    def enable_history(self):
+        """Do nothing, as a StringBoard keeps no history."""
+
+    def start_action(self):
+        """Do nothing, as a StringBoard keeps no history."""
+
+    def finish_action(self):
+        """Do nothing, as a StringBoard keeps no history."""
+
+    def undo(self):
+        """(bool) Return False, as there is no history to undo."""
+        return False
+
+    def redo(self):
+        """(bool) Return False, as there is no history to redo."""
+        return False
 
 
 class BoardModel:
-    """The model class of the game, responsible for executing the function and logic of the game"""
+    """The model class of the game, responsible for executing the function and logic of the game
+
+    The cells are kept by a board_engine.Board, which counts the neighbouring pokemons,
+    keeps the win counters and records the undo history, or by a StringBoard when
+    board_engine is not available. The board keeps its own characters, which get_cell
+    and replace_character_at_index turn into this game's.
+    """
 
     def __init__(self, grid_size, num_pokemon):
         """
@@ -30,19 +147,37 @@ class BoardModel:
             grid_size (int): The grid size of the game.
             num_pokemon (int): The number of pokemon of the game
         """
-        self._game_board = UNEXPOSED * (grid_size ** 2)
         self._grid_size = grid_size
         self._num_pokemon = num_pokemon
-        self._pokemon_locations = self.generate_pokemon(grid_size)
+        self._board = None
+        self.new_board(self.generate_pokemon(grid_size))
         self._pokeball = self._num_pokemon
 
+    def new_board(self, pokemon_locations, game=None):
+        """Start a board of the pokemon locations, which keeps an undo history.
+
+        Parameters:
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+            game (str): The board characters of the cells, all unexposed when None.
+        """
+        if board_engine is not None:
+            self._board = board_engine.Board(self._grid_size, game, pokemon_locations)
+        else:
+            self._board = StringBoard(self._grid_size, game, pokemon_locations)
+        self._board.enable_history()
+
     def get_game(self):
         """Return game string information which can represent the state of the game."""
-        return self._game_board
+        return ''.join(GAME_CHARACTERS.get(character, character) for character in str(self._board))
+
+    def get_cell(self, index):
+        """Return the character of the cell at index in the game string."""
+        character = self._board[index]
+        return GAME_CHARACTERS.get(character, character)
 
     def get_pokemon_locations(self):
         """Get pokemon location information"""
-        return self._pokemon_locations
+        return self._board.get_pokemon_locations()
 
     def change_pokeball_number(self, number):
         """Change the number of pokeballs based on player actions on the status bar."""
@@ -79,7 +214,7 @@ class BoardModel:
 
     def check_pokemon(self, index):
         """Check whether there is a pokemon hide in this index. """
-        if index in self._pokemon_locations:
+        if self._board.is_pokemon(index):
             self._num_pokemon -= 1
             return True
         return False
@@ -91,11 +226,45 @@ class BoardModel:
         Parameters:
             index (int): The index in the game string where the character is replaced.
             character (str): The new character that will be replacing the old character.
+        """
+        if self._board[index] == BOARD_UNEXPOSED and character.isdigit():
+            self._board.reveal(index)
+        else:
+            self._board[index] = BOARD_CHARACTERS.get(character, character)
+
+    def reset_history(self):
+        """Forget every action."""
+        self._board.enable_history()
+
+    def start_action(self):
+        """Start recording the changes of a click, so it can be undone."""
+        self._board.start_action()
+
+    def finish_action(self):
+        """Finish recording the changes of a click."""
+        self._board.finish_action()
+
+    def undo(self):
+        """Revert the last recorded action.
 
         Returns:
-            (str): The updated game string.
+            (bool): Whether there was an action to undo.
         """
-        self._game_board = self._game_board[:index] + character + self._game_board[index + 1:]
+        if not self._board.undo():
+            return False
+        self._pokeball = len(self._board.get_pokemon_locations()) - self._board.count(BOARD_FLAG)
+        return True
+
+    def redo(self):
+        """Play the last undone action again.
+
+        Returns:
+            (bool): Whether there was an action to redo.
+        """
+        if not self._board.redo():
+            return False
+        self._pokeball = len(self._board.get_pokemon_locations()) - self._board.count(BOARD_FLAG)
+        return True
 
     def get_num_pokemon(self):
         """Return the number of pokemon in the game."""
@@ -112,16 +281,28 @@ class BoardModel:
         Returns:
             (list<int>): List of cells to turn visible.
         """
-        queue = [index]
-        discovered = [index]
-        visible = []
+        return list(self.iter_big_fun_search(grid_size, pokemon_locations, index))
 
-        if self._game_board[index] == FLAG:
-            return queue
+    def iter_big_fun_search(self, grid_size, pokemon_locations, index):
+        """Find the same cells as big_fun_search, yielding each one as it is discovered.
 
-        number = self.number_at_cell(pokemon_locations, grid_size, index)
-        if number != 0:
-            return queue
+        Parameters:
+            grid_size (int): Size of game.
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+            index (int): Index of the currently selected cell
+
+        Yields:
+            (int): The index of a cell to turn visible.
+        """
+        if self._board[index] == BOARD_FLAG or self.number_at_cell(pokemon_locations, grid_size, index) != 0:
+            yield index
+            return
+
+        if board_engine is not None:
+            yield from board_engine.iter_big_fun_search(self._board, grid_size, pokemon_locations, index)
+            return
+        queue = [index]
+        discovered = [index]
 
         while queue:
             node = queue.pop()
@@ -130,12 +311,39 @@ class BoardModel:
                     continue
 
                 discovered.append(neighbour)
-                if self._game_board[neighbour] != FLAG:
+                if self._board[neighbour] != BOARD_FLAG:
                     number = self.number_at_cell(pokemon_locations, grid_size, neighbour)
                     if number == 0:
                         queue.append(neighbour)
-                visible.append(neighbour)
-        return visible
+                yield neighbour
+
+    def iter_reveal(self, index, batch_size=REVEAL_BATCH_SIZE):
+        """Reveal the cell at index, which is not a pokemon, and the cells big_fun_search finds from it.
+
+        The search runs as the cells are revealed, so a view can draw a large reveal
+        while it is still going.
+
+        Parameters:
+            index (int): Index of the currently selected cell
+            batch_size (int): Most cells in each batch
+
+        Yields:
+            (list<int>): The indexes of a batch of revealed cells.
+        """
+        if self._board[index].isdigit():
+            return
+        pokemon_locations = self._board.get_pokemon_locations()
+        self.replace_character_at_index(index, str(self._board.number_at(index)))
+        batch = [index]
+        for i in self.iter_big_fun_search(self._grid_size, pokemon_locations, index):
+            if self._board[i] == BOARD_UNEXPOSED:
+                self._board.reveal(i)
+                batch.append(i)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
 
     def neighbour_directions(self, index, grid_size):
         """Seek out all direction that has a neighbouring cell.
@@ -147,6 +355,8 @@ class BoardModel:
         Returns:
             (list<int>): A list of index that has a neighbouring cell.
         """
+        if board_engine is not None:
+            return board_engine.neighbour_directions(index, grid_size)
         neighbours = []
         for direction in DIRECTIONS:
             neighbour = self.index_in_direction(index, grid_size, direction)
@@ -184,6 +394,8 @@ class BoardModel:
 
             None for invalid direction.
         """
+        if board_engine is not None:
+            return board_engine.index_in_direction(index, grid_size, direction)
         col = index % grid_size
         row = index // grid_size
         if RIGHT in direction:
@@ -208,13 +420,13 @@ class BoardModel:
         Returns
             (str): The updated game string.
         """
-        if self._game_board[index] == FLAG:
+        if self.get_cell(index) == FLAG:
             self.replace_character_at_index(index, UNEXPOSED)
 
-        elif self._game_board[index] == UNEXPOSED:
+        elif self.get_cell(index) == UNEXPOSED:
             self.replace_character_at_index(index, FLAG)
 
-        return self._game_board
+        return self.get_game()
 
     def number_at_cell(self, pokemon_locations, grid_size, index):
         """Calculates what number should be displayed at that specific index in the game.
@@ -227,13 +439,31 @@ class BoardModel:
         Returns:
             (int): Number to be displayed at the given index in the game string.
         """
-        count = 0
-        neighbour_list = self.neighbour_directions(index, grid_size)
-        if index not in pokemon_locations:
-            for cell in neighbour_list:
-                if cell in pokemon_locations:
-                    count += 1
-            return count
+        if pokemon_locations is self._board.get_pokemon_locations():
+            return None if self._board.is_pokemon(index) else self._board.number_at(index)
+        if index in pokemon_locations:
+            return None
+        return sum(cell in pokemon_locations for cell in self.neighbour_directions(index, grid_size))
+
+    def chord_neighbours(self, index):
+        """Find the cells a chord on a cell reveals.
+
+        Parameters:
+            index (int): The index of the chorded cell.
+
+        Returns:
+            (list<int>): Every unexposed neighbour of an exposed number which has as
+            many flagged neighbours as its number, empty when it is not satisfied.
+        """
+        if board_engine is not None:
+            return board_engine.chord_neighbours(self._board, self._grid_size, index)
+        character = self.get_cell(index)
+        if not character.isdigit():
+            return []
+        neighbours = self.neighbour_directions(index, self._grid_size)
+        if sum(self.get_cell(neighbour) == FLAG for neighbour in neighbours) != int(character):
+            return []
+        return [neighbour for neighbour in neighbours if self.get_cell(neighbour) == UNEXPOSED]
 
     def check_win(self):
         """Checking if the player has won the game.
@@ -242,17 +472,45 @@ class BoardModel:
             (bool): True if the player has won the game, false if not.
 
         """
-        return UNEXPOSED not in self._game_board and self._game_board.count(FLAG) == len(self._pokemon_locations)
+        if DEBUG_COUNTERS and board_engine is not None:
+            self._board.check_counters()
+        return self._board.is_won()
+
+    def snapshot(self):
+        """Build the board_snapshot of the game.
+
+        Returns:
+            (bytes): The snapshot.
+        """
+        states = board_snapshot.game_states(str(self._board), BOARD_UNEXPOSED, BOARD_FLAG, BOARD_POKEMON)
+        return board_snapshot.pack_snapshot(self._grid_size, states, self._board.get_pokemon_locations())
+
+    def restore(self, snapshot):
+        """Restore the game of a snapshot built by snapshot.
+
+        Parameters:
+            snapshot (bytes): The snapshot.
+
+        Raises:
+            board_snapshot.SnapshotError: If the data is not a snapshot of this grid size.
+        """
+        grid_size, states, pokemon_locations, _ = board_snapshot.unpack_snapshot(snapshot)
+        if grid_size != self._grid_size:
+            raise board_snapshot.SnapshotError(f"The saved game is {grid_size}x{grid_size}, "
+                                               f"not {self._grid_size}x{self._grid_size}")
+        self.new_board(pokemon_locations, board_snapshot.states_game(states, grid_size, pokemon_locations,
+                                                                     BOARD_UNEXPOSED, BOARD_FLAG, BOARD_POKEMON))
+        self._num_pokemon = len(pokemon_locations)
+        self._pokeball = self._num_pokemon - self._board.count(BOARD_FLAG)
 
     def restart(self):
         """According to the player's instructions, restart this game."""
-        self._game_board = UNEXPOSED * (self._grid_size ** 2)
+        self.new_board(self._board.get_pokemon_locations())
 
     def newgame(self):
         """According to the player's instructions, create a new game,
         and reset the pokemon position."""
-        self._game_board = UNEXPOSED * (self._grid_size ** 2)
-        self._pokemon_locations = self.generate_pokemon(self._grid_size)
+        self.new_board(self.generate_pokemon(self._grid_size))
 
 
 class BoardView(tk.Canvas):
@@ -272,34 +530,59 @@ class BoardView(tk.Canvas):
         self._board_width = board_width
         self._statusbar = None
         self._board = None
+        # The canvas items each cell is drawn with, by index
+        self._cell_items = {}
 
         self.config(height=self._board_width, width=self._board_width)
 
-    def draw_board(self, board: BoardModel):
+    def draw_board(self, board: BoardModel, revealed=None):
         """Draw the layout of the game board by identifying the character string.
+
+        When revealed is given, only the cells of each batch it yields are drawn, over
+        the board already shown, and the canvas is updated after each batch, so a reveal
+        is shown while it is still going.
+
+        Parameters:
+            board (BoardModel): The board to draw.
+            revealed (iterable<list<int>>): Batches of revealed cell indexes, see BoardModel.iter_reveal
         """
         self._board = board
+        if revealed is not None:
+            for batch in revealed:
+                for index in batch:
+                    self.draw_cell(index)
+                self.update_idletasks()
+            return
         self.delete(tk.ALL)
+        self._cell_items = {}
 
         for row in range(self._grid_size):
             for col in range(self._grid_size):
-                char = self._board.get_game()[self.position_to_index((col, row), self._grid_size)]
-                x1 = row * LENGTH
-                y1 = col * LENGTH
-                x2 = x1 + LENGTH
-                y2 = y1 + LENGTH
-                if char == UNEXPOSED:
-                    self.create_rectangle(x1, y1, x2, y2, fill='dark green')
-                elif char == POKEMON:
-                    self.create_rectangle(x1, y1, x2, y2, fill="yellow")
-                elif char.isdigit():
-                    self.create_rectangle(x1, y1, x2, y2, fill="light green")
-                    self.create_text((x1 + x2) / 2, (y1 + y2) / 2, text=char)
-                elif char == FLAG:
-                    self.create_rectangle(x1, y1, x2, y2, fill="red")
+                self.draw_cell(self.position_to_index((col, row), self._grid_size))
 
         self.bind_clicks()
 
+    def draw_cell(self, index):
+        """Draw the cell at index by identifying its character, replacing the items it was drawn with."""
+        col, row = divmod(index, self._grid_size)
+        char = self._board.get_cell(index)
+        x1 = row * LENGTH
+        y1 = col * LENGTH
+        x2 = x1 + LENGTH
+        y2 = y1 + LENGTH
+        self.delete(*self._cell_items.pop(index, ()))
+        items = []
+        if char == UNEXPOSED:
+            items.append(self.create_rectangle(x1, y1, x2, y2, fill='dark green'))
+        elif char == POKEMON:
+            items.append(self.create_rectangle(x1, y1, x2, y2, fill="yellow"))
+        elif char.isdigit():
+            items.append(self.create_rectangle(x1, y1, x2, y2, fill="light green"))
+            items.append(self.create_text((x1 + x2) / 2, (y1 + y2) / 2, text=char))
+        elif char == FLAG:
+            items.append(self.create_rectangle(x1, y1, x2, y2, fill="red"))
+        self._cell_items[index] = items
+
     def bind_clicks(self):
         """Bind clicks on a label to the left and right click handlers."""
         # call back function, e: event
@@ -317,7 +600,26 @@ class BoardView(tk.Canvas):
         position = self.pixel_to_position(pixel)
         index = self.position_to_index(position, self._grid_size)
 
-        if self._board.check_pokemon(index):
+        self._board.start_action()
+        try:
+            self._play_left_click(index)
+        finally:
+            self._board.finish_action()
+
+    def _play_left_click(self, index):
+        """Play a left click on the cell at index, see _handle_left_click.
+
+        A left click on an exposed number chords it: its unexposed neighbours are
+        revealed together when its flags are satisfied, with one redraw.
+        """
+        if self._board.get_cell(index).isdigit():
+            indexes = self._board.chord_neighbours(index)
+            if not indexes:
+                return
+        else:
+            indexes = [index]
+
+        if any(self._board.check_pokemon(i) for i in indexes):
             for pokemon_index in self._board.get_pokemon_locations():
                 self._board.replace_character_at_index(pokemon_index, POKEMON)
             self.draw_board(self._board)
@@ -328,16 +630,8 @@ class BoardView(tk.Canvas):
                 self._master.quit()
 
         else:
-            number = self._board.number_at_cell(self._board.get_pokemon_locations(), self._grid_size, index)
-            self._board.replace_character_at_index(index, str(number))
-            clear = self._board.big_fun_search(self._grid_size, self._board.get_pokemon_locations(),
-                                               index)
-            for i in clear:
-                if self._board.get_game()[i] != FLAG:
-                    number = self._board.number_at_cell(self._board.get_pokemon_locations(), self._grid_size, i)
-                    self._board.replace_character_at_index(i, str(number))
-
-            self.draw_board(self._board)
+            self.draw_board(self._board, (batch for index in indexes
+                                          for batch in self._board.iter_reveal(index)))
             if self._board.check_win():
                 pass
 
@@ -348,15 +642,19 @@ class BoardView(tk.Canvas):
         position = self.pixel_to_position(pixel)
         index = self.position_to_index(position, self._grid_size)
 
-        if self._board.get_game()[index] == UNEXPOSED:
-            self._board.replace_character_at_index(index, FLAG)
-            self._board.change_pokeball_number(-1)
-            self._statusbar.update_label(self._board.get_pokeball_number())
+        self._board.start_action()
+        try:
+            if self._board.get_cell(index) == UNEXPOSED:
+                self._board.replace_character_at_index(index, FLAG)
+                self._board.change_pokeball_number(-1)
+                self._statusbar.update_label(self._board.get_pokeball_number())
 
-        elif self._board.get_game()[index] == FLAG:
-            self._board.replace_character_at_index(index, UNEXPOSED)
-            self._board.change_pokeball_number(1)
-            self._statusbar.update_label(self._board.get_pokeball_number())
+            elif self._board.get_cell(index) == FLAG:
+                self._board.replace_character_at_index(index, UNEXPOSED)
+                self._board.change_pokeball_number(1)
+                self._statusbar.update_label(self._board.get_pokeball_number())
+        finally:
+            self._board.finish_action()
 
         self.draw_board(self._board)
 
@@ -397,37 +695,41 @@ class ImageBoardView(BoardView):
 
     def __init__(self, master, grid_size, board_width=600, *args, **kwargs):
         super().__init__(master, grid_size, board_width, *args, **kwargs)
-        self._images = []
-
-    def draw_board(self, board: BoardModel):
-        """Draw the game board by using the specified picture to form a graphical interface at a specific
-        string position"""
-
-        self._board = board
-        self.delete(tk.ALL)
-
-        for row in range(self._grid_size):
-            for col in range(self._grid_size):
-                char = self._board.get_game()[self.position_to_index((col, row), self._grid_size)]
-                x1 = row * LENGTH
-                y1 = col * LENGTH
-                x2 = x1 + LENGTH
-                y2 = y1 + LENGTH
-
-                if char == UNEXPOSED:
-                    image = tk.PhotoImage(file="./images/unrevealed.png")
-                elif char == POKEMON:
-                    image = tk.PhotoImage(file=f"./images/pokemon_sprites/{self.get_pokemon_pic()}")
-                elif char == FLAG:
-                    image = tk.PhotoImage(file="./images/pokeball.png")
-                elif char.isdigit():
-                    image = tk.PhotoImage(file=f"./images/{self.get_num_pic(char)}")
-                else:
-                    image = None
-                self._images.append(image)
-                self.create_image((x1 + x2) / 2, (y1 + y2) / 2, image=image)
+        # The pictures loaded so far, by file, which every cell showing them shares
+        self._images = {}
+
+    def draw_cell(self, index):
+        """Draw the cell at index by using the specified picture of its character,
+        changing the picture of the canvas item it was drawn with."""
+        col, row = divmod(index, self._grid_size)
+        char = self._board.get_cell(index)
+        x1 = row * LENGTH
+        y1 = col * LENGTH
+        x2 = x1 + LENGTH
+        y2 = y1 + LENGTH
+
+        if char == UNEXPOSED:
+            image = self.load_image("./images/unrevealed.png")
+        elif char == POKEMON:
+            image = self.load_image(f"./images/pokemon_sprites/{self.get_pokemon_pic()}")
+        elif char == FLAG:
+            image = self.load_image("./images/pokeball.png")
+        elif char.isdigit():
+            image = self.load_image(f"./images/{self.get_num_pic(char)}")
+        else:
+            image = ''
+        items = self._cell_items.get(index)
+        if items:
+            self.itemconfig(items[0], image=image)
+        else:
+            self._cell_items[index] = [self.create_image((x1 + x2) / 2, (y1 + y2) / 2, image=image)]
 
-        self.bind_clicks()
+    def load_image(self, file):
+        """Return the picture of an image file, loading it the first time it is drawn."""
+        image = self._images.get(file)
+        if image is None:
+            image = self._images[file] = tk.PhotoImage(file=file)
+        return image
 
     def get_pokemon_pic(self):
         """Create a list to store randomly selected pictures."""
@@ -562,33 +864,59 @@ class PokemonGame:
         filename.add_command(label='Save game', command=self.save)
         filename.add_command(label='Load game', command=self.load)
         filename.add_command(label='Restart game', command=self.restart)
+        filename.add_command(label='Undo', command=self.undo)
+        filename.add_command(label='Redo', command=self.redo)
         filename.add_command(label='Quit', command=self.quit)
 
     def save(self):
         """Save current game in order to play later."""
-        record_page = tk.Tk()
+        if board_snapshot is None:
+            messagebox.showerror("Save game", "board_snapshot.py is needed to save games.")
+            return
+        record_page = tk.Toplevel(self._master)
         record_page.title('Save your game!')
-        label = tk.Label(record_page, text='Enter your name:').pack(side=tk.LEFT)
-        entry = tk.Entry(record_page).pack(side=tk.LEFT)
+        tk.Label(record_page, text='Enter your name:').pack(side=tk.LEFT)
+        entry = tk.Entry(record_page)
+        entry.pack(side=tk.LEFT)
 
         def record():
-            name = entry.get()
-            with open("save_game.txt", 'w') as f:
-                f.write(f"{name} {self._model.get_game()}\n")
+            name = entry.get().strip() or "save_game"
+            with open(f"{name}{SAVE_EXTENSION}", 'wb') as f:
+                f.write(self._model.snapshot())
+            record_page.destroy()
 
-        enter = tk.Button(record_page, text='enter', command=record).pack(side=tk.LEFT)
+        tk.Button(record_page, text='enter', command=record).pack(side=tk.LEFT)
 
     def load(self):
         """Load the game."""
-        with open('save_time.txt', 'r') as f:
-            game_string = []
-            for line in f:
-                game = line.split()
-                game_string.append(game[1])
-
-        self._model._game_board = game_string
+        if board_snapshot is None:
+            messagebox.showerror("Load game", "board_snapshot.py is needed to load games.")
+            return
+        path = filedialog.askopenfilename(filetypes=[("Saved games", f"*{SAVE_EXTENSION}")])
+        if not path:
+            return
+        try:
+            with open(path, 'rb') as f:
+                self._model.restore(f.read())
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Load game", str(error))
+            return
+
+        self._statusbar.update_label(self._model.get_pokeball_number())
         self._board.draw_board(self._model)
 
+    def undo(self):
+        """Undo the last click."""
+        if self._model.undo():
+            self._statusbar.update_label(self._model.get_pokeball_number())
+            self._board.draw_board(self._model)
+
+    def redo(self):
+        """Redo the last undone click."""
+        if self._model.redo():
+            self._statusbar.update_label(self._model.get_pokeball_number())
+            self._board.draw_board(self._model)
+
     def restart(self):
         """Restart the game."""
         self._board.get_status(self._statusbar)